@@ -0,0 +1,44 @@
+"""
+Gunicorn configuration for the production server (see start.sh).
+
+SERVER_MODE=wsgi runs ticket_system.wsgi on threaded sync workers;
+SERVER_MODE=asgi runs ticket_system.asgi on uvicorn workers, so async
+views such as /api/tickets/classify/async/ do not tie up a thread while
+they wait on the LLM. Send SIGHUP to the master process to reload the
+code with zero downtime: new workers start before the old ones finish
+their in-flight requests and exit.
+"""
+import multiprocessing
+import os
+
+
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+CPU_COUNT = multiprocessing.cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'ticket_system.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    # One event loop per core
+    workers = int(os.getenv('WEB_CONCURRENCY', CPU_COUNT))
+else:
+    wsgi_app = 'ticket_system.wsgi:application'
+    worker_class = 'gthread'
+    # Requests mostly wait on PostgreSQL, so oversubscribe the cores
+    workers = int(os.getenv('WEB_CONCURRENCY', CPU_COUNT * 2 + 1))
+    threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+# Seconds a silent worker is allowed before it is killed and replaced, and
+# seconds in-flight requests get to finish on SIGTERM or SIGHUP
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth; the jitter keeps
+# them from all restarting at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-' if os.getenv('GUNICORN_ACCESS_LOG', 'False') == 'True' else None
+errorlog = '-'
@@ -0,0 +1,27 @@
+#!/bin/sh
+# Start the backend. SERVER_MODE selects the server:
+#   development  manage.py runserver with ticket_system.settings (default)
+#   wsgi         gunicorn, threaded workers, ticket_system.settings_production
+#   asgi         gunicorn, uvicorn workers, ticket_system.settings_production
+set -e
+
+SERVER_MODE="${SERVER_MODE:-development}"
+export SERVER_MODE
+
+case "$SERVER_MODE" in
+    development)
+        python manage.py makemigrations
+        python manage.py migrate
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+    wsgi|asgi)
+        export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:-ticket_system.settings_production}"
+        python manage.py migrate --noinput
+        python manage.py collectstatic --noinput -v0
+        exec gunicorn -c gunicorn.conf.py
+        ;;
+    *)
+        echo "Unknown SERVER_MODE '$SERVER_MODE' (expected development, wsgi or asgi)" >&2
+        exit 1
+        ;;
+esac
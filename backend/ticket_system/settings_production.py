@@ -0,0 +1,51 @@
+"""
+Production settings for ticket_system project.
+
+Used by start.sh when SERVER_MODE is wsgi or asgi: DEBUG and SQL query
+recording are off, and static files are served by WhiteNoise.
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, MIDDLEWARE
+
+DEBUG = False
+
+# Required: Django refuses to start with an empty SECRET_KEY
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', '')
+
+ALLOWED_HOSTS = os.getenv('DJANGO_ALLOWED_HOSTS', '*').split(',')
+
+# Under ASGI each request may run on a different thread, and a persistent
+# connection stays with the thread that opened it, so connections pile up.
+# Close them after every request instead (DB_POOL=True still pools them).
+if os.getenv('SERVER_MODE') == 'asgi':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# Static files: collected into STATIC_ROOT by start.sh and served from the
+# app server with far-future cache headers (no separate web server needed)
+MIDDLEWARE = [
+    MIDDLEWARE[0],
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    *MIDDLEWARE[1:],
+]
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
+# Logging: warnings and errors to stderr; SQL statements are never logged
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': os.getenv('DJANGO_LOG_LEVEL', 'WARNING'),
+    },
+    'loggers': {
+        'django.db.backends': {'level': 'WARNING', 'propagate': True},
+    },
+}
@@ -1,5 +1,9 @@
 from django.contrib import admin
+from django.db import transaction
 from .models import Ticket
+from .stats_service import stats_service
+from .event_log import event_log
+from .similarity import similarity_index
 
 
 @admin.register(Ticket)
@@ -9,3 +13,36 @@ class TicketAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description']
     readonly_fields = ['created_at', 'updated_at']
     ordering = ['-created_at']
+
+    def save_model(self, request, obj, form, change):
+        # Lock the row while reading the old values, as the API PATCH does,
+        # so concurrent edits cannot both apply deltas from the same bucket
+        with transaction.atomic():
+            old_row = None
+            if change:
+                old_row = Ticket.objects.select_for_update().filter(pk=obj.pk).values_list(
+                    'category', 'priority', 'status', 'title', 'description'
+                ).first()
+            else:
+                obj.similarity_signature = similarity_index.signature_for(obj.title, obj.description)
+            super().save_model(request, obj, form, change)
+            if old_row:
+                old_bucket, old_text = old_row[:3], old_row[3:]
+                stats_service.record_changed(old_bucket, obj)
+                event_log.record_changed(old_bucket, obj)
+                if (obj.title, obj.description) != old_text:
+                    similarity_index.reindex(obj)
+            else:
+                stats_service.record_created(obj)
+                event_log.record_created(obj)
+                similarity_index.index([obj])
+
+    def delete_model(self, request, obj):
+        stats_service.record_deleted(Ticket.objects.filter(pk=obj.pk))
+        event_log.record_deleted(Ticket.objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        stats_service.record_deleted(queryset)
+        event_log.record_deleted(queryset)
+        super().delete_queryset(request, queryset)
@@ -0,0 +1,59 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for calls to an unreliable upstream.
+
+    closed:    calls pass through; consecutive failures are counted
+    open:      calls are refused until `reset_timeout` seconds have passed
+    half_open: a single probe call is let through; success closes the
+               circuit, failure opens it again. A probe that reports
+               neither within `reset_timeout` seconds is presumed lost and
+               another one is let through
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may be attempted now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if (
+                (self.state == self.OPEN and now - self.opened_at >= self.reset_timeout)
+                or (self.state == self.HALF_OPEN and now - self.probe_started_at >= self.reset_timeout)
+            ):
+                # Let exactly one probe through
+                self.state = self.HALF_OPEN
+                self.probe_started_at = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {'state': self.state, 'consecutive_failures': self.failures}
@@ -0,0 +1,122 @@
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+
+def normalize_description(description: str) -> str:
+    """Collapse whitespace and case so trivially different inputs share a key"""
+    return ' '.join(description.lower().split())
+
+
+def cache_key(description: str) -> str:
+    digest = hashlib.sha256(normalize_description(description).encode('utf-8')).hexdigest()
+    return f'tickets:classify:{digest}'
+
+
+class ClassificationCache(ABC):
+    """
+    Base class for classification result caches.
+    Subclasses implement `_get` / `_set`; hit and miss counting is shared
+    and safe across threads.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, description: str):
+        result = self._get(cache_key(description))
+        with self._counter_lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def set(self, description: str, result: dict):
+        self._set(cache_key(description), result)
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    @abstractmethod
+    def _get(self, key):
+        """Return the cached result for key, or None"""
+
+    @abstractmethod
+    def _set(self, key, result):
+        """Store result under key"""
+
+
+class MemoryClassificationCache(ClassificationCache):
+    """In-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries=1024, ttl=3600):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def _set(self, key, result):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats['size'] = len(self._entries)
+        return stats
+
+
+class DjangoClassificationCache(ClassificationCache):
+    """
+    Cache backed by Django's cache framework, shared across workers when a
+    shared backend (Redis, Memcached, database) is configured. Eviction is
+    left to the backend.
+    """
+
+    def __init__(self, alias='default', ttl=3600):
+        super().__init__()
+        self.cache = caches[alias]
+        self.ttl = ttl
+
+    def _get(self, key):
+        return self.cache.get(key)
+
+    def _set(self, key, result):
+        self.cache.set(key, result, self.ttl)
+
+
+def build_classification_cache(backend, max_entries, ttl):
+    """
+    Create the cache selected by LLM_CACHE_BACKEND.
+
+    Returns:
+        ClassificationCache instance, or None when caching is disabled
+    """
+    if backend == 'memory':
+        return MemoryClassificationCache(max_entries=max_entries, ttl=ttl)
+    if backend == 'django':
+        return DjangoClassificationCache(ttl=ttl)
+    return None
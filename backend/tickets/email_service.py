@@ -1,8 +1,15 @@
-from django.core.mail import send_mail
+from datetime import timedelta
+
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.conf import settings
-from django.template.loader import render_to_string
+from django.db import transaction
+from django.template.loader import get_template
+from django.utils import timezone
+from django.utils.safestring import mark_safe
 import logging
 
+from .models import EmailOutbox, Ticket
+
 logger = logging.getLogger(__name__)
 
 
@@ -10,189 +17,364 @@ class EmailService:
     """
     Service class for sending email notifications with graceful fallback.
     If email is not configured, operations fail silently.
+    
+    Notifications are written to the EmailOutbox table instead of being sent
+    inside the request; `deliver_pending` drains the outbox in batches over
+    one reused SMTP connection (see `manage.py send_queued_emails`).
     """
     
+    # Display labels for the template context
+    PRIORITY_LABELS = dict(Ticket.PRIORITY_CHOICES)
+    CATEGORY_LABELS = dict(Ticket.CATEGORY_CHOICES)
+    STATUS_LABELS = dict(Ticket.STATUS_CHOICES)
+    
+    # Marker for splicing rendered ticket cards into a pre-rendered layout
+    CARD_PLACEHOLDER = '<!--ticket-card-->'
+    
+    # Tickets listed per priority/category group in a digest email
+    DIGEST_TICKETS_PER_GROUP = 20
+    
     def __init__(self):
+        # Non-SMTP backends (console, locmem, file) need no credentials
         self.is_configured = bool(
             settings.EMAIL_HOST_USER and 
             settings.EMAIL_HOST_PASSWORD
+        ) or settings.EMAIL_BACKEND != 'django.core.mail.backends.smtp.EmailBackend'
+        self.batch_size = getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 50)
+        self.max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+        self.retry_seconds = getattr(settings, 'EMAIL_OUTBOX_RETRY_SECONDS', 30)
+        
+        # Digest mode: hold non-critical notifications and send one summary
+        # every EMAIL_DIGEST_INTERVAL_MINUTES or EMAIL_DIGEST_MAX_EVENTS events
+        self.digest_enabled = getattr(settings, 'EMAIL_DIGEST_ENABLED', False)
+        self.digest_interval = timedelta(
+            minutes=getattr(settings, 'EMAIL_DIGEST_INTERVAL_MINUTES', 15)
         )
+        self.digest_max_events = getattr(settings, 'EMAIL_DIGEST_MAX_EVENTS', 100)
+        
+        # Compiled email templates, loaded on first use
+        self._templates = {}
     
     def send_ticket_created_notification(self, ticket):
         """
-        Send email notification when a new ticket is created.
+        Queue email notification when a new ticket is created.
         
         Args:
             ticket: Ticket model instance
             
         Returns:
-            bool: True if email sent successfully, False otherwise
+            bool: True if email queued successfully, False otherwise
         """
         
         if not self.is_configured:
             logger.info("Email not configured. Skipping notification.")
             return False
         
-        try:
-            subject = f"New Support Ticket Created: #{ticket.id} - {ticket.title}"
-            
-            # Plain text message
-            message = self._build_plain_text_message(ticket)
-            
-            # HTML message
-            html_message = self._build_html_message(ticket)
-            
-            # Send email
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.ADMIN_EMAIL],
-                html_message=html_message,
-                fail_silently=True,  # Don't break app if email fails
-            )
-            
-            logger.info(f"Email sent for ticket #{ticket.id}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to send email for ticket #{ticket.id}: {str(e)}")
-            return False
+        subject, message, html_message = self.render_created_notifications([ticket])[0]
+        
+        return self._enqueue(subject, message, html_message, ticket, 'created')
     
     def send_ticket_status_update_notification(self, ticket, old_status):
         """
-        Send email notification when ticket status changes.
+        Queue email notification when ticket status changes.
         
         Args:
             ticket: Ticket model instance
             old_status: Previous status value
             
         Returns:
-            bool: True if email sent successfully, False otherwise
+            bool: True if email queued successfully, False otherwise
         """
         
         if not self.is_configured:
             return False
         
+        subject = f"Ticket Status Updated: #{ticket.id} - {ticket.title}"
+        message = self._build_status_update_message(ticket, old_status)
+        
+        return self._enqueue(subject, message.strip(), '', ticket, 'status_changed')
+    
+    def send_bulk_status_update_notifications(self, updates):
+        """
+        Queue status-change notifications for many tickets with one insert.
+        
+        Args:
+            updates: list of (ticket, old_status) pairs
+            
+        Returns:
+            int: number of notifications queued
+        """
+        if not self.is_configured or not updates:
+            return 0
+        
+        entries = [
+            EmailOutbox(
+                ticket=ticket,
+                event='status_changed',
+                status='held' if self.digest_enabled and ticket.priority != 'critical' else 'pending',
+                subject=f"Ticket Status Updated: #{ticket.id} - {ticket.title}"[:255],
+                body=self._build_status_update_message(ticket, old_status).strip(),
+                recipients=[settings.ADMIN_EMAIL],
+            )
+            for ticket, old_status in updates
+        ]
         try:
-            subject = f"Ticket Status Updated: #{ticket.id} - {ticket.title}"
+            with transaction.atomic():
+                EmailOutbox.objects.bulk_create(entries)
+        except Exception as e:
+            logger.error(f"Failed to queue {len(entries)} status update emails: {str(e)}")
+            return 0
+        
+        logger.info(f"Queued {len(entries)} status update emails")
+        return len(entries)
+    
+    def render_created_notifications(self, tickets):
+        """
+        Render ticket-created emails for a batch of tickets with the compiled
+        templates.
+        
+        Args:
+            tickets: iterable of Ticket instances
             
-            message = f"""
-Ticket Status Update
-
-Ticket ID: #{ticket.id}
-Title: {ticket.title}
-
-Status Changed: {old_status.upper()} → {ticket.status.upper()}
-
-Category: {ticket.get_category_display()}
-Priority: {ticket.get_priority_display()}
-
-View ticket details in the support system.
-
----
-This is an automated notification.
-            """
+        Returns:
+            list of (subject, plain text, HTML) tuples, one per ticket
+        """
+        text_template = self._template('ticket_created.txt')
+        card_template = self._template('_ticket_card.html')
+        
+        # The page layout is identical for every ticket: render it once per
+        # batch and splice each ticket's card into it
+        layout = self._template('ticket_created.html').render(
+            {'card': mark_safe(self.CARD_PLACEHOLDER)}
+        )
+        layout_head, layout_tail = layout.split(self.CARD_PLACEHOLDER)
+        
+        rendered = []
+        for ticket in tickets:
+            context = {'ticket': self._ticket_context(ticket)}
+            rendered.append((
+                f"New Support Ticket Created: #{ticket.id} - {ticket.title}",
+                text_template.render(context),
+                layout_head + card_template.render(context) + layout_tail,
+            ))
+        return rendered
+    
+    def deliver_pending(self, batch_size=None):
+        """
+        Send one batch of due outbox emails over a single SMTP connection.
+        
+        Failed sends are retried with exponential backoff until
+        EMAIL_OUTBOX_MAX_ATTEMPTS, after which they are marked failed.
+        
+        Returns:
+            int: number of emails sent
+        """
+        batch_size = batch_size or self.batch_size
+        sent = 0
+        
+        if self.digest_enabled:
+            self.flush_digest()
+        
+        with transaction.atomic():
+            batch = list(
+                EmailOutbox.objects
+                .select_for_update(skip_locked=True)
+                .filter(status='pending', next_attempt_at__lte=timezone.now())
+                .order_by('id')[:batch_size]
+            )
+            if not batch:
+                return 0
+            
+            connection = get_connection(fail_silently=False)
+            try:
+                connection.open()
+            except Exception as e:
+                logger.error(f"Could not connect to email server: {str(e)}")
+                for outbox in batch:
+                    self._schedule_retry(outbox, e)
+                return 0
+            
+            try:
+                for outbox in batch:
+                    try:
+                        email = EmailMultiAlternatives(
+                            subject=outbox.subject,
+                            body=outbox.body,
+                            from_email=settings.DEFAULT_FROM_EMAIL,
+                            to=outbox.recipients,
+                            connection=connection,
+                        )
+                        if outbox.html_body:
+                            email.attach_alternative(outbox.html_body, 'text/html')
+                        email.send()
+                    except Exception as e:
+                        logger.error(f"Failed to send outbox email #{outbox.id}: {str(e)}")
+                        self._schedule_retry(outbox, e)
+                        continue
+                    
+                    outbox.status = 'sent'
+                    outbox.attempts += 1
+                    outbox.sent_at = timezone.now()
+                    outbox.save(update_fields=['status', 'attempts', 'sent_at'])
+                    sent += 1
+            finally:
+                connection.close()
+        
+        logger.info(f"Sent {sent} of {len(batch)} queued emails")
+        return sent
+    
+    def flush_digest(self, force=False):
+        """
+        Coalesce held notifications into one summary email once the digest
+        window has elapsed or enough events have accumulated.
+        
+        Args:
+            force: build the digest even if neither threshold is reached
+            
+        Returns:
+            int: number of notifications folded into the digest
+        """
+        with transaction.atomic():
+            held = list(self._held_notifications())
+            if not held:
+                return 0
             
-            send_mail(
+            window_elapsed = held[0].created_at <= timezone.now() - self.digest_interval
+            if not (force or window_elapsed or len(held) >= self.digest_max_events):
+                return 0
+            
+            subject, message, html_message = self._build_digest(held)
+            EmailOutbox.objects.create(
+                event='digest',
                 subject=subject,
-                message=message.strip(),
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[settings.ADMIN_EMAIL],
-                fail_silently=True,
+                body=message,
+                html_body=html_message,
+                recipients=[settings.ADMIN_EMAIL],
             )
-            
-            logger.info(f"Status update email sent for ticket #{ticket.id}")
+            EmailOutbox.objects.filter(id__in=[item.id for item in held]).update(
+                status='digested'
+            )
+        
+        logger.info(f"Folded {len(held)} notifications into a digest")
+        return len(held)
+    
+    def _held_notifications(self):
+        """Held outbox rows with their tickets, locked for a digest"""
+        # Lock only the outbox rows: the ticket join is an outer join
+        # (deleted tickets leave ticket NULL), and PostgreSQL refuses
+        # FOR UPDATE on the nullable side of one
+        return (
+            EmailOutbox.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .filter(status='held')
+            .select_related('ticket')
+            .order_by('id')
+        )
+    
+    def _build_digest(self, held):
+        """Build subject, plain text and HTML bodies for a digest email"""
+        # Latest event per ticket, grouped by (priority, category)
+        latest = {}
+        for item in held:
+            if item.ticket is not None:
+                latest[item.ticket_id] = item.ticket
+        
+        priority_order = [value for value, _label in Ticket.PRIORITY_CHOICES]
+        groups = {}
+        for ticket in latest.values():
+            groups.setdefault((ticket.priority, ticket.category), []).append(ticket)
+        ordered_groups = sorted(
+            groups.items(),
+            key=lambda group: (-priority_order.index(group[0][0]), group[0][1])
+        )
+        
+        created_count = sum(1 for item in held if item.event == 'created')
+        updated_count = len(held) - created_count
+        subject = (
+            f"Support Ticket Digest: {created_count} new, "
+            f"{updated_count} status update{'s' if updated_count != 1 else ''}"
+        )
+        
+        context = {
+            'subject': subject,
+            'groups': [
+                {
+                    'title': f"{tickets[0].get_priority_display()} / {tickets[0].get_category_display()} ({len(tickets)})",
+                    'tickets': [
+                        self._ticket_context(ticket)
+                        for ticket in tickets[:self.DIGEST_TICKETS_PER_GROUP]
+                    ],
+                    'hidden': max(len(tickets) - self.DIGEST_TICKETS_PER_GROUP, 0),
+                }
+                for _key, tickets in ordered_groups
+            ],
+        }
+        message = self._template('digest.txt').render(context)
+        html_message = self._template('digest.html').render(context)
+        return subject, message.strip(), html_message
+    
+    def _enqueue(self, subject, message, html_message, ticket, event):
+        """Write a notification to the outbox in the caller's transaction"""
+        held = self.digest_enabled and ticket.priority != 'critical'
+        try:
+            with transaction.atomic():
+                EmailOutbox.objects.create(
+                    ticket=ticket,
+                    event=event,
+                    status='held' if held else 'pending',
+                    subject=subject[:255],
+                    body=message,
+                    html_body=html_message,
+                    recipients=[settings.ADMIN_EMAIL],
+                )
+            logger.info(f"Email queued for ticket #{ticket.id}")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send status update email: {str(e)}")
+            logger.error(f"Failed to queue email for ticket #{ticket.id}: {str(e)}")
             return False
     
-    def _build_plain_text_message(self, ticket):
-        """Build plain text email message"""
-        return f"""
-New Support Ticket Created
-
-Ticket ID: #{ticket.id}
-Title: {ticket.title}
-
-Description:
-{ticket.description}
-
-Details:
-- Category: {ticket.get_category_display()}
-- Priority: {ticket.get_priority_display()}
-- Status: {ticket.get_status_display()}
-- Created: {ticket.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-
-Please review and respond to this ticket in the support system.
-
----
-This is an automated notification from the Support Ticket System.
-        """
+    def _schedule_retry(self, outbox, error):
+        outbox.attempts += 1
+        outbox.last_error = str(error)
+        if outbox.attempts >= self.max_attempts:
+            outbox.status = 'failed'
+        else:
+            delay = self.retry_seconds * 2 ** (outbox.attempts - 1)
+            outbox.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        outbox.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
     
-    def _build_html_message(self, ticket):
-        """Build HTML email message"""
-        
-        # Priority colors
-        priority_colors = {
-            'low': '#4caf50',
-            'medium': '#ff9800',
-            'high': '#ff5722',
-            'critical': '#d32f2f',
-        }
-        
-        priority_color = priority_colors.get(ticket.priority, '#666666')
-        
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 5px 5px 0 0; }}
-                .content {{ background: #f9f9f9; padding: 20px; border: 1px solid #ddd; }}
-                .ticket-info {{ background: white; padding: 15px; margin: 15px 0; border-left: 4px solid {priority_color}; }}
-                .badge {{ display: inline-block; padding: 5px 10px; border-radius: 3px; font-size: 12px; font-weight: bold; }}
-                .priority-{ticket.priority} {{ background: {priority_color}; color: white; }}
-                .footer {{ text-align: center; padding: 15px; color: #666; font-size: 12px; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h2 style="margin: 0;">🎫 New Support Ticket</h2>
-                </div>
-                <div class="content">
-                    <div class="ticket-info">
-                        <h3 style="margin-top: 0;">Ticket #{ticket.id}: {ticket.title}</h3>
-                        
-                        <p><strong>Description:</strong></p>
-                        <p>{ticket.description}</p>
-                        
-                        <p>
-                            <span class="badge priority-{ticket.priority}">{ticket.get_priority_display()} Priority</span>
-                            <span class="badge" style="background: #2196f3; color: white;">{ticket.get_category_display()}</span>
-                            <span class="badge" style="background: #4caf50; color: white;">{ticket.get_status_display()}</span>
-                        </p>
-                        
-                        <p style="color: #666; font-size: 14px;">
-                            Created: {ticket.created_at.strftime('%B %d, %Y at %H:%M')}
-                        </p>
-                    </div>
-                    
-                    <p>Please review and respond to this ticket in the support system.</p>
-                </div>
-                <div class="footer">
-                    <p>This is an automated notification from the Support Ticket System.</p>
-                    <p>© 2026 Support Ticket System</p>
-                </div>
-            </div>
-        </body>
-        </html>
+    def _build_status_update_message(self, ticket, old_status):
+        """Build plain text status update message"""
+        return self._template('status_update.txt').render(
+            {'ticket': self._ticket_context(ticket), 'old_status': old_status}
+        )
+    
+    def _ticket_context(self, ticket):
         """
+        Flatten a ticket into plain values for the email templates.
+        Resolving display labels and dates here keeps the per-render
+        template lookups cheap.
+        """
+        return {
+            'id': ticket.id,
+            'title': ticket.title,
+            'description': ticket.description,
+            'priority': ticket.priority,
+            'status': ticket.status,
+            'priority_label': self.PRIORITY_LABELS.get(ticket.priority, ticket.priority),
+            'category_label': self.CATEGORY_LABELS.get(ticket.category, ticket.category),
+            'status_label': self.STATUS_LABELS.get(ticket.status, ticket.status),
+            'created_long': ticket.created_at.strftime('%B %d, %Y at %H:%M'),
+            'created_short': ticket.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+    
+    def _template(self, name):
+        """Return a compiled template from tickets/templates/tickets/email/"""
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = get_template(f'tickets/email/{name}')
+        return template
 
 
 # Singleton instance
@@ -0,0 +1,149 @@
+from .models import TicketEvent
+from .trends import trend_service
+
+
+FIELDS = ('category', 'priority', 'status')
+
+# Code -> value, for reading events back
+VALUE_NAMES = {
+    field: {code: value for value, code in codes.items()}
+    for field, codes in TicketEvent.VALUE_CODES.items()
+}
+
+KIND_NAMES = {
+    TicketEvent.CREATED: 'created',
+    TicketEvent.STATUS_CHANGED: 'status_changed',
+    TicketEvent.CATEGORY_CHANGED: 'category_changed',
+    TicketEvent.PRIORITY_CHANGED: 'priority_changed',
+    TicketEvent.DELETED: 'deleted',
+}
+
+KIND_FIELDS = {kind: field for field, kind in TicketEvent.FIELD_KINDS.items()}
+
+
+def _code(field, value):
+    return TicketEvent.VALUE_CODES[field].get(value)
+
+
+class EventLog:
+    """
+    Writes the append-only TicketEvent history.
+
+    Every write path that changes tickets calls the matching record_*
+    method inside its transaction, as it does for StatsService, so the
+    history commits or rolls back with the change itself. The daily
+    created/resolved rollups (see TrendService) are updated from here too.
+    """
+
+    def record_created(self, ticket):
+        TicketEvent.objects.create(**self._created(ticket))
+        trend_service.record_created([ticket])
+
+    def record_bulk_created(self, tickets):
+        """Log tickets inserted with bulk_create, in one insert"""
+        TicketEvent.objects.bulk_create(
+            [TicketEvent(**self._created(ticket)) for ticket in tickets],
+            batch_size=5000
+        )
+        trend_service.record_created(tickets)
+
+    def record_changed(self, old_bucket, ticket):
+        """
+        Log changes to category, priority and status after an update.
+
+        Args:
+            old_bucket: (category, priority, status) before the update
+            ticket: saved Ticket instance with the new values
+        """
+        changes = {field: getattr(ticket, field) for field in FIELDS}
+        TicketEvent.objects.bulk_create(
+            self._changes(ticket.pk, old_bucket, changes, ticket.updated_at)
+        )
+        trend_service.record_changed(
+            [(tuple(old_bucket), tuple(changes[field] for field in FIELDS))], ticket.updated_at
+        )
+
+    def record_bulk_changed(self, ids, old_buckets, changes, changed_at):
+        """
+        Log a queryset update.
+
+        Args:
+            ids: updated ticket ids
+            old_buckets: (category, priority, status) of each ticket before
+                the update, in the same order
+            changes: dict of the category/priority/status values written
+            changed_at: updated_at written by the update
+        """
+        TicketEvent.objects.bulk_create([
+            event
+            for ticket_id, old_bucket in zip(ids, old_buckets)
+            for event in self._changes(ticket_id, old_bucket, changes, changed_at)
+        ], batch_size=5000)
+        trend_service.record_changed([
+            (tuple(old_bucket), tuple(changes.get(field, old) for field, old in zip(FIELDS, old_bucket)))
+            for old_bucket in old_buckets
+        ], changed_at)
+
+    def record_deleted(self, queryset):
+        """Log the deletion of the tickets in `queryset`; call before deleting them"""
+        TicketEvent.objects.bulk_create([
+            TicketEvent(
+                ticket_id=ticket_id,
+                kind=TicketEvent.DELETED,
+                old_value=_code('status', ticket_status),
+            )
+            for ticket_id, ticket_status in queryset.values_list('id', 'status').order_by()
+        ], batch_size=5000)
+
+    def timeline(self, ticket_id) -> list:
+        """
+        Returns:
+            list of event dicts, oldest first: {'type', 'at'} plus 'status'
+            for created/deleted events, or 'field', 'from' and 'to' for
+            changes
+        """
+        events = (
+            TicketEvent.objects.filter(ticket_id=ticket_id)
+            .order_by('created_at', 'id')
+            .values_list('kind', 'old_value', 'new_value', 'created_at')
+        )
+        timeline = []
+        for kind, old_value, new_value, created_at in events:
+            event = {'type': KIND_NAMES.get(kind, str(kind)), 'at': created_at}
+            if kind == TicketEvent.CREATED:
+                event['status'] = VALUE_NAMES['status'].get(new_value)
+            elif kind == TicketEvent.DELETED:
+                event['status'] = VALUE_NAMES['status'].get(old_value)
+            else:
+                field = KIND_FIELDS[kind]
+                event['field'] = field
+                event['from'] = VALUE_NAMES[field].get(old_value)
+                event['to'] = VALUE_NAMES[field].get(new_value)
+            timeline.append(event)
+        return timeline
+
+    def _created(self, ticket):
+        return {
+            'ticket_id': ticket.pk,
+            'kind': TicketEvent.CREATED,
+            'new_value': _code('status', ticket.status),
+            'created_at': ticket.created_at,
+        }
+
+    def _changes(self, ticket_id, old_bucket, changes, changed_at):
+        events = []
+        for field, old in zip(FIELDS, old_bucket):
+            new = changes.get(field, old)
+            if new != old:
+                events.append(TicketEvent(
+                    ticket_id=ticket_id,
+                    kind=TicketEvent.FIELD_KINDS[field],
+                    old_value=_code(field, old),
+                    new_value=_code(field, new),
+                    created_at=changed_at,
+                ))
+        return events
+
+
+# Singleton instance
+event_log = EventLog()
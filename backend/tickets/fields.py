@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils.functional import cached_property
+
+
+class CodedChoiceField(models.SmallIntegerField):
+    """
+    String choice field stored as a small integer code.
+
+    Model instances, querysets, forms and serializers all see the choice
+    strings; only the database column holds the code from `codes`. Filters
+    on an unknown string match no rows.
+    """
+
+    def __init__(self, *args, codes=None, **kwargs):
+        self.codes = dict(codes or {})
+        self.values = {code: value for value, code in self.codes.items()}
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        # Values are choice strings, so the integer range checks do not apply
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self.values.get(value, value)
+
+    def to_python(self, value):
+        if isinstance(value, int):
+            return self.values.get(value, value)
+        return value
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or isinstance(value, int):
+            return value
+        # NULL never compares equal, and the NOT NULL column rejects it on write
+        return self.codes.get(value)
@@ -0,0 +1,186 @@
+import csv
+import json
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+
+from .llm_service import llm_service
+from .models import Ticket
+from .serializers import TicketSerializer
+from .signals import tickets_bulk_created
+from .similarity import similarity_index
+from .stats_service import stats_service
+from .event_log import event_log
+
+
+# Row errors kept for the report; later ones are only counted
+MAX_REPORTED_ERRORS = 100
+
+CATEGORIES = {value for value, _label in Ticket.CATEGORY_CHOICES}
+PRIORITIES = {value for value, _label in Ticket.PRIORITY_CHOICES}
+STATUSES = {value for value, _label in Ticket.STATUS_CHOICES}
+
+
+def read_ndjson(lines):
+    """
+    Yield one object per non-blank line of an NDJSON stream.
+
+    Lines that are not valid JSON are yielded as the raw text so the
+    importer reports them against their row number.
+    """
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line
+
+
+def read_csv(file):
+    """Yield one dict per CSV row, keyed by the header row"""
+    yield from csv.DictReader(file)
+
+
+class TicketImporter:
+    """
+    Bulk-create tickets from a stream of dicts.
+
+    Rows are validated with the same rules as TicketSerializer, a chunk at
+    a time; each chunk is written with bulk_create in its own transaction
+    together with the counter updates. Invalid rows are skipped and
+    reported, and no notification emails are queued.
+    """
+
+    def __init__(self, chunk_size=1000, classify=False):
+        """
+        Args:
+            chunk_size: rows validated and written per transaction
+            classify: fill in a missing category or priority with
+                llm_service.classify_batch instead of rejecting the row
+        """
+        self.chunk_size = chunk_size
+        self.classify = classify
+        self.created = 0
+        self.failed = 0
+        self.classified = 0
+        self.errors = []
+        self._serializer = TicketSerializer()
+
+    def run(self, rows) -> dict:
+        """
+        Import every row of `rows`.
+
+        Returns:
+            dict with created, failed and classified counts and the first
+            MAX_REPORTED_ERRORS row errors
+        """
+        chunk = []
+        for number, row in enumerate(rows, start=1):
+            chunk.append((number, row))
+            if len(chunk) == self.chunk_size:
+                self._import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk)
+        return self.report()
+
+    def report(self) -> dict:
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'classified': self.classified,
+            'errors': self.errors,
+        }
+
+    def _import_chunk(self, chunk):
+        tickets = []
+        unclassified = []
+        for number, row in chunk:
+            ticket, errors = self._build_ticket(row)
+            if errors:
+                self._reject(number, errors)
+                continue
+            tickets.append(ticket)
+            if not ticket.category or not ticket.priority:
+                unclassified.append(ticket)
+
+        if unclassified:
+            results = llm_service.classify_batch([ticket.description for ticket in unclassified])
+            for ticket, result in zip(unclassified, results):
+                ticket.category = ticket.category or result['suggested_category']
+                ticket.priority = ticket.priority or result['suggested_priority']
+            self.classified += len(unclassified)
+
+        if not tickets:
+            return
+
+        for ticket in tickets:
+            ticket.similarity_signature = similarity_index.signature_for(ticket.title, ticket.description)
+
+        with transaction.atomic():
+            Ticket.objects.bulk_create(tickets)
+            similarity_index.index(tickets)
+            stats_service.record_bulk_created(tickets)
+            event_log.record_bulk_created(tickets)
+            tickets_bulk_created.send(sender=Ticket, tickets=tickets)
+        self.created += len(tickets)
+
+    def _build_ticket(self, row):
+        """
+        Returns:
+            (unsaved Ticket, None) or (None, dict of field errors)
+        """
+        if not isinstance(row, dict):
+            return None, {'non_field_errors': ['Expected a JSON object']}
+
+        errors = {}
+        values = {}
+        for field, validate in (
+            ('title', self._serializer.validate_title),
+            ('description', self._serializer.validate_description),
+        ):
+            try:
+                values[field] = validate(str(row.get(field) or ''))
+            except serializers.ValidationError as e:
+                errors[field] = e.detail
+
+        for field, choices in (('category', CATEGORIES), ('priority', PRIORITIES)):
+            value = str(row.get(field) or '').strip()
+            if value and value not in choices:
+                errors[field] = [f'"{value}" is not a valid choice.']
+            elif not value and not self.classify:
+                errors[field] = ['This field is required.']
+            values[field] = value
+
+        ticket_status = str(row.get('status') or 'open').strip()
+        if ticket_status not in STATUSES:
+            errors['status'] = [f'"{ticket_status}" is not a valid choice.']
+
+        created_at = None
+        if row.get('created_at'):
+            try:
+                created_at = parse_datetime(str(row['created_at']))
+            except ValueError:
+                created_at = None
+            if created_at is None:
+                errors['created_at'] = ['Expected an ISO 8601 datetime.']
+            elif timezone.is_naive(created_at):
+                created_at = timezone.make_aware(created_at)
+
+        if errors:
+            return None, errors
+        ticket = Ticket(status=ticket_status, **values)
+        if created_at:
+            ticket.created_at = created_at
+        return ticket, None
+
+    def _reject(self, number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': number, 'errors': errors})
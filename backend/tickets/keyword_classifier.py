@@ -0,0 +1,163 @@
+import json
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+# Weighted keyword table. For each field, labels are listed in precedence
+# order (earlier labels win ties) and `default` is used when nothing matches.
+DEFAULT_KEYWORDS = {
+    'category': {
+        'default': 'general',
+        'labels': {
+            'billing': {
+                'payment': 2.0, 'invoice': 2.0, 'refund': 2.0, 'bill': 1.5,
+                'charge': 1.5, 'subscription': 1.0, 'price': 1.0, 'cost': 1.0,
+            },
+            'technical': {
+                'crash': 2.0, 'bug': 2.0, 'error': 1.5, 'not working': 1.5,
+                'broken': 1.5, 'timeout': 1.5, 'issue': 0.5, 'problem': 0.5,
+            },
+            'account': {
+                'password': 2.0, 'login': 2.0, 'log in': 2.0, 'sign in': 2.0,
+                'register': 1.5, 'registration': 1.5, 'account': 1.0,
+                'access': 1.0, 'permission': 1.0,
+            },
+        },
+    },
+    'priority': {
+        'default': 'medium',
+        'labels': {
+            'critical': {
+                'urgent': 2.0, 'critical': 2.0, 'emergency': 2.0, 'security': 2.0,
+                'cannot access': 1.5, 'outage': 1.5, 'down': 1.0,
+            },
+            'high': {
+                'asap': 2.0, 'important': 1.5, 'serious': 1.5, 'major': 1.5,
+            },
+            'low': {
+                'minor': 1.5, 'question': 1.0, 'small': 1.0, 'info': 1.0,
+                'information': 1.0,
+            },
+        },
+    },
+}
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Inflections accepted after a keyword: 'crash' matches 'crashes', 'charge'
+# matches 'charged', but 'down' does not match 'download'
+SUFFIXES = ('', 's', 'es', 'd', 'ed', 'ing', 'ings', 'er', 'ers')
+
+# Result keys for each field of the keyword table
+RESULT_KEYS = {'category': 'suggested_category', 'priority': 'suggested_priority'}
+
+
+def _normalize_keyword(keyword: str) -> str:
+    return ' '.join(keyword.lower().split())
+
+
+class KeywordClassifier:
+    """
+    Keyword classifier compiled into hashed lookup tables.
+
+    Every inflected form of every single-word keyword maps to its keyword in
+    one dict, so a description is tokenized once and matched with a single
+    set intersection no matter how large the table is. Multi-word keywords
+    are indexed by their first word and only checked when it occurs. Each
+    distinct keyword found adds its weight to its label and the highest
+    scoring label per field wins.
+    """
+
+    def __init__(self, table):
+        self.defaults = {}
+        self.labels = {}
+        self._weights = {}
+
+        for field, spec in table.items():
+            self.defaults[field] = spec['default']
+            self.labels[field] = list(spec['labels'])
+            for label, keywords in spec['labels'].items():
+                for keyword, weight in keywords.items():
+                    self._weights.setdefault(_normalize_keyword(keyword), []).append(
+                        (field, label, float(weight))
+                    )
+
+        # Surface form -> keyword. Bare keywords are added before inflected
+        # forms so a keyword is never shadowed by another one's inflection.
+        self._words = {}
+        self._phrases = {}
+        for suffix in SUFFIXES:
+            for keyword in self._weights:
+                if ' ' in keyword:
+                    self._phrases.setdefault(keyword.split(' ', 1)[0], []).append(
+                        (f' {keyword}{suffix} ', keyword)
+                    )
+                else:
+                    self._words.setdefault(keyword + suffix, keyword)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a keyword table in DEFAULT_KEYWORDS format from a JSON file"""
+        try:
+            with open(path, encoding='utf-8') as table_file:
+                table = json.load(table_file)
+        except (OSError, ValueError) as e:
+            raise ImproperlyConfigured(f"Cannot load keyword table {path}: {e}")
+        return cls(table)
+
+    def match(self, description: str) -> set:
+        """Return the distinct table keywords occurring in `description`"""
+        tokens = TOKEN_PATTERN.findall(description.lower())
+        token_set = set(tokens)
+        matched = {self._words[token] for token in self._words.keys() & token_set}
+
+        first_words = self._phrases.keys() & token_set
+        if first_words:
+            text = f" {' '.join(tokens)} "
+            for first_word in first_words:
+                for surface, keyword in self._phrases[first_word]:
+                    if surface in text:
+                        matched.add(keyword)
+        return matched
+
+    def classify(self, description: str) -> dict:
+        """
+        Score a description against the keyword table.
+
+        Returns:
+            dict with suggested_category, suggested_priority and a
+            confidence in [0, 1]: 0 when no keyword matched, approaching 1
+            as strong, unambiguous keywords accumulate
+        """
+        scores = {field: {} for field in self.defaults}
+        for keyword in self.match(description):
+            for field, label, weight in self._weights[keyword]:
+                scores[field][label] = scores[field].get(label, 0.0) + weight
+
+        result = {}
+        confidences = []
+        for field, label_scores in scores.items():
+            if not label_scores:
+                result[RESULT_KEYS.get(field, field)] = self.defaults[field]
+                confidences.append(0.0)
+                continue
+
+            best = max(self.labels[field], key=lambda label: label_scores.get(label, 0.0))
+            top = label_scores[best]
+            # Share of the evidence for the winner, damped when evidence is thin
+            confidences.append(top / sum(label_scores.values()) * top / (top + 1))
+            result[RESULT_KEYS.get(field, field)] = best
+
+        result['confidence'] = round(sum(confidences) / len(confidences), 2)
+        return result
+
+
+def build_keyword_classifier(path=''):
+    """
+    Create the fallback classifier from LLM_FALLBACK_KEYWORDS_FILE, or from
+    DEFAULT_KEYWORDS when no file is configured.
+    """
+    if path:
+        return KeywordClassifier.from_file(path)
+    return KeywordClassifier(DEFAULT_KEYWORDS)
@@ -0,0 +1,359 @@
+import asyncio
+import json
+import logging
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Ticket
+from .serializers import TicketSerializer
+from .signals import tickets_bulk_created, tickets_bulk_updated
+from .trends import is_resolution
+
+
+logger = logging.getLogger(__name__)
+
+
+# PostgreSQL channel carrying events between processes
+NOTIFY_CHANNEL = 'ticket_updates'
+
+# NOTIFY payloads must be shorter than 8000 bytes
+MAX_NOTIFY_BYTES = 7900
+
+# Description length kept when an event would not fit in a NOTIFY payload
+TRUNCATED_DESCRIPTION_LENGTH = 1000
+
+# DATABASES OPTIONS that Django consumes itself rather than passing to psycopg
+DJANGO_ONLY_OPTIONS = {'pool', 'server_side_binding', 'isolation_level', 'assume_role'}
+
+BUCKET_FIELDS = ('category', 'priority', 'status')
+
+KEEPALIVE_FRAME = b': keepalive\n\n'
+RESYNC_FRAME = b'data: {"type": "resync"}\n\n'
+
+
+def stats_delta(removed=(), added=()) -> dict:
+    """
+    Dashboard counter changes for tickets leaving and entering buckets.
+
+    Args:
+        removed: (category, priority, status) buckets losing a ticket
+        added: buckets gaining a ticket
+
+    Returns:
+        dict with the change in total and, per breakdown, the non-zero
+        changes by value, e.g. {'total': 0, 'status': {'open': -1,
+        'closed': 1}, 'category': {}, 'priority': {}}
+    """
+    delta = {'total': 0, 'category': {}, 'priority': {}, 'status': {}}
+    for buckets, sign in ((removed, -1), (added, 1)):
+        for bucket in buckets:
+            delta['total'] += sign
+            for field, value in zip(BUCKET_FIELDS, bucket):
+                delta[field][value] = delta[field].get(value, 0) + sign
+    for field in BUCKET_FIELDS:
+        delta[field] = {value: change for value, change in delta[field].items() if change}
+    return delta
+
+
+def trend_delta(created=(), resolved=()) -> list:
+    """
+    Daily rollup changes for tickets created and resolved.
+
+    Args:
+        created: (day, category, priority) of each created ticket
+        resolved: (day, category, priority) of each resolved ticket
+
+    Returns:
+        list of the changed days, shaped like TrendService.series() points
+        but holding the changes, e.g. [{'date': day, 'created': 1,
+        'resolved': 0, 'category': {'billing': {'created': 1, 'resolved': 0}},
+        'priority': {...}}]
+    """
+    points = {}
+    for tickets, field in ((created, 'created'), (resolved, 'resolved')):
+        for day, category, priority in tickets:
+            point = points.setdefault(day, {
+                'date': day, 'created': 0, 'resolved': 0, 'category': {}, 'priority': {},
+            })
+            point[field] += 1
+            for breakdown, value in (('category', category), ('priority', priority)):
+                counts = point[breakdown].setdefault(value, {'created': 0, 'resolved': 0})
+                counts[field] += 1
+    return [points[day] for day in sorted(points)]
+
+
+class LiveUpdateHub:
+    """
+    Fans ticket events out to the server-sent event streams open in this
+    process.
+
+    Each stream is a bounded asyncio.Queue read by its response generator.
+    An event is encoded once and the same bytes are put on every queue, so
+    an idle stream costs a queue and a suspended generator, and a publish
+    costs one put_nowait per stream. A stream whose queue fills up is
+    closed rather than allowed to fall behind; the browser reconnects and
+    resyncs. One task per process sends the keepalive comments, and with
+    the postgres backend one task LISTENs for events written by any process.
+    """
+
+    def __init__(self, max_queued=100, keepalive_seconds=15.0):
+        """
+        Args:
+            max_queued: frames buffered per stream before it is dropped
+            keepalive_seconds: interval of the comment frames that keep
+                idle connections open through proxies
+        """
+        self.max_queued = max_queued
+        self.keepalive_seconds = keepalive_seconds
+        self.published = 0
+        self.dropped = 0
+        self._subscribers = set()
+        self._loop = None
+        self._tasks = []
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a stream; must be called from the serving event loop"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._start(loop)
+        queue = asyncio.Queue(self.max_queued)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self._subscribers.discard(queue)
+
+    async def stream(self):
+        """Async generator of SSE frames for one client, for StreamingHttpResponse"""
+        queue = self.subscribe()
+        try:
+            # Reconnect delay for the browser, and flushes the headers
+            yield b'retry: 3000\n\n'
+            while True:
+                frame = await queue.get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(queue)
+
+    def publish(self, data: str):
+        """Send a JSON-encoded event to the streams in this process, from any thread"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self.dispatch, f'data: {data}\n\n'.encode())
+
+    def dispatch(self, frame: bytes):
+        """Put `frame` on every stream's queue; event loop thread only"""
+        self.published += 1
+        overflowed = []
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                overflowed.append(queue)
+        for queue in overflowed:
+            self._close(queue)
+
+    def stats(self) -> dict:
+        return {
+            'streams': len(self._subscribers),
+            'published': self.published,
+            'dropped': self.dropped,
+        }
+
+    def _close(self, queue):
+        self._subscribers.discard(queue)
+        self.dropped += 1
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def _start(self, loop):
+        for task in self._tasks:
+            task.cancel()
+        self._loop = loop
+        self._subscribers = set()
+        self._tasks = [loop.create_task(self._keepalive())]
+        if live_updates_backend() == 'postgres':
+            self._tasks.append(loop.create_task(self._listen()))
+
+    async def _keepalive(self):
+        while True:
+            await asyncio.sleep(self.keepalive_seconds)
+            self.dispatch(KEEPALIVE_FRAME)
+
+    async def _listen(self):
+        import psycopg
+
+        while True:
+            try:
+                conn = await psycopg.AsyncConnection.connect(
+                    **_listener_connection_params(), autocommit=True
+                )
+                async with conn:
+                    await conn.execute(f'LISTEN {NOTIFY_CHANNEL}')
+                    # Events may have been missed while disconnected
+                    self.dispatch(RESYNC_FRAME)
+                    async for notify in conn.notifies():
+                        self.dispatch(f'data: {notify.payload}\n\n'.encode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Live update listener error")
+                await asyncio.sleep(1)
+
+
+def live_updates_backend() -> str:
+    """
+    Returns:
+        'postgres' (NOTIFY, reaches every process), 'local' (this process
+        only) or 'off'
+    """
+    backend = getattr(settings, 'LIVE_UPDATES_BACKEND', 'auto')
+    if backend == 'auto':
+        return 'postgres' if connection.vendor == 'postgresql' else 'local'
+    return backend
+
+
+def _listener_connection_params() -> dict:
+    database = settings.DATABASES['default']
+    options = {
+        key: value for key, value in database.get('OPTIONS', {}).items()
+        if key not in DJANGO_ONLY_OPTIONS
+    }
+    params = {
+        'dbname': database['NAME'],
+        'user': database.get('USER'),
+        'password': database.get('PASSWORD'),
+        'host': database.get('HOST'),
+        'port': database.get('PORT'),
+        **options,
+    }
+    return {key: value for key, value in params.items() if value}
+
+
+def publish_event(event: dict):
+    """
+    Publish `event` once the current transaction commits.
+
+    With the postgres backend the event is sent with pg_notify, which
+    PostgreSQL delivers to every listening process on commit and discards
+    on rollback.
+    """
+    backend = live_updates_backend()
+    if backend == 'off':
+        return
+
+    data = json.dumps(event, cls=DjangoJSONEncoder)
+    if backend == 'postgres':
+        if len(data.encode('utf-8')) > MAX_NOTIFY_BYTES:
+            data = json.dumps(_shrink(event), cls=DjangoJSONEncoder)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [NOTIFY_CHANNEL, data])
+    else:
+        transaction.on_commit(lambda: live_update_hub.publish(data))
+
+
+def _shrink(event):
+    ticket = event.get('ticket')
+    if ticket:
+        event = {
+            **event,
+            'ticket': {**ticket, 'description': ticket['description'][:TRUNCATED_DESCRIPTION_LENGTH]},
+        }
+        if len(json.dumps(event, cls=DjangoJSONEncoder).encode('utf-8')) <= MAX_NOTIFY_BYTES:
+            return event
+    return {'type': 'resync'}
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    bucket = (instance.category, instance.priority, instance.status)
+    if created:
+        delta = stats_delta(added=[bucket])
+        trends = trend_delta(created=[
+            (timezone.localdate(instance.created_at), instance.category, instance.priority)
+        ])
+    else:
+        old_bucket = getattr(instance, '_loaded_bucket', None)
+        # None tells the dashboard to refetch the statistics and trends
+        delta = stats_delta([old_bucket], [bucket]) if old_bucket else None
+        if old_bucket is None:
+            trends = None
+        elif is_resolution(old_bucket[2], instance.status):
+            trends = trend_delta(resolved=[
+                (timezone.localdate(instance.updated_at), instance.category, instance.priority)
+            ])
+        else:
+            trends = []
+    instance._loaded_bucket = bucket
+
+    publish_event({
+        'type': 'created' if created else 'updated',
+        'ticket': TicketSerializer(instance).data,
+        'stats': delta,
+        'trends': trends,
+    })
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs):
+    publish_event({
+        'type': 'deleted',
+        'id': instance.pk,
+        'stats': stats_delta(removed=[(instance.category, instance.priority, instance.status)]),
+        # The rollups keep counting deleted tickets
+        'trends': [],
+    })
+
+
+@receiver(tickets_bulk_created, sender=Ticket)
+def tickets_created(sender, tickets, **kwargs):
+    publish_event({
+        'type': 'bulk_created',
+        'count': len(tickets),
+        'stats': stats_delta(added=[
+            (ticket.category, ticket.priority, ticket.status) for ticket in tickets
+        ]),
+        'trends': trend_delta(created=[
+            (timezone.localdate(ticket.created_at), ticket.category, ticket.priority)
+            for ticket in tickets
+        ]),
+    })
+
+
+@receiver(tickets_bulk_updated, sender=Ticket)
+def tickets_updated(sender, ids, old_buckets, changes, changed_at, **kwargs):
+    new_buckets = [
+        tuple(changes.get(field, value) for field, value in zip(BUCKET_FIELDS, bucket))
+        for bucket in old_buckets
+    ]
+    day = timezone.localdate(changed_at)
+    publish_event({
+        'type': 'bulk_updated',
+        'ids': ids,
+        'changes': changes,
+        'stats': stats_delta(old_buckets, new_buckets),
+        'trends': trend_delta(resolved=[
+            (day, category, priority)
+            for (_category, _priority, old_status), (category, priority, new_status)
+            in zip(old_buckets, new_buckets)
+            if is_resolution(old_status, new_status)
+        ]),
+    })
+
+
+# Singleton instance
+live_update_hub = LiveUpdateHub(
+    max_queued=getattr(settings, 'LIVE_UPDATES_MAX_QUEUED', 100),
+    keepalive_seconds=getattr(settings, 'LIVE_UPDATES_KEEPALIVE_SECONDS', 15),
+)
@@ -1,8 +1,14 @@
 import os
 import json
-from openai import OpenAI
+import asyncio
+from openai import AsyncOpenAI, OpenAI
 from django.conf import settings
 
+from .circuit_breaker import CircuitBreaker
+from .classification_cache import build_classification_cache
+from .keyword_classifier import build_keyword_classifier
+from .local_classifier import load_local_classifier
+
 
 class LLMService:
     """
@@ -10,14 +16,63 @@ class LLMService:
     Uses OpenAI API for ticket classification.
     """
     
-    def __init__(self):
+    # Rough characters-per-token ratio used to size batch prompts
+    CHARS_PER_TOKEN = 4
+    
+    # Longest description (in characters) sent inside a batch prompt
+    BATCH_DESCRIPTION_CHARS = 2000
+    
+    # Completion tokens reserved per item in a batch response
+    BATCH_TOKENS_PER_ITEM = 25
+    
+    def __init__(self, client=None, async_client=None):
         self.api_key = settings.LLM_API_KEY
-        self.client = None
-        if self.api_key and self.api_key != 'your_openai_api_key_here':
+        self.base_url = getattr(settings, 'LLM_BASE_URL', None) or None
+        self.timeout = getattr(settings, 'LLM_TIMEOUT_SECONDS', 10)
+        self.client = client
+        self.async_client = async_client
+        if client is None and self.api_key and self.api_key != 'your_openai_api_key_here':
             try:
-                self.client = OpenAI(api_key=self.api_key)
+                # No client-side retries: the circuit breaker decides when to try again
+                self.client = OpenAI(
+                    api_key=self.api_key, base_url=self.base_url,
+                    timeout=self.timeout, max_retries=0
+                )
+                self.async_client = AsyncOpenAI(
+                    api_key=self.api_key, base_url=self.base_url,
+                    timeout=self.timeout, max_retries=0
+                )
             except Exception:
                 self.client = None
+                self.async_client = None
+        
+        # Shared by the sync and async paths
+        self.breaker = CircuitBreaker(
+            failure_threshold=getattr(settings, 'LLM_BREAKER_FAILURES', 5),
+            reset_timeout=getattr(settings, 'LLM_BREAKER_RESET_SECONDS', 30),
+        )
+        self.max_concurrency = getattr(settings, 'LLM_MAX_CONCURRENCY', 20)
+        self._semaphore = None
+        
+        # Compiled once; serves every classification the LLM can't answer
+        self.keyword_classifier = build_keyword_classifier(
+            getattr(settings, 'LLM_FALLBACK_KEYWORDS_FILE', '')
+        )
+        
+        # Model trained on past tickets; answers confident cases without the LLM
+        self.local_classifier = load_local_classifier(getattr(settings, 'LLM_LOCAL_MODEL_DIR', ''))
+        self.local_confidence = getattr(settings, 'LLM_LOCAL_CONFIDENCE', 0.8)
+        
+        # Cache of LLM classifications keyed on the normalized description
+        self.cache = build_classification_cache(
+            backend=getattr(settings, 'LLM_CACHE_BACKEND', 'memory'),
+            max_entries=getattr(settings, 'LLM_CACHE_MAX_ENTRIES', 1024),
+            ttl=getattr(settings, 'LLM_CACHE_TTL_SECONDS', 3600),
+        )
+        
+        # Prompt size limits for batch classification
+        self.batch_token_budget = getattr(settings, 'LLM_BATCH_TOKEN_BUDGET', 3000)
+        self.batch_max_items = getattr(settings, 'LLM_BATCH_MAX_ITEMS', 50)
     
     def classify_ticket(self, description: str) -> dict:
         """
@@ -30,58 +85,288 @@ class LLMService:
             dict with suggested_category and suggested_priority
         """
         
+        local = self._local_classification(description)
+        if local is not None:
+            return local
+        
         # Graceful fallback if LLM is not available
         if not self.client:
             return self._fallback_classification(description)
         
+        # Identical (whitespace/case-insensitive) descriptions skip the LLM
+        if self.cache is not None:
+            cached = self.cache.get(description)
+            if cached is not None:
+                return dict(cached)
+        
+        # Upstream has been failing: don't pay for another timeout
+        if not self.breaker.allow():
+            return self._fallback_classification(description)
+        
+        try:
+            response = self.client.chat.completions.create(
+                **self._classification_request(description)
+            )
+        except Exception as e:
+            self.breaker.record_failure()
+            print(f"LLM classification error: {str(e)}")
+            return self._fallback_classification(description)
+        except BaseException:
+            # Interrupted: still settle the breaker, or a probe would leave it half open
+            self.breaker.record_failure()
+            raise
+        
+        self.breaker.record_success()
+        return self._handle_classification_response(description, response)
+    
+    async def aclassify_ticket(self, description: str) -> dict:
+        """
+        Async variant of classify_ticket for ASGI views.
+        
+        At most LLM_MAX_CONCURRENCY completions are in flight per process;
+        waiting for a slot and the call itself share one LLM_TIMEOUT_SECONDS
+        deadline. Timeouts and errors count towards the circuit breaker.
+        """
+        local = self._local_classification(description)
+        if local is not None:
+            return local
+        
+        if not self.async_client:
+            return self._fallback_classification(description)
+        
+        if self.cache is not None:
+            cached = self.cache.get(description)
+            if cached is not None:
+                return dict(cached)
+        
+        if not self.breaker.allow():
+            return self._fallback_classification(description)
+        
         try:
-            prompt = self._build_classification_prompt(description)
+            response = await asyncio.wait_for(
+                self._bounded_completion(description), timeout=self.timeout
+            )
+        except Exception as e:
+            self.breaker.record_failure()
+            print(f"LLM classification error: {type(e).__name__} {str(e)}")
+            return self._fallback_classification(description)
+        except BaseException:
+            # Cancelled (e.g. the client disconnected): still settle the
+            # breaker, or a probe would leave it half open
+            self.breaker.record_failure()
+            raise
+        
+        self.breaker.record_success()
+        return self._handle_classification_response(description, response)
+    
+    async def _bounded_completion(self, description: str):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            return await self.async_client.chat.completions.create(
+                **self._classification_request(description)
+            )
+    
+    def _local_classification(self, description: str):
+        """
+        Ask the local model first.
+        
+        Returns:
+            dict classification, or None when no model is loaded or its
+            confidence is below LLM_LOCAL_CONFIDENCE
+        """
+        if self.local_classifier is None:
+            return None
+        result = self.local_classifier.predict(description)
+        if result['confidence'] < self.local_confidence:
+            return None
+        self.local_classifier.record_answer()
+        return result
+    
+    def _classification_request(self, description: str) -> dict:
+        """Build chat completion arguments for a single classification"""
+        return {
+            'model': "gpt-3.5-turbo",
+            'messages': [
+                {
+                    "role": "system",
+                    "content": "You are a support ticket classifier. Analyze the description and return only a JSON object with 'category' and 'priority' fields."
+                },
+                {
+                    "role": "user",
+                    "content": self._build_classification_prompt(description)
+                }
+            ],
+            'temperature': 0.3,
+            'max_tokens': 100,
+        }
+    
+    def _handle_classification_response(self, description: str, response) -> dict:
+        """Parse and normalize an LLM reply, caching valid classifications"""
+        try:
+            # Parse LLM response
+            result_text = response.choices[0].message.content.strip()
+            
+            # Try to extract JSON from response
+            result = self._extract_json(result_text)
             
+            # Validate and normalize the response
+            category = self._normalize_category(result.get('category', 'general'))
+            priority = self._normalize_priority(result.get('priority', 'medium'))
+        
+        except Exception:
+            # If parsing fails, use fallback
+            return self._fallback_classification(description)
+        
+        classification = {
+            'suggested_category': category,
+            'suggested_priority': priority
+        }
+        if self.cache is not None:
+            self.cache.set(description, classification)
+        return classification
+    
+    def classify_batch(self, descriptions: list) -> list:
+        """
+        Classify many descriptions with as few LLM calls as possible.
+        
+        Descriptions the local model is confident about, or that are
+        cached, are answered without the LLM; the rest are packed into
+        prompts bounded by LLM_BATCH_TOKEN_BUDGET and LLM_BATCH_MAX_ITEMS,
+        each asking for a JSON list keyed by item id. Items missing from or
+        malformed in the response use the keyword fallback.
+        
+        Args:
+            descriptions: list of ticket description strings
+            
+        Returns:
+            list of dicts with suggested_category and suggested_priority,
+            in the same order as `descriptions`
+        """
+        results = [None] * len(descriptions)
+        pending = []
+        for index, description in enumerate(descriptions):
+            local = self._local_classification(description)
+            if local is not None:
+                results[index] = local
+            elif not self.client:
+                results[index] = self._fallback_classification(description)
+            else:
+                cached = self.cache.get(description) if self.cache is not None else None
+                if cached is not None:
+                    results[index] = dict(cached)
+                else:
+                    pending.append(index)
+        
+        for chunk in self._chunk_by_budget(pending, descriptions):
+            classified = self._classify_chunk([(index, descriptions[index]) for index in chunk])
+            for index in chunk:
+                classification = classified.get(index)
+                if classification is None:
+                    classification = self._fallback_classification(descriptions[index])
+                elif self.cache is not None:
+                    self.cache.set(descriptions[index], classification)
+                results[index] = classification
+        
+        return results
+    
+    def _chunk_by_budget(self, indexes, descriptions):
+        """Split item indexes into groups whose prompts fit the token budget"""
+        base_tokens = len(self._build_batch_prompt([])) // self.CHARS_PER_TOKEN
+        chunk = []
+        chunk_tokens = base_tokens
+        for index in indexes:
+            text = descriptions[index][:self.BATCH_DESCRIPTION_CHARS]
+            item_tokens = len(text) // self.CHARS_PER_TOKEN + 10
+            if chunk and (
+                chunk_tokens + item_tokens > self.batch_token_budget
+                or len(chunk) >= self.batch_max_items
+            ):
+                yield chunk
+                chunk = []
+                chunk_tokens = base_tokens
+            chunk.append(index)
+            chunk_tokens += item_tokens
+        if chunk:
+            yield chunk
+    
+    def _classify_chunk(self, items) -> dict:
+        """
+        Classify (id, description) pairs in one completion.
+        
+        Returns:
+            dict mapping item id to classification for every item the LLM
+            answered validly; failures are simply left out
+        """
+        if not self.breaker.allow():
+            return {}
+        
+        try:
             response = self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a support ticket classifier. Analyze the description and return only a JSON object with 'category' and 'priority' fields."
+                        "content": "You are a support ticket classifier. Analyze each numbered description and return only a JSON array of objects with 'id', 'category' and 'priority' fields."
                     },
                     {
                         "role": "user",
-                        "content": prompt
+                        "content": self._build_batch_prompt(items)
                     }
                 ],
                 temperature=0.3,
-                max_tokens=100
+                max_tokens=self.BATCH_TOKENS_PER_ITEM * len(items) + 20
             )
-            
-            # Parse LLM response
-            result_text = response.choices[0].message.content.strip()
-            
-            # Try to extract JSON from response
-            try:
-                # Remove markdown code blocks if present
-                if '```json' in result_text:
-                    result_text = result_text.split('```json')[1].split('```')[0].strip()
-                elif '```' in result_text:
-                    result_text = result_text.split('```')[1].split('```')[0].strip()
-                
-                result = json.loads(result_text)
-                
-                # Validate and normalize the response
-                category = self._normalize_category(result.get('category', 'general'))
-                priority = self._normalize_priority(result.get('priority', 'medium'))
-                
-                return {
-                    'suggested_category': category,
-                    'suggested_priority': priority
-                }
-                
-            except json.JSONDecodeError:
-                # If JSON parsing fails, use fallback
-                return self._fallback_classification(description)
-        
         except Exception as e:
-            print(f"LLM classification error: {str(e)}")
-            return self._fallback_classification(description)
+            self.breaker.record_failure()
+            print(f"LLM batch classification error: {str(e)}")
+            return {}
+        except BaseException:
+            self.breaker.record_failure()
+            raise
+        
+        self.breaker.record_success()
+        try:
+            result = self._extract_json(response.choices[0].message.content.strip())
+        except Exception:
+            return {}
+        
+        if isinstance(result, dict):
+            result = result.get('results', [])
+        if not isinstance(result, list):
+            return {}
+        
+        known_ids = {item_id for item_id, _description in items}
+        classified = {}
+        for entry in result:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                item_id = int(entry.get('id'))
+            except (TypeError, ValueError):
+                continue
+            if item_id not in known_ids:
+                continue
+            classified[item_id] = {
+                'suggested_category': self._normalize_category(str(entry.get('category', 'general'))),
+                'suggested_priority': self._normalize_priority(str(entry.get('priority', 'medium'))),
+            }
+        return classified
+    
+    def _extract_json(self, result_text: str):
+        """Parse JSON from an LLM reply, removing markdown code blocks if present"""
+        if '```json' in result_text:
+            result_text = result_text.split('```json')[1].split('```')[0].strip()
+        elif '```' in result_text:
+            result_text = result_text.split('```')[1].split('```')[0].strip()
+        return json.loads(result_text)
+    
+    def cache_stats(self) -> dict:
+        """Return classification cache hit/miss counters, breaker and local model state"""
+        stats = {'enabled': False} if self.cache is None else {'enabled': True, **self.cache.stats()}
+        stats['circuit'] = self.breaker.stats()
+        stats['local_model'] = self.local_classifier.stats() if self.local_classifier else {'loaded': False}
+        return stats
     
     def _build_classification_prompt(self, description: str) -> str:
         """Build the classification prompt for LLM"""
@@ -104,6 +389,32 @@ Priority levels:
 Return ONLY a JSON object in this exact format:
 {{"category": "one_of_the_categories", "priority": "one_of_the_priorities"}}"""
     
+    def _build_batch_prompt(self, items) -> str:
+        """Build a prompt classifying several (id, description) pairs at once"""
+        listing = "\n".join(
+            f"{item_id}. {json.dumps(description[:self.BATCH_DESCRIPTION_CHARS])}"
+            for item_id, description in items
+        )
+        return f"""Classify each support ticket below into a category and priority level.
+
+Tickets:
+{listing}
+
+Categories:
+- billing: Payment, invoices, refunds, pricing issues
+- technical: Bugs, errors, system issues, integration problems
+- account: Login, registration, profile, permissions
+- general: Questions, feedback, feature requests
+
+Priority levels:
+- low: Minor issues, general questions
+- medium: Normal issues affecting single user
+- high: Significant issues affecting multiple users
+- critical: System down, data loss, security issues
+
+Return ONLY a JSON array with one object per ticket, using the ticket numbers as ids:
+[{{"id": 1, "category": "one_of_the_categories", "priority": "one_of_the_priorities"}}]"""
+    
     def _normalize_category(self, category: str) -> str:
         """Normalize category to valid choices"""
         valid_categories = ['billing', 'technical', 'account', 'general']
@@ -142,36 +453,10 @@ Return ONLY a JSON object in this exact format:
     
     def _fallback_classification(self, description: str) -> dict:
         """
-        Fallback classification using simple keyword matching.
+        Fallback classification using weighted keyword matching.
         Used when LLM API is unavailable.
         """
-        description_lower = description.lower()
-        
-        # Determine category
-        if any(word in description_lower for word in ['payment', 'bill', 'invoice', 'refund', 'charge', 'price', 'cost']):
-            category = 'billing'
-        elif any(word in description_lower for word in ['bug', 'error', 'crash', 'not working', 'broken', 'issue', 'problem']):
-            category = 'technical'
-        elif any(word in description_lower for word in ['login', 'password', 'account', 'register', 'access', 'permission']):
-            category = 'account'
-        else:
-            category = 'general'
-        
-        # Determine priority
-        if any(word in description_lower for word in ['urgent', 'critical', 'emergency', 'down', 'cannot access', 'security']):
-            priority = 'critical'
-        elif any(word in description_lower for word in ['important', 'asap', 'serious', 'major']):
-            priority = 'high'
-        elif any(word in description_lower for word in ['minor', 'small', 'question', 'info']):
-            priority = 'low'
-        else:
-            priority = 'medium'
-        
-        return {
-            'suggested_category': category,
-            'suggested_priority': priority
-        }
-
+        return self.keyword_classifier.classify(description)
 
 # Singleton instance
 llm_service = LLMService()
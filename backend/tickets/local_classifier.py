@@ -0,0 +1,215 @@
+import json
+import os
+import shutil
+import threading
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # The local model is optional
+    np = None
+
+from .keyword_classifier import TOKEN_PATTERN
+
+
+MODEL_VERSION = 1
+
+# Files making up a saved model directory
+WEIGHTS_FILE = 'weights.npy'
+BIAS_FILE = 'bias.npy'
+META_FILE = 'meta.json'
+
+
+def hashed_features(text: str, n_features: int) -> list:
+    """
+    Hash the unigrams and bigrams of `text` into `n_features` buckets.
+
+    crc32 is used rather than hash() so indexes are stable across processes.
+    `n_features` must be a power of two.
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    grams = tokens + [f'{first} {second}' for first, second in zip(tokens, tokens[1:])]
+    mask = n_features - 1
+    return list({zlib.crc32(gram.encode('utf-8')) & mask for gram in grams})
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=-1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class LocalClassifier:
+    """
+    Hashed bag-of-words linear model predicting category and priority.
+
+    One weight matrix holds both softmax heads: the first
+    len(categories) columns score categories, the rest priorities.
+    Weights loaded from disk are memory-mapped, so every worker shares the
+    same pages and start-up does not read the whole file.
+    """
+
+    def __init__(self, weights, bias, categories, priorities, meta=None):
+        self.weights = weights
+        self.bias = bias
+        self.categories = list(categories)
+        self.priorities = list(priorities)
+        self.n_features = weights.shape[0]
+        self.meta = meta or {}
+        self.answered = 0
+        self._counter_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a model saved by LocalClassifierTrainer.save()"""
+        with open(os.path.join(path, META_FILE), encoding='utf-8') as meta_file:
+            meta = json.load(meta_file)
+        if meta.get('version') != MODEL_VERSION:
+            raise ValueError(f"Unsupported model version {meta.get('version')}")
+        return cls(
+            np.load(os.path.join(path, WEIGHTS_FILE), mmap_mode='r'),
+            np.load(os.path.join(path, BIAS_FILE)),
+            meta['categories'],
+            meta['priorities'],
+            meta,
+        )
+
+    def predict(self, description: str) -> dict:
+        """
+        Returns:
+            dict with suggested_category, suggested_priority and confidence,
+            the lower of the two heads' top probabilities
+        """
+        indexes = hashed_features(description, self.n_features)
+        scores = self.bias.copy()
+        if indexes:
+            scores += self.weights[indexes].sum(axis=0) / np.sqrt(len(indexes))
+
+        split = len(self.categories)
+        category_probs = _softmax(scores[:split])
+        priority_probs = _softmax(scores[split:])
+        category = int(category_probs.argmax())
+        priority = int(priority_probs.argmax())
+
+        return {
+            'suggested_category': self.categories[category],
+            'suggested_priority': self.priorities[priority],
+            'confidence': round(float(min(category_probs[category], priority_probs[priority])), 2),
+        }
+
+    def record_answer(self):
+        """Count a prediction used instead of the LLM; safe across threads"""
+        with self._counter_lock:
+            self.answered += 1
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            answered = self.answered
+        return {
+            'loaded': True,
+            'answered': answered,
+            'trained_at': self.meta.get('trained_at'),
+            'samples': self.meta.get('samples'),
+        }
+
+
+class LocalClassifierTrainer:
+    """
+    Mini-batch SGD for the LocalClassifier weights.
+
+    Call partial_fit() with successive chunks of training data, once per
+    epoch, then save().
+    """
+
+    def __init__(self, categories, priorities, n_features=2 ** 18, learning_rate=0.5):
+        if n_features & (n_features - 1):
+            raise ValueError('n_features must be a power of two')
+        self.categories = list(categories)
+        self.priorities = list(priorities)
+        self.n_features = n_features
+        self.learning_rate = learning_rate
+        n_outputs = len(self.categories) + len(self.priorities)
+        self.weights = np.zeros((n_features, n_outputs), dtype=np.float32)
+        self.bias = np.zeros(n_outputs, dtype=np.float32)
+        self.samples = 0
+        self._category_index = {label: index for index, label in enumerate(self.categories)}
+        self._priority_index = {label: index for index, label in enumerate(self.priorities)}
+
+    def partial_fit(self, descriptions, categories, priorities, learning_rate=None):
+        """Take one gradient step on a mini-batch of labelled descriptions"""
+        learning_rate = learning_rate or self.learning_rate
+        rows, columns, values = self._sparse_batch(descriptions)
+        size = len(descriptions)
+        split = len(self.categories)
+
+        scores = np.tile(self.bias, (size, 1))
+        np.add.at(scores, rows, self.weights[columns] * values[:, None])
+
+        # Softmax cross-entropy gradient for each head
+        gradient = np.empty_like(scores)
+        gradient[:, :split] = _softmax(scores[:, :split])
+        gradient[:, split:] = _softmax(scores[:, split:])
+        batch = np.arange(size)
+        gradient[batch, [self._category_index[label] for label in categories]] -= 1
+        gradient[batch, [split + self._priority_index[label] for label in priorities]] -= 1
+
+        np.add.at(self.weights, columns, -learning_rate * values[:, None] * gradient[rows])
+        self.bias -= learning_rate * gradient.mean(axis=0)
+        self.samples += size
+
+    def to_classifier(self) -> LocalClassifier:
+        return LocalClassifier(self.weights, self.bias, self.categories, self.priorities)
+
+    def save(self, path, **meta):
+        """
+        Write the model to `path`, replacing any previous model there.
+
+        Files are written to a sibling directory first so a crash never
+        leaves a half-written model behind.
+        """
+        staging = f'{path.rstrip(os.sep)}.tmp'
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        np.save(os.path.join(staging, WEIGHTS_FILE), self.weights)
+        np.save(os.path.join(staging, BIAS_FILE), self.bias)
+        with open(os.path.join(staging, META_FILE), 'w', encoding='utf-8') as meta_file:
+            json.dump({
+                'version': MODEL_VERSION,
+                'categories': self.categories,
+                'priorities': self.priorities,
+                'n_features': self.n_features,
+                **meta,
+            }, meta_file, indent=2)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(staging, path)
+
+    def _sparse_batch(self, descriptions):
+        rows, columns, values = [], [], []
+        for row, description in enumerate(descriptions):
+            indexes = hashed_features(description, self.n_features)
+            if indexes:
+                rows.extend([row] * len(indexes))
+                columns.extend(indexes)
+                values.extend([1 / len(indexes) ** 0.5] * len(indexes))
+        return (
+            np.array(rows, dtype=np.intp),
+            np.array(columns, dtype=np.intp),
+            np.array(values, dtype=np.float32),
+        )
+
+
+def load_local_classifier(path):
+    """
+    Load the model trained by `manage.py train_local_classifier`.
+
+    Returns:
+        LocalClassifier, or None when NumPy is not installed or no model
+        has been trained yet
+    """
+    if np is None or not path or not os.path.exists(os.path.join(path, META_FILE)):
+        return None
+    try:
+        return LocalClassifier.load(path)
+    except Exception as e:
+        print(f"Local classifier load error: {str(e)}")
+        return None
@@ -0,0 +1,50 @@
+"""
+Synthetic ticket generation shared by the benchmark commands.
+"""
+import random
+from datetime import timedelta
+
+from django.utils import timezone
+
+from tickets.models import Ticket
+
+
+WORDS = (
+    'payment invoice refund charge login password account access error crash '
+    'bug page slow timeout export report dashboard email settings billing '
+    'upgrade plan mobile app checkout api integration sync data question'
+).split()
+
+
+def seed_tickets(count, batch_size=5000, days=365, seed=42, status_weights=None):
+    """
+    Insert `count` random tickets with bulk_create, with created_at
+    spread over the last `days`.
+
+    `status_weights` maps status to relative frequency; statuses are
+    uniform without it.
+    """
+    rng = random.Random(seed)
+    categories = [value for value, _label in Ticket.CATEGORY_CHOICES]
+    priorities = [value for value, _label in Ticket.PRIORITY_CHOICES]
+    statuses = [value for value, _label in Ticket.STATUS_CHOICES]
+    weights = [status_weights.get(value, 0) for value in statuses] if status_weights else None
+    now = timezone.now()
+
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        batch = [
+            Ticket(
+                title=' '.join(rng.choices(WORDS, k=5)).capitalize(),
+                description=' '.join(rng.choices(WORDS, k=30)),
+                category=rng.choice(categories),
+                priority=rng.choice(priorities),
+                status=rng.choices(statuses, weights)[0] if weights else rng.choice(statuses),
+                created_at=now - timedelta(seconds=rng.randrange(days * 86400)),
+            )
+            for _ in range(size)
+        ]
+        Ticket.objects.bulk_create(batch)
+        created += size
+    return created
@@ -0,0 +1,183 @@
+import itertools
+import re
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from tickets.models import Ticket
+
+from ._seed import WORDS, seed_tickets
+
+
+# Status mix of a help desk that has been running for a while: most tickets
+# are finished, and the queues agents work from are a small slice
+STATUS_WEIGHTS = {'open': 6, 'in_progress': 4, 'resolved': 15, 'closed': 75}
+
+# Filter values used for each list filter: both work queues and a common status
+FILTER_VALUES = {
+    'category': ['billing'],
+    'priority': ['critical'],
+    'status': ['open', 'in_progress', 'closed'],
+}
+
+INDEX_PATTERNS = (
+    re.compile(r'USING (?:COVERING )?INDEX (\w+)'),    # SQLite
+    re.compile(r'Index (?:Only )?Scan(?: Backward)? using (\w+)'),    # PostgreSQL
+    re.compile(r'Bitmap Index Scan on (\w+)'),
+)
+
+
+def list_queries():
+    """
+    Returns:
+        list of (name, queryset) for the first page of every filter
+        combination TicketViewSet.get_queryset produces, a deeper cursor
+        page, and the other indexed reads made on every request
+    """
+    queries = []
+    for size in range(len(FILTER_VALUES) + 1):
+        for fields in itertools.combinations(FILTER_VALUES, size):
+            for values in itertools.product(*(FILTER_VALUES[field] for field in fields)):
+                filters = dict(zip(fields, values))
+                name = ' '.join(f'{field}={value}' for field, value in filters.items()) or 'unfiltered'
+                queries.append((f'list {name}', _page(Ticket.objects.filter(**filters))))
+    return queries
+
+
+def _page(queryset, page_size=25):
+    # Same shape as the list endpoint: one row past the page for the cursor
+    return queryset.defer('similarity_signature').order_by('-created_at', '-id')[:page_size + 1]
+
+
+class Command(BaseCommand):
+    help = (
+        'Index advisor for the tickets table. Seeds a dataset with a '
+        'realistic status mix, runs EXPLAIN (ANALYZE on PostgreSQL) for every '
+        'filter combination the ticket list can produce, times each query '
+        'and single-row and bulk inserts, and reports which indexes the '
+        'plans use. Run it before and after a migration that changes the '
+        'indexes to compare. Runs inside a transaction that is rolled back, '
+        'so existing data is left untouched.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500_000, help='Tickets to seed')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per query')
+        parser.add_argument('--inserts', type=int, default=2000, help='Tickets per insert benchmark')
+        parser.add_argument('--plans', action='store_true', help='Print the full plan of every query')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            seeded = Ticket.objects.count()
+            if options['rows'] > seeded:
+                self.stderr.write(f"Seeding {options['rows'] - seeded} tickets...")
+                seed_tickets(options['rows'] - seeded, status_weights=STATUS_WEIGHTS)
+            self._analyze()
+
+            used = {}
+            self.stdout.write(f"{'query':<60} {'mean ms':>9}  indexes")
+            for name, queryset in self._workload():
+                plan = self._explain(queryset)
+                indexes = sorted({
+                    index for pattern in INDEX_PATTERNS for index in pattern.findall(plan)
+                })
+                for index in indexes:
+                    used.setdefault(index, []).append(name)
+                mean_ms = self._time(lambda queryset=queryset: list(queryset.all()), options['repeat'])
+                self.stdout.write(f"{name:<60} {mean_ms:>9.2f}  {', '.join(indexes) or '-'}")
+                if options['plans']:
+                    self.stdout.write(plan)
+
+            self.stdout.write('')
+            for name, rows_per_second in self._insert_rates(options['inserts']):
+                self.stdout.write(f'{name:<60} {rows_per_second:>9.0f} rows/s')
+
+            self.stdout.write('')
+            self._report_indexes(used)
+
+            transaction.set_rollback(True)
+
+    def _workload(self):
+        queries = list_queries()
+        # Second page of the busiest list, located by its cursor
+        first = Ticket.objects.order_by('-created_at', '-id').values_list('created_at', 'id')[25]
+        queries.append(('list unfiltered, cursor page', _page(Ticket.objects.filter(
+            Q(created_at__lt=first[0]) | Q(created_at=first[0], id__lt=first[1])
+        ))))
+        # StatsService.compute_statistics
+        queries.append(('earliest ticket', Ticket.objects.order_by('created_at').values('created_at')[:1]))
+        return queries
+
+    def _explain(self, queryset):
+        if connection.vendor == 'postgresql':
+            return queryset.explain(analyze=True)
+        return queryset.explain()
+
+    def _time(self, func, repeat):
+        func()  # warm up
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) * 1000 / repeat
+
+    def _insert_rates(self, count):
+        def tickets(number):
+            return [
+                Ticket(
+                    title=f'Index advisor {number} {index}',
+                    description=' '.join(WORDS[index % len(WORDS):] + WORDS[:index % len(WORDS)]),
+                    category='technical',
+                    priority='medium',
+                    status='open',
+                )
+                for index in range(count)
+            ]
+
+        started = time.perf_counter()
+        for ticket in tickets(1):
+            Ticket.objects.bulk_create([ticket])
+        single = count / (time.perf_counter() - started)
+
+        batch = tickets(2)
+        started = time.perf_counter()
+        Ticket.objects.bulk_create(batch, batch_size=1000)
+        bulk = count / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        Ticket.objects.filter(pk__in=[ticket.pk for ticket in batch]).update(status='closed')
+        update = count / (time.perf_counter() - started)
+
+        return [
+            ('insert, one row per statement', single),
+            ('insert, 1000 rows per statement', bulk),
+            ('status update (open -> closed)', update),
+        ]
+
+    def _report_indexes(self, used):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Ticket._meta.db_table)
+        indexes = {
+            name: info['columns'] for name, info in constraints.items()
+            if info['index'] and not info['primary_key']
+        }
+        # Introspection does not report index conditions; take them from the model
+        partial = {index.name for index in Ticket._meta.indexes if index.condition is not None}
+        self.stdout.write(f"{'index':<40} {'columns':<32} used by")
+        for name, columns in sorted(indexes.items()):
+            notes = [f'{len(used[name])} queries'] if name in used else ['unused']
+            if name in partial:
+                notes.append('partial')
+            for other, other_columns in indexes.items():
+                if (
+                    other != name and not partial & {name, other}
+                    and other_columns[:len(columns)] == columns
+                ):
+                    notes.append(f'redundant with {other}')
+                    break
+            self.stdout.write(f"{name:<40} {', '.join(columns):<32} {'; '.join(notes)}")
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Ticket._meta.db_table}')
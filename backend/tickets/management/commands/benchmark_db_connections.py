@@ -0,0 +1,136 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, connections, transaction
+from django.test import Client
+
+from tickets.models import EmailOutbox, Ticket
+from tickets.stats_service import stats_service
+
+
+# Connection settings compared by the benchmark, applied on top of DATABASE_URL
+MODES = {
+    'per-request': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'pool': None},
+    'persistent': {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True, 'pool': None},
+    'pool': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'pool': True},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare list/create request latency against the configured database '
+        'with a new connection per request, persistent connections, and the '
+        'psycopg connection pool (PostgreSQL only). Tickets created by the '
+        'benchmark are deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and mode')
+        parser.add_argument('--concurrency', type=int, default=4, help='Client threads')
+        parser.add_argument('--pool-size', type=int, default=4, help='max_size of the pool in pool mode')
+        parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+
+    def handle(self, *args, **options):
+        database = connections.settings['default']
+        original = {
+            'CONN_MAX_AGE': database['CONN_MAX_AGE'],
+            'CONN_HEALTH_CHECKS': database['CONN_HEALTH_CHECKS'],
+            'OPTIONS': dict(database['OPTIONS']),
+        }
+        is_postgresql = connection.vendor == 'postgresql'
+        if connection.vendor == 'sqlite' and options['concurrency'] > 1:
+            # Concurrent write transactions fail with "database is locked"
+            self.stderr.write('SQLite allows a single writer; using 1 thread')
+            options['concurrency'] = 1
+        self.stdout.write(
+            f"{connection.vendor} at {database.get('HOST') or database['NAME']}, "
+            f"{options['concurrency']} threads"
+        )
+        self.stdout.write(
+            f"{'mode':>12} {'endpoint':>9} {'requests':>9} {'mean ms':>8} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'per sec':>8}"
+        )
+
+        try:
+            for mode in options['modes']:
+                if MODES[mode]['pool'] and not is_postgresql:
+                    self.stderr.write(f'Skipping {mode}: connection pooling needs PostgreSQL')
+                    continue
+                self._configure(database, MODES[mode], options['pool_size'])
+                for endpoint in ('list', 'create'):
+                    self._run(mode, endpoint, options['requests'], options['concurrency'])
+        finally:
+            self._close(database)
+            database.update(original)
+
+    def _configure(self, database, mode, pool_size):
+        self._close(database)
+        database['CONN_MAX_AGE'] = mode['CONN_MAX_AGE']
+        database['CONN_HEALTH_CHECKS'] = mode['CONN_HEALTH_CHECKS']
+        database['OPTIONS'].pop('pool', None)
+        if mode['pool']:
+            database['OPTIONS']['pool'] = {'min_size': 1, 'max_size': pool_size, 'timeout': 30}
+
+    def _close(self, database):
+        connections.close_all()
+        if 'pool' in database['OPTIONS']:
+            connection.close_pool()
+
+    def _run(self, mode, endpoint, count, concurrency):
+        latencies = []
+        created = []
+        lock = threading.Lock()
+
+        def client_thread(requests):
+            client = Client()
+            timings = []
+            ids = []
+            for number in range(requests):
+                # The test client skips the request_started/request_finished
+                # connection handling of the real handlers, so do it here
+                close_old_connections()
+                started = time.perf_counter()
+                if endpoint == 'list':
+                    response = client.get('/api/tickets/')
+                else:
+                    response = client.post('/api/tickets/', {
+                        'title': f'Connection benchmark {number}',
+                        'description': 'Created by benchmark_db_connections and deleted afterwards.',
+                        'category': 'technical',
+                        'priority': 'low',
+                    }, content_type='application/json')
+                    ids.append(response.json()['id'])
+                timings.append(time.perf_counter() - started)
+                close_old_connections()
+            connections.close_all()
+            with lock:
+                latencies.extend(timings)
+                created.extend(ids)
+
+        threads = [
+            threading.Thread(target=client_thread, args=(count // concurrency,))
+            for _ in range(concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if created:
+            with transaction.atomic():
+                EmailOutbox.objects.filter(ticket_id__in=created).delete()
+                stats_service.record_deleted(Ticket.objects.filter(pk__in=created))
+                Ticket.objects.filter(pk__in=created).delete()
+
+        latencies.sort()
+        self.stdout.write(
+            f'{mode:>12} {endpoint:>9} {len(latencies):>9} '
+            f'{statistics.mean(latencies) * 1000:>8.2f} '
+            f'{latencies[len(latencies) // 2] * 1000:>8.2f} '
+            f'{latencies[int(len(latencies) * 0.95)] * 1000:>8.2f} '
+            f'{len(latencies) / elapsed:>8.0f}'
+        )
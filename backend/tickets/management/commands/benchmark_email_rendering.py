@@ -0,0 +1,97 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tickets.email_service import email_service
+from tickets.models import Ticket
+
+
+def legacy_render(ticket):
+    """The original f-string HTML builder, kept for comparison"""
+    priority_colors = {
+        'low': '#4caf50',
+        'medium': '#ff9800',
+        'high': '#ff5722',
+        'critical': '#d32f2f',
+    }
+    priority_color = priority_colors.get(ticket.priority, '#666666')
+    return f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 5px 5px 0 0; }}
+                .content {{ background: #f9f9f9; padding: 20px; border: 1px solid #ddd; }}
+                .ticket-info {{ background: white; padding: 15px; margin: 15px 0; border-left: 4px solid {priority_color}; }}
+                .badge {{ display: inline-block; padding: 5px 10px; border-radius: 3px; font-size: 12px; font-weight: bold; }}
+                .priority-{ticket.priority} {{ background: {priority_color}; color: white; }}
+                .footer {{ text-align: center; padding: 15px; color: #666; font-size: 12px; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h2 style="margin: 0;">🎫 New Support Ticket</h2>
+                </div>
+                <div class="content">
+                    <div class="ticket-info">
+                        <h3 style="margin-top: 0;">Ticket #{ticket.id}: {ticket.title}</h3>
+                        <p><strong>Description:</strong></p>
+                        <p>{ticket.description}</p>
+                        <p>
+                            <span class="badge priority-{ticket.priority}">{ticket.get_priority_display()} Priority</span>
+                            <span class="badge" style="background: #2196f3; color: white;">{ticket.get_category_display()}</span>
+                            <span class="badge" style="background: #4caf50; color: white;">{ticket.get_status_display()}</span>
+                        </p>
+                        <p style="color: #666; font-size: 14px;">
+                            Created: {ticket.created_at.strftime('%B %d, %Y at %H:%M')}
+                        </p>
+                    </div>
+                    <p>Please review and respond to this ticket in the support system.</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+
+class Command(BaseCommand):
+    help = 'Measure ticket-created email rendering throughput (no database access).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10_000, help='Notifications to render')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        now = timezone.now()
+        tickets = [
+            Ticket(
+                id=index + 1,
+                title=f'Checkout fails with <error> {index}',
+                description='Payment page returns 500 & the cart is emptied. ' * 5,
+                category='billing',
+                priority=('low', 'medium', 'high', 'critical')[index % 4],
+                status='open',
+                created_at=now - timedelta(minutes=index),
+            )
+            for index in range(count)
+        ]
+
+        paths = [
+            ('legacy f-string (HTML only)', lambda: [legacy_render(ticket) for ticket in tickets]),
+            ('templates, one per call', lambda: [
+                email_service.render_created_notifications([ticket]) for ticket in tickets
+            ]),
+            ('templates, one batch', lambda: email_service.render_created_notifications(tickets)),
+        ]
+
+        self.stdout.write(f"{'path':>28} {'seconds':>9} {'emails/s':>10}")
+        for name, func in paths:
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'{name:>28} {elapsed:>9.3f} {count / elapsed:>10.0f}')
@@ -0,0 +1,126 @@
+import copy
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from tickets.keyword_classifier import DEFAULT_KEYWORDS, KeywordClassifier
+
+
+# Everyday words that carry no classification signal
+NEUTRAL = (
+    'the a my our we i it is was has have been when after before since '
+    'yesterday today morning customer team user page screen button report '
+    'dashboard export settings mobile app web browser file upload please '
+    'help thanks again still every time trying open click update new'
+).split()
+
+# Words and phrases that hit the keyword table, including inflections
+SIGNALS = (
+    'payment invoice refunded charged billing subscription price error '
+    'crashes bug broken timeout issue problem login password account '
+    'access permissions registration urgent critical emergency security '
+    'down outage asap important serious major minor question small info'
+).split() + ['not working', 'cannot access', 'log in', 'sign in']
+
+
+def legacy_fallback(description):
+    """The original substring-scan fallback, kept for comparison"""
+    description_lower = description.lower()
+
+    if any(word in description_lower for word in ['payment', 'bill', 'invoice', 'refund', 'charge', 'price', 'cost']):
+        category = 'billing'
+    elif any(word in description_lower for word in ['bug', 'error', 'crash', 'not working', 'broken', 'issue', 'problem']):
+        category = 'technical'
+    elif any(word in description_lower for word in ['login', 'password', 'account', 'register', 'access', 'permission']):
+        category = 'account'
+    else:
+        category = 'general'
+
+    if any(word in description_lower for word in ['urgent', 'critical', 'emergency', 'down', 'cannot access', 'security']):
+        priority = 'critical'
+    elif any(word in description_lower for word in ['important', 'asap', 'serious', 'major']):
+        priority = 'high'
+    elif any(word in description_lower for word in ['minor', 'small', 'question', 'info']):
+        priority = 'low'
+    else:
+        priority = 'medium'
+
+    return {
+        'suggested_category': category,
+        'suggested_priority': priority
+    }
+
+
+class LinearKeywordClassifier(KeywordClassifier):
+    """Same table and scoring, matched with one substring scan per keyword"""
+
+    def match(self, description):
+        description_lower = description.lower()
+        return {keyword for keyword in self._weights if keyword in description_lower}
+
+
+def padded_table(extra, rng):
+    """DEFAULT_KEYWORDS plus `extra` random keywords, as a larger custom table would have"""
+    table = copy.deepcopy(DEFAULT_KEYWORDS)
+    technical = table['category']['labels']['technical']
+    for _ in range(extra):
+        technical[''.join(rng.choices(string.ascii_lowercase, k=8))] = 1.0
+    return table
+
+
+class Command(BaseCommand):
+    help = 'Compare the compiled keyword classifier against substring scanning.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100000, help='Descriptions to classify')
+        parser.add_argument('--words', type=int, default=40, help='Words per description')
+        parser.add_argument('--signals', type=int, default=3, help='Max keyword hits per description')
+        parser.add_argument(
+            '--table-sizes', type=int, nargs='+', default=[0, 200, 1000],
+            help='Extra keywords added to the default table for each run'
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        descriptions = []
+        for _ in range(options['count']):
+            words = rng.choices(NEUTRAL, k=options['words'])
+            for _ in range(rng.randint(0, options['signals'])):
+                words[rng.randrange(len(words))] = rng.choice(SIGNALS)
+            descriptions.append(' '.join(words))
+        self.stdout.write(
+            f"{len(descriptions)} descriptions of {options['words']} words, "
+            f"0-{options['signals']} keyword hits each"
+        )
+
+        self.stdout.write(f"{'path':>10} {'keywords':>10} {'seconds':>8} {'per sec':>10}")
+        legacy_results = self._time('legacy', 'hard-coded', legacy_fallback, descriptions)
+
+        for extra in options['table_sizes']:
+            table = padded_table(extra, rng)
+            linear = LinearKeywordClassifier(table)
+            compiled = KeywordClassifier(table)
+            size = len(compiled._weights)
+
+            linear_results = self._time('linear', size, linear.classify, descriptions)
+            compiled_results = self._time('compiled', size, compiled.classify, descriptions)
+
+            if extra == 0:
+                # Substring scans also hit inside longer words ('down' in
+                # 'download'); token matching only accepts inflections
+                same = sum(old == new for old, new in zip(linear_results, compiled_results))
+                self.stdout.write(f'compiled agrees with linear scan on {same / len(descriptions):.1%}')
+                for key in ('suggested_category', 'suggested_priority'):
+                    same = sum(
+                        old[key] == new[key] for old, new in zip(legacy_results, compiled_results)
+                    )
+                    self.stdout.write(f'{key}: {same / len(descriptions):.1%} agree with legacy')
+
+    def _time(self, name, size, classify, descriptions):
+        started = time.perf_counter()
+        results = [classify(description) for description in descriptions]
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{name:>10} {size:>10} {elapsed:>8.2f} {len(descriptions) / elapsed:>10.0f}')
+        return results
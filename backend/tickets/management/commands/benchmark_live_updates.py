@@ -0,0 +1,89 @@
+import asyncio
+import json
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from tickets.live_updates import LiveUpdateHub, stats_delta
+
+
+SAMPLE_EVENT = {
+    'type': 'updated',
+    'ticket': {
+        'id': 12345,
+        'title': 'Export crashes on large reports',
+        'description': 'The CSV export crashes for reports over 10k rows. ' * 4,
+        'category': 'technical',
+        'priority': 'high',
+        'status': 'in_progress',
+        'created_at': '2026-01-01T12:00:00Z',
+        'updated_at': '2026-01-01T12:30:00Z',
+    },
+    'stats': stats_delta([('technical', 'high', 'open')], [('technical', 'high', 'in_progress')]),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the live update hub with many idle streams in one process: '
+        'memory per open stream and the time for one event to reach every '
+        'stream. Streams are the same generators the SSE endpoint serves, '
+        'consumed in-process (no sockets).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--streams', type=int, nargs='+', default=[1000, 5000, 20000],
+            help='Open streams to measure with'
+        )
+        parser.add_argument('--events', type=int, default=20, help='Events published per run')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'streams':>8} {'KiB/stream':>11} {'fan-out ms':>11} {'events/s':>9} {'dropped':>8}"
+        )
+        for streams in options['streams']:
+            asyncio.run(self._run(streams, options['events']))
+
+    async def _run(self, streams, events):
+        hub = LiveUpdateHub(keepalive_seconds=3600)
+        data = json.dumps(SAMPLE_EVENT)
+        received = 0
+        all_received = asyncio.Event()
+
+        async def client():
+            nonlocal received
+            async for frame in hub.stream():
+                if frame.startswith(b'data:'):
+                    received += 1
+                    if received == streams:
+                        all_received.set()
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        clients = [asyncio.create_task(client()) for _ in range(streams)]
+        while hub.stats()['streams'] < streams:
+            await asyncio.sleep(0)
+        per_stream = (tracemalloc.get_traced_memory()[0] - before) / streams / 1024
+        tracemalloc.stop()
+
+        elapsed = 0.0
+        for _ in range(events):
+            received = 0
+            all_received.clear()
+            started = time.perf_counter()
+            hub.publish(data)
+            await all_received.wait()
+            elapsed += time.perf_counter() - started
+
+        for task in clients:
+            task.cancel()
+        await asyncio.gather(*clients, return_exceptions=True)
+        for task in hub._tasks:
+            task.cancel()
+
+        self.stdout.write(
+            f'{streams:>8} {per_stream:>11.1f} {elapsed / events * 1000:>11.1f} '
+            f'{events / elapsed:>9.0f} {hub.stats()["dropped"]:>8}'
+        )
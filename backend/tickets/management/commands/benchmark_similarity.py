@@ -0,0 +1,123 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tickets.models import Ticket
+from tickets.similarity import NUM_PERM, decode_signature, similarity_index
+
+
+def brute_force_similar(signature, limit=10, min_similarity=0.5, exclude_id=None):
+    """Score every stored signature; the lookup the LSH index replaces"""
+    query = decode_signature(signature)
+    matches = []
+    rows = Ticket.objects.exclude(pk=exclude_id).filter(
+        similarity_signature__isnull=False
+    ).values_list('pk', 'similarity_signature')
+    for ticket_id, data in rows.iterator(chunk_size=5000):
+        score = sum(x == y for x, y in zip(decode_signature(data), query)) / NUM_PERM
+        if score >= min_similarity:
+            matches.append((ticket_id, round(score, 2)))
+    matches.sort(key=lambda match: (match[1], match[0]), reverse=True)
+    return matches[:limit]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure near-duplicate lookup on seeded data: latency of the LSH '
+        'index against a scan of every signature, and the fraction of planted '
+        'duplicates each finds. Runs inside a transaction that is rolled back, '
+        'so existing data is left untouched.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+            help='Dataset sizes to measure (cumulative seeding)'
+        )
+        parser.add_argument('--queries', type=int, default=100, help='Planted duplicate pairs')
+        parser.add_argument(
+            '--edit-rate', type=float, default=0.1,
+            help='Fraction of words changed in each planted duplicate'
+        )
+        parser.add_argument(
+            '--scan-queries', type=int, default=5,
+            help='Queries timed with the full scan (it is slow on large tables)'
+        )
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        # A realistic vocabulary: a few thousand words with a skewed frequency
+        vocabulary = [f'w{index}' for index in range(5000)]
+        weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+        def text(words):
+            return ' '.join(rng.choices(vocabulary, weights, k=words))
+
+        self.stdout.write(
+            f"{'rows':>10} {'path':>6} {'mean ms':>9} {'p99 ms':>9} {'recall':>7}"
+        )
+        with transaction.atomic():
+            pairs = self._plant(text, options['queries'], options['edit_rate'], rng)
+            seeded = Ticket.objects.count()
+            for size in sorted(options['rows']):
+                if size > seeded:
+                    self.stderr.write(f'Seeding {size - seeded} tickets...')
+                    seeded += self._seed(text, size - seeded)
+                self._measure(size, 'lsh', similarity_index.similar, pairs)
+                self._measure(size, 'scan', brute_force_similar, pairs[:options['scan_queries']])
+
+            transaction.set_rollback(True)
+
+    def _plant(self, text, count, edit_rate, rng):
+        """Returns: list of (query ticket, planted duplicate id)"""
+        originals = []
+        duplicates = []
+        for _ in range(count):
+            title, description = text(8), text(60)
+            words = description.split()
+            for index in rng.sample(range(len(words)), int(len(words) * edit_rate)):
+                words[index] = text(1)
+            originals.append(self._ticket(title, description))
+            duplicates.append(self._ticket(title, ' '.join(words)))
+        self._save(originals + duplicates)
+        return list(zip(originals, [ticket.pk for ticket in duplicates]))
+
+    def _seed(self, text, count, batch_size=5000):
+        created = 0
+        while created < count:
+            size = min(batch_size, count - created)
+            self._save([self._ticket(text(8), text(60)) for _ in range(size)])
+            created += size
+        return created
+
+    def _ticket(self, title, description):
+        return Ticket(
+            title=title,
+            description=description,
+            category='general',
+            priority='medium',
+            similarity_signature=similarity_index.signature_for(title, description),
+        )
+
+    def _save(self, tickets):
+        Ticket.objects.bulk_create(tickets)
+        similarity_index.index(tickets)
+
+    def _measure(self, size, path, similar, pairs):
+        latencies = []
+        found = 0
+        for ticket, duplicate_id in pairs:
+            started = time.perf_counter()
+            matches = similar(ticket.similarity_signature, exclude_id=ticket.pk)
+            latencies.append((time.perf_counter() - started) * 1000)
+            found += any(ticket_id == duplicate_id for ticket_id, _score in matches)
+
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f'{size:>10} {path:>6} {sum(latencies) / len(latencies):>9.2f} {p99:>9.2f} '
+            f'{found / len(pairs):>7.0%}'
+        )
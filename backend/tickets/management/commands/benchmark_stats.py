@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from tickets.models import Ticket
+from tickets.stats_service import stats_service
+
+from ._seed import seed_tickets
+
+
+def legacy_statistics():
+    """The original six-query implementation, kept for comparison"""
+    total_tickets = Ticket.objects.count()
+    open_tickets = Ticket.objects.filter(status='open').count()
+    earliest_ticket = Ticket.objects.order_by('created_at').first()
+    breakdowns = [
+        dict(Ticket.objects.values(field).annotate(count=Count('id')).values_list(field, 'count'))
+        for field in ('priority', 'category', 'status')
+    ]
+    return total_tickets, open_tickets, earliest_ticket, breakdowns
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare query count and latency of the legacy and counter-table '
+        'statistics paths on seeded data. Runs inside a transaction that is '
+        'rolled back, so existing data is left untouched.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000],
+            help='Dataset sizes to measure (cumulative seeding)'
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement')
+
+    def handle(self, *args, **options):
+        sizes = sorted(options['rows'])
+        repeat = options['repeat']
+
+        self.stdout.write(
+            f"{'rows':>12} {'path':>14} {'queries':>8} {'mean ms':>10}"
+        )
+        with transaction.atomic():
+            seeded = Ticket.objects.count()
+            for size in sizes:
+                if size > seeded:
+                    self.stderr.write(f'Seeding {size - seeded} tickets...')
+                    seeded += seed_tickets(size - seeded)
+                    stats_service.rebuild_counters()
+
+                paths = [
+                    ('legacy', legacy_statistics),
+                    ('counters', stats_service.compute_statistics),
+                    ('cached', stats_service.get_statistics),
+                ]
+                for name, func in paths:
+                    func()  # warm up (fills the cache for the cached path)
+                    with CaptureQueriesContext(connection) as queries:
+                        func()
+                    started = time.perf_counter()
+                    for _ in range(repeat):
+                        func()
+                    mean_ms = (time.perf_counter() - started) * 1000 / repeat
+                    self.stdout.write(
+                        f'{size:>12} {name:>14} {len(queries):>8} {mean_ms:>10.2f}'
+                    )
+
+            transaction.set_rollback(True)
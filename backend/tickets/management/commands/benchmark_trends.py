@@ -0,0 +1,78 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tickets.models import Ticket
+from tickets.trends import trend_service
+
+from ._seed import seed_tickets
+
+
+def grouped_created_counts(start):
+    """Created counts per day from the tickets table, the query the rollups replace"""
+    return list(
+        Ticket.objects.filter(created_at__gte=start)
+        .annotate(day=TruncDate('created_at'))
+        .values_list('day', 'category', 'priority')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare a 365-day created-tickets series grouped from the tickets '
+        'table against the daily rollups, on seeded data. Runs inside a '
+        'transaction that is rolled back, so existing data is left untouched.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[100_000, 1_000_000],
+            help='Dataset sizes to measure (cumulative seeding)'
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement')
+        parser.add_argument('--days', type=int, default=365, help='Length of the series')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        end = timezone.localdate()
+        start = end - timedelta(days=options['days'] - 1)
+        start_time = timezone.now() - timedelta(days=options['days'])
+
+        self.stdout.write(
+            f"{'rows':>12} {'path':>10} {'queries':>8} {'mean ms':>10}"
+        )
+        with transaction.atomic():
+            seeded = Ticket.objects.count()
+            for size in sorted(options['rows']):
+                if size > seeded:
+                    self.stderr.write(f'Seeding {size - seeded} tickets...')
+                    seeded += seed_tickets(size - seeded, days=options['days'])
+                    trend_service.rebuild()
+                    # Seeding overflows the query log CaptureQueriesContext reads
+                    connection.queries_log.clear()
+
+                paths = [
+                    ('group-by', lambda: grouped_created_counts(start_time)),
+                    ('rollups', lambda: trend_service.series(start, end)),
+                ]
+                for name, func in paths:
+                    func()  # warm up
+                    with CaptureQueriesContext(connection) as queries:
+                        func()
+                    started = time.perf_counter()
+                    for _ in range(repeat):
+                        func()
+                    mean_ms = (time.perf_counter() - started) * 1000 / repeat
+                    self.stdout.write(
+                        f'{size:>12} {name:>10} {len(queries):>8} {mean_ms:>10.2f}'
+                    )
+
+            transaction.set_rollback(True)
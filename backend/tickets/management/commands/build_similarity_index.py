@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tickets.models import Ticket, TicketSimilarityBucket
+from tickets.similarity import similarity_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Compute MinHash signatures and LSH buckets for tickets created before '
+        'the similarity index existed, or for every ticket with --all. Walks '
+        'the table in primary key order, one transaction per batch.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recompute tickets that already have a signature too'
+        )
+        parser.add_argument('--batch-size', type=int, default=2000, help='Tickets per transaction')
+
+    def handle(self, *args, **options):
+        queryset = Ticket.objects.only('id', 'title', 'description').order_by('id')
+        if not options['all']:
+            queryset = queryset.filter(similarity_signature__isnull=True)
+
+        started = time.perf_counter()
+        processed = 0
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:options['batch_size']])
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            for ticket in batch:
+                ticket.similarity_signature = similarity_index.signature_for(ticket.title, ticket.description)
+            with transaction.atomic():
+                Ticket.objects.bulk_update(batch, ['similarity_signature'])
+                TicketSimilarityBucket.objects.filter(ticket__in=batch).delete()
+                similarity_index.index(batch)
+
+            processed += len(batch)
+            self.stderr.write(f'{processed} tickets indexed...')
+
+        elapsed = time.perf_counter() - started
+        rate = processed / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {processed} ticket(s) in {elapsed:.1f}s ({rate:.0f}/s).'
+        ))
@@ -0,0 +1,60 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.importer import TicketImporter, read_csv, read_ndjson
+
+
+class Command(BaseCommand):
+    help = (
+        'Import tickets from a CSV or NDJSON file, streaming it in chunks. '
+        'Columns: title, description, category, priority, and optionally '
+        'status and created_at. No notification emails are sent.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin")
+        parser.add_argument(
+            '--format', choices=['csv', 'ndjson'],
+            help='Input format (default: from the file extension, csv for stdin)'
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows per transaction')
+        parser.add_argument(
+            '--classify', action='store_true',
+            help='Fill in a missing category or priority instead of rejecting the row'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['format']
+        if input_format is None:
+            input_format = 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv'
+
+        try:
+            file = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f'Cannot open {path}: {e}')
+
+        importer = TicketImporter(chunk_size=options['chunk_size'], classify=options['classify'])
+        rows = read_ndjson(file) if input_format == 'ndjson' else read_csv(file)
+
+        started = time.perf_counter()
+        try:
+            result = importer.run(rows)
+        finally:
+            if file is not sys.stdin:
+                file.close()
+        elapsed = time.perf_counter() - started
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if result['failed'] > len(result['errors']):
+            self.stderr.write(f"... and {result['failed'] - len(result['errors'])} more rejected row(s)")
+
+        processed = result['created'] + result['failed']
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} ticket(s), rejected {result['failed']}, "
+            f"classified {result['classified']} in {elapsed:.1f}s "
+            f"({processed / elapsed if elapsed else 0:.0f} rows/sec)"
+        ))
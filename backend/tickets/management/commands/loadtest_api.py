@@ -0,0 +1,133 @@
+import asyncio
+import random
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Request made for each endpoint; create bodies are generated from a fixed
+# seed so runs are comparable
+ENDPOINTS = ('list', 'create', 'stats')
+
+WORDS = (
+    'payment invoice refund login password account error crash export '
+    'report dashboard timeout slow page customer urgent question'
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test a running backend over HTTP: for each of the list, create '
+        'and stats endpoints, keep --concurrency requests in flight for '
+        '--duration seconds and report req/s, p50 and p99 latency. Tickets '
+        'created by the test are deleted afterwards unless --keep is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://localhost:8000', help='Backend base URL')
+        parser.add_argument('--endpoints', nargs='+', choices=ENDPOINTS, default=list(ENDPOINTS))
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight')
+        parser.add_argument('--duration', type=float, default=15.0, help='Seconds per endpoint')
+        parser.add_argument('--warmup', type=float, default=2.0, help='Unmeasured seconds per endpoint')
+        parser.add_argument('--keep', action='store_true', help='Keep the tickets created by the test')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        asyncio.run(self._run(options))
+
+    async def _run(self, options):
+        limits = httpx.Limits(max_connections=options['concurrency'])
+        async with httpx.AsyncClient(base_url=options['url'], limits=limits, timeout=30) as client:
+            try:
+                await client.get('/api/tickets/stats/')
+            except httpx.HTTPError as e:
+                raise CommandError(f"Cannot reach {options['url']}: {e}")
+
+            self.stdout.write(
+                f"{options['url']}, {options['concurrency']} in flight, "
+                f"{options['duration']:g}s per endpoint"
+            )
+            self.stdout.write(
+                f"{'endpoint':>9} {'requests':>9} {'errors':>7} {'req/s':>8} "
+                f"{'p50 ms':>8} {'p99 ms':>8}"
+            )
+
+            rng = random.Random(options['seed'])
+            created = []
+            for endpoint in options['endpoints']:
+                request = self._request(endpoint, rng, created)
+                await self._measure(request, client, options['concurrency'], options['warmup'])
+                latencies, errors, elapsed = await self._measure(
+                    request, client, options['concurrency'], options['duration']
+                )
+                self._report(endpoint, latencies, errors, elapsed)
+
+            if created and not options['keep']:
+                await self._delete(client, created, options['concurrency'])
+
+    def _request(self, endpoint, rng, created):
+        """Returns: coroutine function sending one request for `endpoint`"""
+        if endpoint == 'list':
+            async def request(client):
+                return await client.get('/api/tickets/')
+        elif endpoint == 'stats':
+            async def request(client):
+                return await client.get('/api/tickets/stats/')
+        else:
+            async def request(client):
+                response = await client.post('/api/tickets/', json={
+                    'title': 'Load test ' + ' '.join(rng.choices(WORDS, k=3)),
+                    'description': ' '.join(rng.choices(WORDS, k=30)),
+                    'category': rng.choice(['billing', 'technical', 'account', 'general']),
+                    'priority': rng.choice(['low', 'medium', 'high', 'critical']),
+                })
+                if response.status_code == 201:
+                    created.append(response.json()['id'])
+                return response
+        return request
+
+    async def _measure(self, request, client, concurrency, duration):
+        latencies = []
+        errors = 0
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await request(client)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                if failed:
+                    errors += 1
+                else:
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - started
+
+    def _report(self, endpoint, latencies, errors, elapsed):
+        latencies.sort()
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        else:
+            p50 = p99 = float('nan')
+        self.stdout.write(
+            f'{endpoint:>9} {len(latencies):>9} {errors:>7} {len(latencies) / elapsed:>8.0f} '
+            f'{p50:>8.1f} {p99:>8.1f}'
+        )
+
+    async def _delete(self, client, ids, concurrency):
+        self.stderr.write(f'Deleting {len(ids)} load-test tickets...')
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def delete(ticket_id):
+            async with semaphore:
+                await client.delete(f'/api/tickets/{ticket_id}/')
+
+        await asyncio.gather(*(delete(ticket_id) for ticket_id in ids))
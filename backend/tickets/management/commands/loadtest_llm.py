@@ -0,0 +1,120 @@
+import asyncio
+import contextlib
+import io
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from openai import AsyncOpenAI
+
+from tickets.llm_service import LLMService
+
+
+class FakeLLMServer:
+    """
+    Minimal OpenAI-compatible chat completions server that answers after a
+    configurable stall and records how many requests are in flight.
+    """
+
+    def __init__(self, stall):
+        self.stall = stall
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = 0
+                for line in head.split(b'\r\n'):
+                    if line.lower().startswith(b'content-length:'):
+                        length = int(line.split(b':', 1)[1])
+                await reader.readexactly(length)
+
+                self.requests += 1
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                try:
+                    await asyncio.sleep(self.stall)
+                finally:
+                    self.in_flight -= 1
+
+                body = json.dumps({
+                    'id': 'fake', 'object': 'chat.completion', 'created': 0, 'model': 'fake',
+                    'choices': [{
+                        'index': 0, 'finish_reason': 'stop',
+                        'message': {'role': 'assistant', 'content': '{"category": "technical", "priority": "high"}'},
+                    }],
+                }).encode()
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                    b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the async classification path against a local fake LLM '
+        'server, once healthy and once stalled past the deadline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='Classifications per phase')
+        parser.add_argument('--concurrency', type=int, default=10, help='LLM_MAX_CONCURRENCY to test with')
+        parser.add_argument('--timeout', type=float, default=2.0, help='Per-call deadline in seconds')
+        parser.add_argument('--stall', type=float, default=30.0, help='Upstream stall in the stalled phase')
+
+    def handle(self, *args, **options):
+        asyncio.run(self._run(options))
+
+    async def _run(self, options):
+        self.stdout.write(
+            f"{'phase':>8} {'upstream':>9} {'max in-flight':>14} {'fallbacks':>10} "
+            f"{'p50 ms':>8} {'p99 ms':>8} {'wall s':>7} {'circuit':>10}"
+        )
+        for phase, stall in (('healthy', 0.05), ('stalled', options['stall'])):
+            server = FakeLLMServer(stall)
+            listener = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+
+            service = LLMService(
+                client=object(),
+                async_client=AsyncOpenAI(
+                    api_key='fake', base_url=f'http://127.0.0.1:{port}/v1',
+                    timeout=options['timeout'], max_retries=0,
+                ),
+            )
+            service.cache = None
+            service.timeout = options['timeout']
+            service.max_concurrency = options['concurrency']
+
+            # Returns (latency in ms, whether the fallback answered)
+            async def one(index, service=service):
+                started = time.perf_counter()
+                result = await service.aclassify_ticket(f'Export crashes for customer {index}')
+                return (time.perf_counter() - started) * 1000, result['suggested_priority'] != 'high'
+
+            started = time.perf_counter()
+            # The service prints every upstream error; keep the table readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = await asyncio.gather(*(one(index) for index in range(options['requests'])))
+            wall = time.perf_counter() - started
+            latencies = [latency for latency, _fell_back in results]
+            fallbacks = sum(fell_back for _latency, fell_back in results)
+
+            listener.close()
+            await service.async_client.close()
+
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            self.stdout.write(
+                f'{phase:>8} {server.requests:>9} {server.max_in_flight:>14} {fallbacks:>10} '
+                f'{p50:>8.1f} {p99:>8.1f} {wall:>7.2f} {service.breaker.state:>10}'
+            )
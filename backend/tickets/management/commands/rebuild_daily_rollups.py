@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from tickets.trends import trend_service
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the daily created/resolved rollups from the tickets and '
+        'ticket_events tables, for every day or from --since onwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day to rebuild (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = parse_date(options['since'])
+            except ValueError:
+                since = None
+            if since is None:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+
+        rows = trend_service.rebuild(since)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} rollup row(s).'))
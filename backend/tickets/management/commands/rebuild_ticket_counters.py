@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from tickets.stats_service import stats_service
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the TicketCounter table from the tickets table, or report drift with --check.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only report buckets whose stored count disagrees with the tickets table'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drift = stats_service.find_counter_drift()
+            if not drift:
+                self.stdout.write(self.style.SUCCESS('Counters match the tickets table.'))
+                return
+            for (category, priority, ticket_status), (stored, actual) in sorted(drift.items()):
+                self.stdout.write(
+                    f'{category}/{priority}/{ticket_status}: stored={stored} actual={actual}'
+                )
+            self.stdout.write(self.style.WARNING(
+                f'{len(drift)} bucket(s) out of sync; run without --check to rebuild.'
+            ))
+            return
+
+        rows = stats_service.rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} counter row(s).'))
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+
+from tickets.models import Ticket
+
+from ._seed import seed_tickets
+
+
+def relation_sizes(table):
+    """
+    Returns:
+        list of (name, bytes) for the table's heap and each of its indexes
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT %s, pg_table_size(%s::regclass) '
+                'UNION ALL '
+                'SELECT indexrelname, pg_relation_size(indexrelid) '
+                'FROM pg_stat_user_indexes WHERE relname = %s',
+                [table, table, table],
+            )
+            return cursor.fetchall()
+        if connection.vendor == 'sqlite':
+            # Needs SQLite built with the dbstat virtual table
+            cursor.execute(
+                'SELECT name, SUM(pgsize) FROM dbstat '
+                "WHERE name = %s OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s) "
+                'GROUP BY name',
+                [table, table],
+            )
+            return cursor.fetchall()
+    raise CommandError(f'Table sizes are not supported on {connection.vendor}')
+
+
+class Command(BaseCommand):
+    help = (
+        'Report the on-disk size of the tickets table and each of its indexes '
+        'on a seeded dataset. Run it before and after a migration that '
+        'changes the storage to compare. Runs inside a transaction that is '
+        'rolled back, so existing data is left untouched.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5_000_000, help='Tickets to seed')
+
+    def handle(self, *args, **options):
+        table = Ticket._meta.db_table
+        with transaction.atomic():
+            seeded = Ticket.objects.count()
+            if options['rows'] > seeded:
+                self.stderr.write(f"Seeding {options['rows'] - seeded} tickets...")
+                seeded += seed_tickets(options['rows'] - seeded)
+
+            try:
+                sizes = relation_sizes(table)
+            except DatabaseError as exc:
+                raise CommandError(f'Could not read table sizes: {exc}')
+
+            self.stdout.write(f'{seeded} rows')
+            self.stdout.write(f"{'relation':<40} {'MB':>10} {'bytes/row':>10}")
+            for name, size in sorted(sizes, key=lambda item: item[0] != table):
+                self.stdout.write(
+                    f'{name:<40} {size / 2 ** 20:>10.1f} {size / max(seeded, 1):>10.1f}'
+                )
+            total = sum(size for _name, size in sizes)
+            self.stdout.write(f"{'total':<40} {total / 2 ** 20:>10.1f} {total / max(seeded, 1):>10.1f}")
+
+            transaction.set_rollback(True)
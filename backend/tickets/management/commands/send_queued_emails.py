@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tickets.email_service import email_service
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued notification emails from the outbox in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help='Emails per SMTP connection (default: EMAIL_OUTBOX_BATCH_SIZE)'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Seconds to sleep when the outbox is empty'
+        )
+        parser.add_argument(
+            '--flush-digest', action='store_true',
+            help='Send held digest notifications now instead of waiting for the window'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Drain everything that is currently due, then exit'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+
+        if options['flush_digest']:
+            email_service.flush_digest(force=True)
+
+        while True:
+            sent = email_service.deliver_pending(batch_size)
+            total += sent
+            if sent:
+                continue
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Sent {total} email(s).'))
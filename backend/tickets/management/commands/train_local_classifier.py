@@ -0,0 +1,116 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tickets.local_classifier import LocalClassifierTrainer, load_local_classifier, np
+from tickets.models import Ticket
+
+
+class Command(BaseCommand):
+    help = (
+        'Train the local category/priority classifier from the tickets table '
+        'and save it to LLM_LOCAL_MODEL_DIR. Restart the app servers to load it.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--epochs', type=int, default=5, help='Passes over the training rows')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows fetched per database round trip')
+        parser.add_argument('--batch-size', type=int, default=256, help='Rows per gradient step')
+        parser.add_argument('--features', type=int, default=2 ** 18, help='Hash buckets (power of two)')
+        parser.add_argument('--learning-rate', type=float, default=0.5)
+        parser.add_argument(
+            '--holdout', type=int, default=10,
+            help='Keep every Nth ticket (by id) out of training for evaluation; 0 disables'
+        )
+        parser.add_argument('--output', default=settings.LLM_LOCAL_MODEL_DIR, help='Model directory')
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError('NumPy is required to train the local classifier.')
+        if not options['output']:
+            raise CommandError('Set LLM_LOCAL_MODEL_DIR or pass --output.')
+
+        trainer = LocalClassifierTrainer(
+            [value for value, _label in Ticket.CATEGORY_CHOICES],
+            [value for value, _label in Ticket.PRIORITY_CHOICES],
+            n_features=options['features'],
+            learning_rate=options['learning_rate'],
+        )
+        holdout = options['holdout']
+
+        started = time.perf_counter()
+        for epoch in range(options['epochs']):
+            learning_rate = options['learning_rate'] / (1 + epoch) ** 0.5
+            batch = []
+            for row in self._rows(options['chunk_size']):
+                if holdout and row[0] % holdout == 0:
+                    continue
+                batch.append(row)
+                if len(batch) == options['batch_size']:
+                    self._step(trainer, batch, learning_rate)
+                    batch = []
+            if batch:
+                self._step(trainer, batch, learning_rate)
+            self.stderr.write(f'Epoch {epoch + 1}: {trainer.samples} samples seen')
+
+        if not trainer.samples:
+            raise CommandError('No tickets to train on.')
+        training_seconds = time.perf_counter() - started
+        samples = trainer.samples // options['epochs']
+
+        trainer.save(
+            options['output'],
+            trained_at=timezone.now().isoformat(),
+            samples=samples,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Trained on {samples} tickets in {training_seconds:.1f}s; saved to {options['output']}"
+        ))
+
+        if holdout:
+            self._evaluate(load_local_classifier(options['output']), holdout, options['chunk_size'])
+
+    def _rows(self, chunk_size):
+        return (
+            Ticket.objects.order_by('id')
+            .values_list('id', 'description', 'category', 'priority')
+            .iterator(chunk_size=chunk_size)
+        )
+
+    def _step(self, trainer, batch, learning_rate):
+        _ids, descriptions, categories, priorities = zip(*batch)
+        trainer.partial_fit(descriptions, categories, priorities, learning_rate)
+
+    def _evaluate(self, classifier, holdout, chunk_size):
+        threshold = settings.LLM_LOCAL_CONFIDENCE
+        total = category_hits = priority_hits = confident = confident_hits = 0
+        elapsed = 0.0
+
+        for ticket_id, description, category, priority in self._rows(chunk_size):
+            if ticket_id % holdout:
+                continue
+            started = time.perf_counter()
+            result = classifier.predict(description)
+            elapsed += time.perf_counter() - started
+
+            hit = (result['suggested_category'] == category, result['suggested_priority'] == priority)
+            total += 1
+            category_hits += hit[0]
+            priority_hits += hit[1]
+            if result['confidence'] >= threshold:
+                confident += 1
+                confident_hits += all(hit)
+
+        if not total:
+            return
+        self.stdout.write(
+            f'Holdout of {total}: category accuracy {category_hits / total:.1%}, '
+            f'priority accuracy {priority_hits / total:.1%}'
+        )
+        self.stdout.write(
+            f'{confident / total:.1%} answered locally at confidence >= {threshold}'
+            + (f', {confident_hits / confident:.1%} of those fully correct' if confident else '')
+        )
+        self.stdout.write(f'Inference: {elapsed / total * 1e6:.0f} us per ticket')
@@ -0,0 +1,108 @@
+# Generated by Django 5.0.1 on 2026-10-16 20:26
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    """
+    CREATE OR REPLACE FUNCTION tickets_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER tickets_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON tickets
+    FOR EACH ROW EXECUTE FUNCTION tickets_search_vector_update();
+    """,
+    """
+    UPDATE tickets SET search_vector =
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B');
+    """,
+    "CREATE INDEX tickets_search_vector_gin ON tickets USING gin (search_vector);",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS tickets_search_vector_gin;",
+    "DROP TRIGGER IF EXISTS tickets_search_vector_trigger ON tickets;",
+    "DROP FUNCTION IF EXISTS tickets_search_vector_update();",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE tickets_fts USING fts5(
+        title, description, content='tickets', content_rowid='id'
+    );
+    """,
+    """
+    CREATE TRIGGER tickets_fts_insert AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER tickets_fts_delete AFTER DELETE ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER tickets_fts_update AFTER UPDATE OF title, description ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tickets_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END;
+    """,
+    "INSERT INTO tickets_fts(tickets_fts) VALUES ('rebuild');",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS tickets_fts_insert;",
+    "DROP TRIGGER IF EXISTS tickets_fts_delete;",
+    "DROP TRIGGER IF EXISTS tickets_fts_update;",
+    "DROP TABLE IF EXISTS tickets_fts;",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+    elif vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_REVERSE)
+    elif vendor == 'sqlite':
+        _run(schema_editor, SQLITE_REVERSE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.1 on 2026-10-16 20:28
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    Ticket = apps.get_model('tickets', 'Ticket')
+    TicketCounter = apps.get_model('tickets', 'TicketCounter')
+    rows = (
+        Ticket.objects.values('category', 'priority', 'status')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    TicketCounter.objects.bulk_create([
+        TicketCounter(
+            category=row['category'],
+            priority=row['priority'],
+            status=row['status'],
+            count=row['total'],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0002_ticket_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('billing', 'Billing'), ('technical', 'Technical'), ('account', 'Account'), ('general', 'General')], max_length=20)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], max_length=20)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], max_length=20)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'ticket_counters',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='ticketcounter',
+            constraint=models.UniqueConstraint(fields=('category', 'priority', 'status'), name='ticket_counters_unique_bucket'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.1 on 2026-10-16 20:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0004_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='event',
+            field=models.CharField(choices=[('created', 'Ticket created'), ('status_changed', 'Status changed'), ('digest', 'Digest')], default='created', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='ticket',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='tickets.ticket'),
+        ),
+        migrations.AlterField(
+            model_name='emailoutbox',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed'), ('held', 'Held for digest'), ('digested', 'Included in digest')], default='pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.1 on 2026-10-16 20:44
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0005_emailoutbox_digest'),
+    ]
+
+    # Python-side default only: nothing changes in the database, and on
+    # SQLite a real AlterField would rebuild the table and drop the FTS
+    # triggers from 0002.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='created_at',
+                    field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+                ),
+            ],
+        ),
+    ]
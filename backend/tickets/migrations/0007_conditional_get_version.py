@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0006_ticket_created_at_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticketcounter',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['updated_at'], name='tickets_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0007_conditional_get_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='similarity_signature',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.CreateModel(
+            name='TicketSimilarityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField()),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tickets.ticket')),
+            ],
+            options={
+                'db_table': 'ticket_similarity_buckets',
+                'indexes': [models.Index(fields=['key', 'ticket'], name='similarity_bucket_key_idx')],
+            },
+        ),
+    ]
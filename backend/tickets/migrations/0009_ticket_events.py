@@ -0,0 +1,39 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+# Existing tickets get a created event at their creation time. Their status
+# at creation is unknown, so it is left NULL. One INSERT ... SELECT, so no
+# rows pass through Python however large the table is.
+BACKFILL_CREATED_EVENTS = '''
+    INSERT INTO ticket_events (ticket_id, kind, created_at)
+    SELECT id, 1, created_at FROM tickets
+'''
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0008_similarity_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Created'), (2, 'Status changed'), (3, 'Category changed'), (4, 'Priority changed'), (5, 'Deleted')])),
+                ('old_value', models.PositiveSmallIntegerField(null=True)),
+                ('new_value', models.PositiveSmallIntegerField(null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ticket', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='events', to='tickets.ticket')),
+            ],
+            options={
+                'db_table': 'ticket_events',
+                'indexes': [models.Index(fields=['ticket', 'created_at'], name='ticket_events_ticket_idx'), models.Index(fields=['created_at'], name='ticket_events_created_idx')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_CREATED_EVENTS, migrations.RunSQL.noop),
+    ]
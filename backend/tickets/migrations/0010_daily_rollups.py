@@ -0,0 +1,53 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:12
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def populate_rollups(apps, schema_editor):
+    # Only creations can be recovered: the event log has no status
+    # changes from before it existed
+    Ticket = apps.get_model('tickets', 'Ticket')
+    TicketDailyRollup = apps.get_model('tickets', 'TicketDailyRollup')
+    rows = (
+        Ticket.objects.annotate(day=TruncDate('created_at'))
+        .values('day', 'category', 'priority')
+        .annotate(total=Count('id'))
+        .order_by()
+    )
+    TicketDailyRollup.objects.bulk_create([
+        TicketDailyRollup(
+            day=row['day'],
+            category=row['category'],
+            priority=row['priority'],
+            created=row['total'],
+        )
+        for row in rows
+    ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0009_ticket_events'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('category', models.CharField(choices=[('billing', 'Billing'), ('technical', 'Technical'), ('account', 'Account'), ('general', 'General')], max_length=20)),
+                ('priority', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], max_length=20)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('resolved', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'ticket_daily_rollups',
+                'constraints': [models.UniqueConstraint(fields=('day', 'category', 'priority'), name='ticket_daily_rollups_unique_day')],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:18
+
+import django.core.validators
+import django.utils.timezone
+from django.db import migrations, models
+
+
+# Columns that had a single-column index from db_index=True
+UNINDEXED_COLUMNS = ['title', 'category', 'priority', 'status', 'created_at']
+
+
+def drop_column_indexes(apps, schema_editor):
+    # Dropped by name rather than with AlterField: on SQLite AlterField
+    # rebuilds the table and drops the FTS triggers from 0002. Covers the
+    # varchar_pattern_ops (_like) copies PostgreSQL keeps for CharFields.
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, 'tickets')
+    for name, info in constraints.items():
+        if (
+            info['index'] and not info['primary_key'] and not info['unique']
+            and len(info['columns']) == 1 and info['columns'][0] in UNINDEXED_COLUMNS
+        ):
+            schema_editor.execute(f'DROP INDEX {schema_editor.quote_name(name)}')
+
+
+def create_column_indexes(apps, schema_editor):
+    for column in UNINDEXED_COLUMNS:
+        name = schema_editor._create_index_name('tickets', [column])
+        schema_editor.execute(
+            f'CREATE INDEX {schema_editor.quote_name(name)} '
+            f'ON tickets ({schema_editor.quote_name(column)})'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0010_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='tickets_created_f26b3b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='tickets_status_1dbab2_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='tickets_categor_df3afb_idx',
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='title',
+                    field=models.CharField(max_length=200, validators=[django.core.validators.MaxLengthValidator(200)]),
+                ),
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='category',
+                    field=models.CharField(choices=[('billing', 'Billing'), ('technical', 'Technical'), ('account', 'Account'), ('general', 'General')], max_length=20),
+                ),
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='priority',
+                    field=models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], max_length=20),
+                ),
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='status',
+                    field=models.CharField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], default='open', max_length=20),
+                ),
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='created_at',
+                    field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_column_indexes, create_column_indexes),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['-created_at', '-id'], name='tickets_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['-created_at', '-id'], name='tickets_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('status', 'in_progress')), fields=['-created_at', '-id'], name='tickets_in_progress_idx'),
+        ),
+    ]
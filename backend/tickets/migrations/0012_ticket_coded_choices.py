@@ -0,0 +1,84 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:24
+
+from django.db import migrations, models, transaction
+from django.db.models import Case, Max, Value, When
+
+
+BATCH_SIZE = 20000
+
+CATEGORY_CODES = {'billing': 1, 'technical': 2, 'account': 3, 'general': 4}
+PRIORITY_CODES = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+STATUS_CODES = {'open': 1, 'in_progress': 2, 'resolved': 3, 'closed': 4}
+
+CODES = {
+    'category': CATEGORY_CODES,
+    'priority': PRIORITY_CODES,
+    'status': STATUS_CODES,
+}
+
+
+def check_values(apps, schema_editor):
+    # Fail before any schema change if a stored value has no code: its code
+    # would stay NULL and 0013 could not make the column NOT NULL
+    Ticket = apps.get_model('tickets', 'Ticket')
+    unknown = {}
+    for field, field_codes in CODES.items():
+        values = sorted(
+            Ticket.objects.exclude(**{f'{field}__in': list(field_codes)})
+            .values_list(field, flat=True).distinct()
+        )
+        if values:
+            unknown[field] = values
+    if unknown:
+        raise ValueError(f'Tickets have values with no code; fix them and migrate again: {unknown}')
+
+
+def copy_codes(apps, schema_editor):
+    # One transaction per id range, so a large table is never locked or
+    # rewritten in a single statement. Rows the app writes meanwhile are
+    # caught up by 0013.
+    Ticket = apps.get_model('tickets', 'Ticket')
+    last_id = Ticket.objects.aggregate(last=Max('id'))['last'] or 0
+    codes = {
+        f'{field}_code': Case(
+            *(When(**{field: value}, then=Value(code)) for value, code in field_codes.items()),
+            output_field=models.SmallIntegerField(),
+        )
+        for field, field_codes in CODES.items()
+    }
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        with transaction.atomic(using=schema_editor.connection.alias):
+            Ticket.objects.filter(id__gte=start, id__lt=start + BATCH_SIZE).update(**codes)
+
+
+# First half of the switch to coded choices: add nullable code columns
+# next to the strings and fill them in batches while the app keeps
+# running. 0013 swaps the columns in one transaction.
+class Migration(migrations.Migration):
+
+    # The data copy commits batch by batch
+    atomic = False
+
+    dependencies = [
+        ('tickets', '0011_tune_ticket_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_values, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='ticket',
+            name='category_code',
+            field=models.SmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='priority_code',
+            field=models.SmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='status_code',
+            field=models.SmallIntegerField(null=True),
+        ),
+        migrations.RunPython(copy_codes, migrations.RunPython.noop),
+    ]
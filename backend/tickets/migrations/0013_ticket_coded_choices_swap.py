@@ -0,0 +1,183 @@
+# Generated by Django 5.1.15 on 2026-10-16 21:24
+
+from django.db import migrations, models
+from django.db.models import Case, Q, Value, When
+
+import tickets.fields
+
+
+# Same codes as 0012
+CATEGORY_CODES = {'billing': 1, 'technical': 2, 'account': 3, 'general': 4}
+PRIORITY_CODES = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+STATUS_CODES = {'open': 1, 'in_progress': 2, 'resolved': 3, 'closed': 4}
+
+CODES = {
+    'category': CATEGORY_CODES,
+    'priority': PRIORITY_CODES,
+    'status': STATUS_CODES,
+}
+
+# Making the columns NOT NULL rebuilds the table on SQLite, which drops the
+# FTS triggers from 0002
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_fts_insert AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_fts_delete AFTER DELETE ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_fts_update AFTER UPDATE OF title, description ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tickets_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END;
+    """,
+]
+
+
+def catch_up_codes(apps, schema_editor):
+    # Rows the app wrote while 0012 copied have a missing or stale code.
+    # Writes are blocked from here until the migration commits, so nothing
+    # can fall behind again before the string columns are dropped.
+    Ticket = apps.get_model('tickets', 'Ticket')
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('LOCK TABLE tickets IN SHARE MODE')
+
+    unknown = {}
+    for field, field_codes in CODES.items():
+        code_field = f'{field}_code'
+        code = Case(
+            *(When(**{field: value}, then=Value(code)) for value, code in field_codes.items()),
+            output_field=models.SmallIntegerField(),
+        )
+        Ticket.objects.filter(
+            Q(**{f'{code_field}__isnull': True}) | ~Q(**{code_field: code})
+        ).update(**{code_field: code})
+
+        values = sorted(
+            Ticket.objects.filter(**{f'{code_field}__isnull': True})
+            .values_list(field, flat=True).distinct()
+        )
+        if values:
+            unknown[field] = values
+    if unknown:
+        # Raised before any schema change; the transaction rolls back
+        raise ValueError(f'Tickets have values with no code; fix them and migrate again: {unknown}')
+
+
+def restore_strings(apps, schema_editor):
+    Ticket = apps.get_model('tickets', 'Ticket')
+    Ticket.objects.update(**{
+        field: Case(
+            *(When(**{f'{field}_code': code}, then=Value(value)) for value, code in field_codes.items()),
+            output_field=models.CharField(),
+        )
+        for field, field_codes in CODES.items()
+    })
+
+
+def restore_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+# Second half of the switch to coded choices: catch up the codes, drop
+# the string columns and make the codes NOT NULL. Runs in one
+# transaction, so a failure leaves the schema as 0012 left it.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0012_ticket_coded_choices'),
+    ]
+
+    operations = [
+        # Unapplying rebuilds the table on SQLite again; this runs last then
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.RunPython(catch_up_codes, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='tickets_open_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='tickets_in_progress_idx',
+        ),
+        # Nullable before they are dropped, so unapplying can add them back
+        # to a populated table and fill them in from the codes
+        migrations.AlterField(
+            model_name='ticket',
+            name='category',
+            field=models.CharField(choices=[('billing', 'Billing'), ('technical', 'Technical'), ('account', 'Account'), ('general', 'General')], max_length=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='priority',
+            field=models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], max_length=20, null=True),
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='status',
+            field=models.CharField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], default='open', max_length=20, null=True),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, restore_strings),
+        migrations.RemoveField(
+            model_name='ticket',
+            name='category',
+        ),
+        migrations.RemoveField(
+            model_name='ticket',
+            name='priority',
+        ),
+        migrations.RemoveField(
+            model_name='ticket',
+            name='status',
+        ),
+        migrations.RenameField(
+            model_name='ticket',
+            old_name='category_code',
+            new_name='category',
+        ),
+        migrations.RenameField(
+            model_name='ticket',
+            old_name='priority_code',
+            new_name='priority',
+        ),
+        migrations.RenameField(
+            model_name='ticket',
+            old_name='status_code',
+            new_name='status',
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='category',
+            field=tickets.fields.CodedChoiceField(choices=[('billing', 'Billing'), ('technical', 'Technical'), ('account', 'Account'), ('general', 'General')], codes=CATEGORY_CODES),
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='priority',
+            field=tickets.fields.CodedChoiceField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], codes=PRIORITY_CODES),
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='status',
+            field=tickets.fields.CodedChoiceField(choices=[('open', 'Open'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], codes=STATUS_CODES, default='open'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['-created_at', '-id'], name='tickets_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('status', 'in_progress')), fields=['-created_at', '-id'], name='tickets_in_progress_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-16 23:18
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Max
+from django.utils import timezone
+
+
+def create_version(apps, schema_editor):
+    # Start from the last ticket change, read while its index still exists
+    Ticket = apps.get_model('tickets', 'Ticket')
+    TicketDataVersion = apps.get_model('tickets', 'TicketDataVersion')
+    changed_at = Ticket.objects.aggregate(changed=Max('updated_at'))['changed']
+    TicketDataVersion.objects.create(pk=1, version=1, changed_at=changed_at or timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0013_ticket_coded_choices_swap'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'ticket_data_version',
+            },
+        ),
+        migrations.RunPython(create_version, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='ticket',
+            name='tickets_updated_at_idx',
+        ),
+        migrations.RemoveField(
+            model_name='ticketcounter',
+            name='updated_at',
+        ),
+    ]
@@ -1,7 +1,10 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import MaxLengthValidator
 from django.utils import timezone
 
+from .fields import CodedChoiceField
+
 
 class Ticket(models.Model):
     """
@@ -32,12 +35,17 @@ class Ticket(models.Model):
         ('closed', 'Closed'),
     ]
     
+    # Codes stored for category, priority and status here and in
+    # TicketEvent. Only ever append: existing rows keep their codes
+    CATEGORY_CODES = {'billing': 1, 'technical': 2, 'account': 3, 'general': 4}
+    PRIORITY_CODES = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+    STATUS_CODES = {'open': 1, 'in_progress': 2, 'resolved': 3, 'closed': 4}
+    
     title = models.CharField(
         max_length=200,
         validators=[MaxLengthValidator(200)],
         null=False,
-        blank=False,
-        db_index=True
+        blank=False
     )
     
     description = models.TextField(
@@ -45,48 +53,356 @@ class Ticket(models.Model):
         blank=False
     )
     
-    category = models.CharField(
-        max_length=20,
+    # Stored as two-byte codes; reads, filters and the API use the strings
+    category = CodedChoiceField(
         choices=CATEGORY_CHOICES,
+        codes=CATEGORY_CODES,
         null=False,
-        blank=False,
-        db_index=True
+        blank=False
     )
     
-    priority = models.CharField(
-        max_length=20,
+    priority = CodedChoiceField(
         choices=PRIORITY_CHOICES,
+        codes=PRIORITY_CODES,
         null=False,
-        blank=False,
-        db_index=True
+        blank=False
     )
     
-    status = models.CharField(
-        max_length=20,
+    status = CodedChoiceField(
         choices=STATUS_CHOICES,
+        codes=STATUS_CODES,
         default='open',
         null=False,
-        blank=False,
-        db_index=True
+        blank=False
     )
     
+    # A default rather than auto_now_add so bulk imports can keep the
+    # original creation time
     created_at = models.DateTimeField(
-        auto_now_add=True,
-        db_index=True
+        default=timezone.now,
+        editable=False
     )
     
     updated_at = models.DateTimeField(
         auto_now=True
     )
     
+    # Full-text document over title + description, maintained by a database
+    # trigger on PostgreSQL (see migration 0002). SQLite uses an FTS5 table.
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False
+    )
+    
+    # MinHash of title + description for near-duplicate lookup (see
+    # tickets/similarity.py); NULL until computed
+    similarity_signature = models.BinaryField(
+        null=True,
+        editable=False
+    )
+    
     class Meta:
         db_table = 'tickets'
         ordering = ['-created_at']
+        # Chosen with `manage.py advise_indexes`. Lists filter on any mix of
+        # category, priority and status and read newest first: common values
+        # walk the created_at index, and the open and in_progress queues (a
+        # small slice of the table) each have a partial index. One per status,
+        # since SQLite only uses a partial index whose condition appears in
+        # the query as written.
         indexes = [
-            models.Index(fields=['-created_at']),
-            models.Index(fields=['status', 'priority']),
-            models.Index(fields=['category']),
+            models.Index(fields=['-created_at', '-id'], name='tickets_created_idx'),
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='tickets_open_idx',
+                condition=models.Q(status='open')
+            ),
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='tickets_in_progress_idx',
+                condition=models.Q(status='in_progress')
+            ),
         ]
         
     def __str__(self):
         return f"[{self.id}] {self.title} - {self.status}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored (category, priority, status), so live updates can report
+        # the change in dashboard counts when the ticket is saved
+        if all(field in instance.__dict__ for field in ('category', 'priority', 'status')):
+            instance._loaded_bucket = (instance.category, instance.priority, instance.status)
+        return instance
+
+
+class TicketCounter(models.Model):
+    """
+    Materialized ticket counts per category x priority x status.
+    
+    Kept in step with the tickets table inside the same transaction as every
+    write, so statistics read at most 64 rows regardless of table size.
+    Rebuild with `manage.py rebuild_ticket_counters`.
+    """
+    
+    category = models.CharField(
+        max_length=20,
+        choices=Ticket.CATEGORY_CHOICES
+    )
+    
+    priority = models.CharField(
+        max_length=20,
+        choices=Ticket.PRIORITY_CHOICES
+    )
+    
+    status = models.CharField(
+        max_length=20,
+        choices=Ticket.STATUS_CHOICES
+    )
+    
+    count = models.BigIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'ticket_counters'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['category', 'priority', 'status'],
+                name='ticket_counters_unique_bucket'
+            ),
+        ]
+        
+    def __str__(self):
+        return f"{self.category}/{self.priority}/{self.status}: {self.count}"
+
+
+class TicketDataVersion(models.Model):
+    """
+    Single-row version of the ticket data, behind conditional GETs and the
+    stats cache (see StatsService.data_version).
+    
+    Every ticket write increments `version` inside its own transaction. The
+    row lock makes increments follow commit order, so a reader sees the
+    version move whenever a write becomes visible, even one that stamped
+    an earlier updated_at than a write committed before it.
+    """
+    
+    version = models.BigIntegerField(default=0)
+    
+    # Time of the last write, for Last-Modified; never moves backwards
+    changed_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'ticket_data_version'
+        
+    def __str__(self):
+        return f"v{self.version} at {self.changed_at}"
+
+
+class EmailOutbox(models.Model):
+    """
+    Durable queue of outgoing notification emails.
+    
+    Rows are written in the same transaction as the ticket change that
+    triggers them and delivered later by `manage.py send_queued_emails`.
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+        ('held', 'Held for digest'),
+        ('digested', 'Included in digest'),
+    ]
+    
+    EVENT_CHOICES = [
+        ('created', 'Ticket created'),
+        ('status_changed', 'Status changed'),
+        ('digest', 'Digest'),
+    ]
+    
+    ticket = models.ForeignKey(
+        Ticket,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='notifications'
+    )
+    
+    event = models.CharField(
+        max_length=20,
+        choices=EVENT_CHOICES,
+        default='created'
+    )
+    
+    subject = models.CharField(max_length=255)
+    
+    body = models.TextField()
+    
+    html_body = models.TextField(blank=True, default='')
+    
+    recipients = models.JSONField(default=list)
+    
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending'
+    )
+    
+    attempts = models.PositiveSmallIntegerField(default=0)
+    
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    
+    last_error = models.TextField(blank=True, default='')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'email_outbox'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+        
+    def __str__(self):
+        return f"[{self.id}] {self.subject} - {self.status}"
+
+
+class TicketSimilarityBucket(models.Model):
+    """
+    LSH band index over Ticket.similarity_signature.
+    
+    One row per ticket and signature band; tickets sharing a key are
+    candidate near-duplicates. Maintained by SimilarityIndex and rebuilt
+    with `manage.py build_similarity_index`.
+    """
+    
+    ticket = models.ForeignKey(
+        Ticket,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    
+    key = models.BigIntegerField()
+    
+    class Meta:
+        db_table = 'ticket_similarity_buckets'
+        indexes = [
+            # Lookups filter on key and read the newest tickets first
+            models.Index(fields=['key', 'ticket'], name='similarity_bucket_key_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.key}: {self.ticket_id}"
+
+
+class TicketEvent(models.Model):
+    """
+    Append-only history of ticket creation, deletion and changes to
+    status, category and priority.
+    
+    Written in the same transaction as the change (see EventLog). Kinds and
+    values are stored as small integer codes, so a row takes about 56 bytes
+    on PostgreSQL including the tuple header. Rows are kept when their
+    ticket is deleted.
+    """
+    
+    # Event kinds
+    CREATED = 1
+    STATUS_CHANGED = 2
+    CATEGORY_CHANGED = 3
+    PRIORITY_CHANGED = 4
+    DELETED = 5
+    
+    KIND_CHOICES = [
+        (CREATED, 'Created'),
+        (STATUS_CHANGED, 'Status changed'),
+        (CATEGORY_CHANGED, 'Category changed'),
+        (PRIORITY_CHANGED, 'Priority changed'),
+        (DELETED, 'Deleted'),
+    ]
+    
+    # Kind recorded for a change to each tracked field
+    FIELD_KINDS = {
+        'status': STATUS_CHANGED,
+        'category': CATEGORY_CHANGED,
+        'priority': PRIORITY_CHANGED,
+    }
+    
+    # Codes stored in old_value/new_value, the same as in the tickets table
+    VALUE_CODES = {
+        'status': Ticket.STATUS_CODES,
+        'category': Ticket.CATEGORY_CODES,
+        'priority': Ticket.PRIORITY_CODES,
+    }
+    
+    # No foreign key constraint, so the history outlives the ticket; the
+    # (ticket, created_at) index serves lookups by ticket
+    ticket = models.ForeignKey(
+        Ticket,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name='events'
+    )
+    
+    kind = models.PositiveSmallIntegerField(choices=KIND_CHOICES)
+    
+    # Status for CREATED/DELETED events, otherwise the changed field's
+    # value before and after; NULL when unknown
+    old_value = models.PositiveSmallIntegerField(null=True)
+    
+    new_value = models.PositiveSmallIntegerField(null=True)
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'ticket_events'
+        indexes = [
+            models.Index(fields=['ticket', 'created_at'], name='ticket_events_ticket_idx'),
+            models.Index(fields=['created_at'], name='ticket_events_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.ticket_id}: {self.get_kind_display()} at {self.created_at}"
+
+
+class TicketDailyRollup(models.Model):
+    """
+    Tickets created and resolved per day x category x priority.
+    
+    Kept up to date by EventLog as events are written, so a date range is
+    read with one scan of the unique (day, category, priority) index.
+    Rebuild with `manage.py rebuild_daily_rollups`.
+    """
+    
+    day = models.DateField()
+    
+    category = models.CharField(
+        max_length=20,
+        choices=Ticket.CATEGORY_CHOICES
+    )
+    
+    priority = models.CharField(
+        max_length=20,
+        choices=Ticket.PRIORITY_CHOICES
+    )
+    
+    created = models.PositiveIntegerField(default=0)
+    
+    # Moves from open/in_progress to resolved/closed
+    resolved = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        db_table = 'ticket_daily_rollups'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'category', 'priority'],
+                name='ticket_daily_rollups_unique_day'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.day} {self.category}/{self.priority}: +{self.created} -{self.resolved}"
@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TicketCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the ticket list, newest first.
+
+    Pages are located by seeking on created_at through its index (with id as
+    a stable tie-breaker) instead of OFFSET scans, so every page costs the
+    same regardless of how deep the client has scrolled. Cursors are opaque
+    base64 tokens returned in the `next` / `previous` links.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
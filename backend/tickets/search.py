@@ -0,0 +1,104 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q, TextField
+from django.db.models.expressions import RawSQL
+
+from .models import Ticket
+
+
+# Upper bound on terms taken from a single search string
+MAX_SEARCH_TERMS = 8
+
+TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def _search_terms(query):
+    """Split a free-text query into lower-cased word terms."""
+    return TERM_PATTERN.findall(query.lower())[:MAX_SEARCH_TERMS]
+
+
+def _postgres_query(terms):
+    """
+    Build a prefix-matching tsquery from the terms' lexemes:
+    'payments broke' -> 'payment':* & 'broke':*
+
+    The terms go through to_tsvector('english'), the same normalisation
+    as the indexed search_vector, so a typed word matches its stemmed form
+    and stop words are dropped. The lexemes are parsed with the 'simple'
+    config so they are not stemmed twice.
+    """
+    lexemes = RawSQL(
+        "(SELECT coalesce(string_agg(quote_literal(lexeme) || ':*', ' & '), '') "
+        "FROM unnest(to_tsvector('english', %s)))",
+        [' '.join(terms)],
+        output_field=TextField(),
+    )
+    return SearchQuery(lexemes, search_type='raw', config='simple')
+
+
+def _sqlite_match(terms):
+    """Build an FTS5 MATCH expression: 'pay broke' -> '"pay"* "broke"*'"""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def filter_search(queryset, query):
+    """
+    Restrict a ticket queryset to rows matching `query` in title or description.
+
+    Uses the full-text index for the active database (tsvector + GIN on
+    PostgreSQL, FTS5 on SQLite) and falls back to substring matching on other
+    backends. Ordering of the queryset is left untouched so callers can keep
+    paginating by recency.
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor == 'postgresql':
+        return queryset.filter(search_vector=_postgres_query(terms))
+
+    if connection.vendor == 'sqlite':
+        return queryset.filter(id__in=RawSQL(
+            'SELECT rowid FROM tickets_fts WHERE tickets_fts MATCH %s',
+            [_sqlite_match(terms)],
+        ))
+
+    return queryset.filter(
+        Q(title__icontains=query) | Q(description__icontains=query)
+    )
+
+
+def ranked_search(query, limit=20):
+    """
+    Return the `limit` best-matching tickets for `query`, most relevant first.
+
+    Title matches weigh more than description matches on both backends.
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return []
+
+    if connection.vendor == 'postgresql':
+        search_query = _postgres_query(terms)
+        return list(
+            Ticket.objects
+            .defer('search_vector', 'similarity_signature')
+            .filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', '-created_at')[:limit]
+        )
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT rowid FROM tickets_fts WHERE tickets_fts MATCH %s '
+                'ORDER BY bm25(tickets_fts, 2.0, 1.0) LIMIT %s',
+                [_sqlite_match(terms), limit],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        tickets = Ticket.objects.defer('search_vector', 'similarity_signature').in_bulk(ids)
+        return [tickets[ticket_id] for ticket_id in ids if ticket_id in tickets]
+
+    return list(filter_search(Ticket.objects.all(), query)[:limit])
@@ -49,6 +49,40 @@ class TicketUpdateSerializer(serializers.ModelSerializer):
         if value and len(value) > 200:
             raise serializers.ValidationError("Title cannot exceed 200 characters")
         return value
+    
+    def update(self, instance, validated_data):
+        """Write only the columns whose value actually changed"""
+        changed = [
+            field for field, value in validated_data.items()
+            if getattr(instance, field) != value
+        ]
+        for field in changed:
+            setattr(instance, field, validated_data[field])
+        if changed:
+            instance.save(update_fields=changed + ['updated_at'])
+        return instance
+
+
+class BulkTicketUpdateSerializer(serializers.Serializer):
+    """
+    Serializer for bulk ticket updates (PATCH /tickets/bulk/).
+    Tickets are selected by `ids`, or by the list filters in the query
+    string when `ids` is omitted.
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=1000
+    )
+    status = serializers.ChoiceField(choices=Ticket.STATUS_CHOICES, required=False)
+    category = serializers.ChoiceField(choices=Ticket.CATEGORY_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Ticket.PRIORITY_CHOICES, required=False)
+    
+    def validate(self, data):
+        if not any(field in data for field in ('status', 'category', 'priority')):
+            raise serializers.ValidationError("Provide at least one of status, category or priority")
+        return data
 
 
 class ClassificationRequestSerializer(serializers.Serializer):
@@ -63,6 +97,23 @@ class ClassificationRequestSerializer(serializers.Serializer):
         return value.strip()
 
 
+class BatchClassificationRequestSerializer(serializers.Serializer):
+    """
+    Serializer for batch LLM classification request.
+    """
+    descriptions = serializers.ListField(
+        child=serializers.CharField(allow_blank=False),
+        allow_empty=False,
+        max_length=1000
+    )
+    
+    def validate_descriptions(self, value):
+        cleaned = [description.strip() for description in value]
+        if not all(cleaned):
+            raise serializers.ValidationError("Descriptions cannot be empty")
+        return cleaned
+
+
 class ClassificationResponseSerializer(serializers.Serializer):
     """
     Serializer for LLM classification response.
@@ -0,0 +1,16 @@
+"""
+Signals for ticket writes that bypass Model.save() and delete(), so
+post_save/post_delete never fire for them.
+"""
+from django.dispatch import Signal
+
+
+# Sent with `tickets` (list of Ticket) after bulk_create, inside the
+# transaction that inserted them
+tickets_bulk_created = Signal()
+
+# Sent with `ids` (list of ticket ids), `old_buckets` (their
+# (category, priority, status) before the update), `changes` (dict of
+# the values written) and `changed_at` (the updated_at written) after a
+# queryset update, inside the transaction
+tickets_bulk_updated = Signal()
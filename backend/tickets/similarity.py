@@ -0,0 +1,181 @@
+import hashlib
+import random
+import struct
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # Signatures are computed in pure Python without it
+    np = None
+
+from django.db import transaction
+
+from .keyword_classifier import TOKEN_PATTERN
+from .models import Ticket, TicketSimilarityBucket
+
+
+# MinHash signature length, split into BANDS bands of ROWS values for LSH.
+# Two tickets share a bucket (and are compared) when all values of any band
+# agree, which for a Jaccard similarity s happens with probability
+# 1 - (1 - s ** ROWS) ** BANDS: 0.12 at s=0.3, 0.64 at 0.5, 0.99 at 0.7.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# Largest prime below 2**32. With a < 2**31 and 32-bit shingle hashes,
+# a * x + b stays below 2**64, so NumPy uint64 arithmetic gives the same
+# signatures as Python integers
+PRIME = (1 << 32) - 5
+_rng = random.Random(20240229)
+PERM_A = [_rng.randrange(1, 1 << 31) for _ in range(NUM_PERM)]
+PERM_B = [_rng.randrange(0, 1 << 31) for _ in range(NUM_PERM)]
+
+SIGNATURE_FORMAT = f'<{NUM_PERM}I'
+
+# Bucket rows read per lookup; in an outage a bucket can hold thousands of
+# tickets, and the most recent ones are the useful duplicates
+MAX_CANDIDATES = 1000
+
+
+def shingles(text: str) -> set:
+    """Hashed word unigrams and bigrams of `text`"""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    grams = tokens + [f'{first} {second}' for first, second in zip(tokens, tokens[1:])]
+    return {zlib.crc32(gram.encode('utf-8')) for gram in grams}
+
+
+def minhash(text: str):
+    """
+    Returns:
+        tuple of NUM_PERM ints, or None when `text` has no words
+    """
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    if np is not None:
+        values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        a = np.array(PERM_A, dtype=np.uint64)
+        b = np.array(PERM_B, dtype=np.uint64)
+        return tuple(((values[:, None] * a + b) % PRIME).min(axis=0).tolist())
+    return tuple(
+        min((a * value + b) % PRIME for value in hashes)
+        for a, b in zip(PERM_A, PERM_B)
+    )
+
+
+def band_keys(signature) -> list:
+    """One signed 64-bit bucket key per band, with the band number mixed in"""
+    keys = []
+    for band in range(BANDS):
+        values = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(
+            struct.pack(f'<H{ROWS}I', band, *values), digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def encode_signature(signature) -> bytes:
+    return struct.pack(SIGNATURE_FORMAT, *signature)
+
+
+def decode_signature(data: bytes) -> tuple:
+    return struct.unpack(SIGNATURE_FORMAT, bytes(data))
+
+
+class SimilarityIndex:
+    """
+    Near-duplicate lookup over MinHash signatures with an LSH band index.
+
+    Each ticket stores the MinHash signature of its title and description
+    (Ticket.similarity_signature) and one TicketSimilarityBucket row per
+    band. Finding similar tickets reads the BANDS buckets of the query
+    signature through the (key, ticket) index, then scores at most
+    MAX_CANDIDATES candidates by the fraction of signature values they
+    share, which estimates the Jaccard similarity of their word sets. The
+    cost depends on how many tickets share a bucket, not on table size.
+    """
+
+    def signature_for(self, title: str, description: str):
+        """
+        Returns:
+            encoded signature bytes for Ticket.similarity_signature, or None
+        """
+        signature = minhash(f'{title}\n{description}')
+        return encode_signature(signature) if signature else None
+
+    def index(self, tickets):
+        """
+        Add bucket rows for saved tickets that have a signature.
+
+        Callers run this inside the transaction that wrote the tickets.
+        """
+        TicketSimilarityBucket.objects.bulk_create([
+            TicketSimilarityBucket(ticket_id=ticket.pk, key=key)
+            for ticket in tickets
+            if ticket.similarity_signature
+            for key in band_keys(decode_signature(ticket.similarity_signature))
+        ], batch_size=5000)
+
+    def reindex(self, ticket):
+        """Recompute the signature and buckets after the title or description changed"""
+        with transaction.atomic():
+            ticket.similarity_signature = self.signature_for(ticket.title, ticket.description)
+            Ticket.objects.filter(pk=ticket.pk).update(similarity_signature=ticket.similarity_signature)
+            TicketSimilarityBucket.objects.filter(ticket_id=ticket.pk).delete()
+            self.index([ticket])
+
+    def similar(self, signature, limit=10, min_similarity=0.5, exclude_id=None) -> list:
+        """
+        Find tickets similar to an encoded signature.
+
+        Args:
+            signature: Ticket.similarity_signature bytes
+            limit: most matches to return
+            min_similarity: lowest estimated Jaccard similarity (0-1)
+            exclude_id: ticket to leave out (the query ticket itself)
+
+        Returns:
+            list of (ticket_id, similarity), most similar first, ties broken
+            by newest ticket
+        """
+        if not signature:
+            return []
+        query = decode_signature(signature)
+        candidates = (
+            TicketSimilarityBucket.objects.filter(key__in=band_keys(query))
+            .exclude(ticket_id=exclude_id)
+            .order_by('-ticket_id')
+            .values_list('ticket_id', flat=True)
+            .distinct()[:MAX_CANDIDATES]
+        )
+        rows = list(
+            Ticket.objects.filter(pk__in=list(candidates))
+            .values_list('pk', 'similarity_signature')
+        )
+        if not rows:
+            return []
+
+        ids = [ticket_id for ticket_id, _signature in rows]
+        if np is not None:
+            matrix = np.frombuffer(
+                b''.join(bytes(data) for _ticket_id, data in rows), dtype='<u4'
+            ).reshape(len(rows), NUM_PERM)
+            scores = (matrix == np.array(query, dtype='<u4')).mean(axis=1).tolist()
+        else:
+            scores = [
+                sum(x == y for x, y in zip(decode_signature(data), query)) / NUM_PERM
+                for _ticket_id, data in rows
+            ]
+
+        matches = [
+            (ticket_id, round(score, 2))
+            for ticket_id, score in zip(ids, scores)
+            if score >= min_similarity
+        ]
+        matches.sort(key=lambda match: (match[1], match[0]), reverse=True)
+        return matches[:limit]
+
+
+# Singleton instance
+similarity_index = SimilarityIndex()
@@ -0,0 +1,273 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Ticket, TicketCounter, TicketDataVersion
+from .signals import tickets_bulk_created, tickets_bulk_updated
+
+
+class StatsService:
+    """
+    Service class for dashboard statistics.
+    Reads breakdowns from the TicketCounter table, which every ticket write
+    keeps up to date, and caches the result under the current data
+    version, so any ticket change (in any process) moves to a new entry.
+    """
+
+    CACHE_KEY = 'tickets:stats'
+
+    def __init__(self):
+        # Lifetime of a cache entry. Entries are keyed by data version, so
+        # this only bounds how long avg_tickets_per_day can lag the date
+        # and how long superseded entries linger.
+        self.max_age = getattr(settings, 'TICKET_STATS_CACHE_SECONDS', 30)
+
+    def get_statistics(self, version=None) -> dict:
+        """
+        Return aggregated ticket statistics, cached.
+
+        Args:
+            version: cache key for the current data, e.g. an ETag built
+                from data_version(); read with data_version() when omitted
+
+        Returns:
+            dict matching TicketStatsSerializer
+        """
+        if self.max_age <= 0:
+            return self.compute_statistics()
+
+        if version is None:
+            version = self.data_version()[0]
+        key = f'{self.CACHE_KEY}:{version}'
+        stats = cache.get(key)
+        if stats is None:
+            stats = self.compute_statistics()
+            cache.set(key, stats, self.max_age)
+        return stats
+
+    def data_version(self):
+        """
+        Version of the ticket data, for conditional GETs and the stats cache.
+
+        Read from the single TicketDataVersion row, which every ticket write
+        increments in its own transaction (see record_write). Unlike the
+        newest updated_at, it moves even when a transaction commits after
+        one that stamped a later time.
+
+        Returns:
+            (version string, datetime of the last change or None)
+        """
+        row = TicketDataVersion.objects.values_list('version', 'changed_at').first()
+        if row is None:
+            return '0', None
+        version, changed_at = row
+        # The time tells versions apart after the table is recreated
+        return f'{version}|{changed_at.isoformat()}', changed_at
+
+    def compute_statistics(self) -> dict:
+        """
+        Compute statistics from the counters table (at most 64 rows) plus a
+        single index lookup for the earliest ticket.
+        """
+        priority_breakdown = {}
+        category_breakdown = {}
+        status_breakdown = {}
+        total_tickets = 0
+
+        counters = TicketCounter.objects.filter(count__gt=0).values_list(
+            'category', 'priority', 'status', 'count'
+        )
+        for category, priority, ticket_status, count in counters:
+            total_tickets += count
+            category_breakdown[category] = category_breakdown.get(category, 0) + count
+            priority_breakdown[priority] = priority_breakdown.get(priority, 0) + count
+            status_breakdown[ticket_status] = status_breakdown.get(ticket_status, 0) + count
+
+        earliest = (
+            Ticket.objects.order_by('created_at')
+            .values_list('created_at', flat=True)
+            .first()
+        )
+        if earliest:
+            days_since_first = (timezone.now() - earliest).days + 1
+            avg_tickets_per_day = round(total_tickets / days_since_first, 2)
+        else:
+            avg_tickets_per_day = 0.0
+
+        return {
+            'total_tickets': total_tickets,
+            'open_tickets': status_breakdown.get('open', 0),
+            'avg_tickets_per_day': avg_tickets_per_day,
+            'priority_breakdown': priority_breakdown,
+            'category_breakdown': category_breakdown,
+            'status_breakdown': status_breakdown,
+        }
+
+    # Counter maintenance. Callers run these inside the transaction that
+    # writes the ticket so the counters can never drift from the table.
+
+    def record_created(self, ticket):
+        """Count a newly created ticket"""
+        self._bump(ticket.category, ticket.priority, ticket.status, 1)
+
+    def record_bulk_created(self, tickets):
+        """Count tickets inserted with bulk_create, one update per bucket"""
+        buckets = {}
+        for ticket in tickets:
+            bucket = (ticket.category, ticket.priority, ticket.status)
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+        for bucket, count in buckets.items():
+            self._bump(*bucket, count)
+
+    def record_bulk_changed(self, old_buckets, changes):
+        """
+        Move tickets between counters after a queryset update.
+
+        Args:
+            old_buckets: (category, priority, status) of each updated ticket
+                before the update
+            changes: dict of the category/priority/status values written
+        """
+        deltas = {}
+        for category, priority, ticket_status in old_buckets:
+            old_bucket = (category, priority, ticket_status)
+            new_bucket = (
+                changes.get('category', category),
+                changes.get('priority', priority),
+                changes.get('status', ticket_status),
+            )
+            if old_bucket != new_bucket:
+                deltas[old_bucket] = deltas.get(old_bucket, 0) - 1
+                deltas[new_bucket] = deltas.get(new_bucket, 0) + 1
+        for bucket, delta in deltas.items():
+            if delta:
+                self._bump(*bucket, delta)
+
+    def record_changed(self, old_bucket, ticket):
+        """
+        Move a ticket between counters after an update.
+
+        Args:
+            old_bucket: (category, priority, status) before the update
+            ticket: Ticket instance with the new values
+        """
+        new_bucket = (ticket.category, ticket.priority, ticket.status)
+        if tuple(old_bucket) != new_bucket:
+            self._bump(*old_bucket, -1)
+            self._bump(*new_bucket, 1)
+
+    def record_deleted(self, queryset):
+        """Uncount the tickets in `queryset`; call before deleting them"""
+        rows = (
+            queryset.values('category', 'priority', 'status')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        for row in rows:
+            self._bump(row['category'], row['priority'], row['status'], -row['total'])
+
+    def rebuild_counters(self) -> int:
+        """
+        Recompute every counter from the tickets table.
+
+        Returns:
+            int: number of counter rows written
+        """
+        with transaction.atomic():
+            TicketCounter.objects.all().delete()
+            counters = TicketCounter.objects.bulk_create([
+                TicketCounter(
+                    category=category,
+                    priority=priority,
+                    status=ticket_status,
+                    count=count,
+                )
+                for (category, priority, ticket_status), count in self._actual_counts().items()
+            ])
+            # Cached statistics were computed from the old counters
+            self.record_write()
+        return len(counters)
+
+    def find_counter_drift(self) -> dict:
+        """
+        Compare counters against the tickets table.
+
+        Returns:
+            dict mapping (category, priority, status) to (stored, actual)
+            for every bucket that disagrees
+        """
+        stored = {
+            (category, priority, ticket_status): count
+            for category, priority, ticket_status, count in TicketCounter.objects.values_list(
+                'category', 'priority', 'status', 'count'
+            )
+        }
+        actual = self._actual_counts()
+        return {
+            bucket: (stored.get(bucket, 0), actual.get(bucket, 0))
+            for bucket in stored.keys() | actual.keys()
+            if stored.get(bucket, 0) != actual.get(bucket, 0)
+        }
+
+    def _actual_counts(self) -> dict:
+        rows = (
+            Ticket.objects.values('category', 'priority', 'status')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        return {
+            (row['category'], row['priority'], row['status']): row['total']
+            for row in rows
+        }
+
+    def record_write(self):
+        """
+        Move the data version; runs for every ticket write, inside its
+        transaction (see the receivers below).
+
+        The row stays locked until the write commits, so ticket writes queue
+        on it for the rest of their transaction.
+        """
+        now = timezone.now()
+        row = TicketDataVersion.objects.filter(pk=1)
+        changes = {'version': F('version') + 1, 'changed_at': Greatest('changed_at', Value(now))}
+        if row.update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                TicketDataVersion.objects.create(pk=1, version=1, changed_at=now)
+        except IntegrityError:
+            # Another transaction created the row first
+            row.update(**changes)
+
+    def _bump(self, category, priority, ticket_status, delta):
+        bucket = TicketCounter.objects.filter(
+            category=category, priority=priority, status=ticket_status
+        )
+        if bucket.update(count=F('count') + delta):
+            return
+        try:
+            with transaction.atomic():
+                TicketCounter.objects.create(
+                    category=category, priority=priority, status=ticket_status, count=delta
+                )
+        except IntegrityError:
+            # Another transaction created the bucket first
+            bucket.update(count=F('count') + delta)
+
+
+# Singleton instance
+stats_service = StatsService()
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+@receiver(tickets_bulk_created, sender=Ticket)
+@receiver(tickets_bulk_updated, sender=Ticket)
+def record_ticket_write(sender, **kwargs):
+    stats_service.record_write()
@@ -0,0 +1,364 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.utils import ConnectionHandler
+from django.test import AsyncClient, SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from . import export, local_classifier, search
+from .circuit_breaker import CircuitBreaker
+from .classification_cache import ClassificationCache, MemoryClassificationCache
+from .email_service import EmailService
+from .llm_service import LLMService
+from .models import (
+    EmailOutbox,
+    Ticket,
+    TicketCounter,
+    TicketDailyRollup,
+    TicketSimilarityBucket,
+)
+from .signals import tickets_bulk_updated
+from .stats_service import stats_service
+from .trends import trend_service
+
+
+def postgresql_sql(test, queryset):
+    """Compile `queryset` for PostgreSQL without connecting to a server"""
+    try:
+        connection = ConnectionHandler({
+            'default': {'ENGINE': 'django.db.backends.postgresql', 'NAME': 'tickets'},
+        })['default']
+    except ImproperlyConfigured:
+        test.skipTest('psycopg is not installed')
+    # Compiling SELECT ... FOR UPDATE asks whether a transaction is open
+    with mock.patch.object(connection, 'get_autocommit', return_value=False):
+        return queryset.query.get_compiler(connection=connection).as_sql()
+
+
+class TicketQueryCountTests(TestCase):
+    """
+    Pin the number of queries each ticket endpoint issues.
+
+    Counts include the SAVEPOINT/RELEASE pairs of the views' atomic blocks,
+    which TestCase's wrapping transaction turns into queries.
+    """
+
+    def setUp(self):
+        # Create the counter and rollup rows up front, so the counts below
+        # are the steady state rather than the first ticket in a bucket
+        TicketCounter.objects.bulk_create([
+            TicketCounter(category='account', priority='high', status=value, count=0)
+            for value, _label in Ticket.STATUS_CHOICES
+        ])
+        self.ticket_id = self._create().json()['id']
+
+    def _create(self):
+        return self.client.post(
+            '/api/tickets/',
+            json.dumps({
+                'title': 'Cannot log in',
+                'description': 'Getting error 500 when trying to log in',
+                'category': 'account',
+                'priority': 'high',
+            }),
+            content_type='application/json',
+        )
+
+    def _patch(self, data):
+        return self.client.patch(
+            f'/api/tickets/{self.ticket_id}/',
+            json.dumps(data),
+            content_type='application/json',
+        )
+
+    def test_create(self):
+        # Ticket INSERT, data version, counter bump, event, rollup, outbox (in
+        # a savepoint) and similarity buckets, inside the view's savepoint
+        with self.assertNumQueries(11):
+            response = self._create()
+        self.assertEqual(response.status_code, 201)
+
+    def test_status_patch(self):
+        # One locked read and one narrow UPDATE of the ticket, the data
+        # version, two counter bumps, an event and a queued notification
+        with self.assertNumQueries(11):
+            response = self._patch({'status': 'in_progress'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Ticket.objects.get(pk=self.ticket_id).status, 'in_progress')
+
+    def test_noop_patch(self):
+        # Only the locked read: nothing changed, so nothing is written
+        with self.assertNumQueries(3):
+            response = self._patch({'status': 'open'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_list(self):
+        # Conditional GET version (one row) and the page itself
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/tickets/?status=open')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([ticket['id'] for ticket in response.json()['results']], [self.ticket_id])
+
+    def test_list_skips_unserialized_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/tickets/?search=login')
+        page_query = queries.captured_queries[-1]['sql']
+        self.assertNotIn('search_vector', page_query)
+        self.assertNotIn('similarity_signature', page_query)
+
+
+class SearchQueryTests(SimpleTestCase):
+
+    def test_postgresql_prefixes_use_stemmed_lexemes(self):
+        with mock.patch.object(search, 'connection', mock.Mock(vendor='postgresql')):
+            queryset = search.filter_search(Ticket.objects.all(), 'Payments broke')
+        sql, params = postgresql_sql(self, queryset)
+        # The terms are normalised like the indexed column, then parsed as
+        # prefixes without stemming again
+        self.assertIn("to_tsquery(%s::regconfig, ((SELECT coalesce(string_agg(quote_literal(lexeme) || ':*'", sql)
+        self.assertIn("unnest(to_tsvector('english', %s))", sql)
+        self.assertEqual(params[-2:], ('simple', 'payments broke'))
+
+
+class TrendRollupTests(TestCase):
+
+    def _patch(self, ticket_id, data):
+        response = self.client.patch(
+            f'/api/tickets/{ticket_id}/', json.dumps(data), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def _rollups(self):
+        return sorted(TicketDailyRollup.objects.values_list('day', 'category', 'priority', 'created', 'resolved'))
+
+    def test_rebuild_matches_incremental_rollups_after_moves(self):
+        ticket_ids = [
+            self.client.post('/api/tickets/', json.dumps({
+                'title': title, 'description': 'Details', 'category': 'billing', 'priority': 'low',
+            }), content_type='application/json').json()['id']
+            for title in ('Moved', 'Untouched')
+        ]
+        moved = ticket_ids[0]
+        self._patch(moved, {'category': 'technical'})
+        self._patch(moved, {'status': 'resolved', 'priority': 'high'})
+        self._patch(moved, {'category': 'account', 'priority': 'critical'})
+
+        incremental = self._rollups()
+        today = timezone.localdate()
+        # Created under its values at creation, resolved under those it had
+        # when resolved (including the priority set with the resolution)
+        self.assertEqual(incremental, [
+            (today, 'billing', 'low', 2, 0),
+            (today, 'technical', 'high', 0, 1),
+        ])
+
+        trend_service.rebuild()
+        self.assertEqual(self._rollups(), incremental)
+        trend_service.rebuild(since=today)
+        self.assertEqual(self._rollups(), incremental)
+
+
+class DataVersionTests(TestCase):
+
+    def test_version_moves_for_write_stamped_before_the_newest(self):
+        older, newer = (
+            Ticket.objects.create(title=title, description='Details', category='general', priority='low')
+            for title in ('Older', 'Newer')
+        )
+        version, last_changed = stats_service.data_version()
+
+        # A transaction that stamped its time before `newer` was saved but
+        # commits afterwards: the newest updated_at does not move
+        stamped_at = older.updated_at
+        with transaction.atomic():
+            Ticket.objects.filter(pk=older.pk).update(status='closed', updated_at=stamped_at)
+            tickets_bulk_updated.send(
+                sender=Ticket, ids=[older.pk], old_buckets=[('general', 'low', 'open')],
+                changes={'status': 'closed'}, changed_at=stamped_at,
+            )
+
+        new_version, new_last_changed = stats_service.data_version()
+        self.assertNotEqual(new_version, version)
+        self.assertGreaterEqual(new_last_changed, last_changed)
+        self.assertLess(stamped_at, newer.updated_at)
+
+
+class EmailDigestTests(TestCase):
+
+    def _hold(self, ticket, event='status_changed'):
+        return EmailOutbox.objects.create(
+            ticket=ticket, event=event, status='held',
+            subject=f'Ticket #{ticket.pk}', body='...', recipients=['admin@example.com'],
+        )
+
+    def test_flush_digest_folds_held_rows(self):
+        tickets = [
+            Ticket.objects.create(title=f'Ticket {n}', description='Details', category='billing', priority='low')
+            for n in range(3)
+        ]
+        held = [self._hold(ticket) for ticket in tickets]
+        tickets[0].delete()
+
+        self.assertEqual(EmailService().flush_digest(force=True), 3)
+        self.assertEqual(
+            EmailOutbox.objects.filter(pk__in=[item.pk for item in held], status='digested').count(), 3
+        )
+        digest = EmailOutbox.objects.get(event='digest')
+        self.assertEqual(digest.status, 'pending')
+        self.assertIn('Ticket 1', digest.body)
+        self.assertNotIn('Ticket 0', digest.body)
+
+    def test_digest_locks_only_outbox_rows_on_postgresql(self):
+        # SQLite has no FOR UPDATE, so compile the query for PostgreSQL
+        sql, _params = postgresql_sql(self, EmailService()._held_notifications())
+        self.assertIn('LEFT OUTER JOIN', sql)
+        self.assertIn('FOR UPDATE OF "email_outbox" SKIP LOCKED', sql)
+
+
+class ExportStreamingTests(TestCase):
+
+    def setUp(self):
+        Ticket.objects.bulk_create([
+            Ticket(title=f'Ticket {n}', description='Details', category='general', priority='low')
+            for n in range(5)
+        ])
+
+    async def test_asgi_export_streams_without_buffering(self):
+        produced = []
+        export_pieces = export.export_tickets
+
+        def counting_export(queryset, output):
+            for piece in export_pieces(queryset, output):
+                produced.append(piece)
+                yield piece
+
+        with mock.patch.object(export, 'EXPORT_ROWS_PER_WRITE', 1), \
+                mock.patch.object(export, 'export_tickets', counting_export):
+            response = await AsyncClient().get('/api/tickets/export/?output=ndjson')
+            self.assertTrue(response.is_async)
+
+            chunks = aiter(response.streaming_content)
+            first = await anext(chunks)
+            # Only the piece being sent has been read from the database
+            self.assertEqual(len(produced), 1)
+            rest = [chunk async for chunk in chunks]
+
+        lines = b''.join([first, *rest]).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0])['category'], 'general')
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    def _open_breaker(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        breaker.opened_at -= 30
+        return breaker
+
+    def test_cancelled_probe_reopens_circuit(self):
+        async_client = mock.Mock()
+        async_client.chat.completions.create = mock.AsyncMock(side_effect=asyncio.CancelledError)
+        service = LLMService(client=mock.Mock(), async_client=async_client)
+        service.local_classifier = None
+        service.cache = None
+        service.breaker = self._open_breaker()
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(service.aclassify_ticket('The invoice total is wrong'))
+        self.assertEqual(service.breaker.state, CircuitBreaker.OPEN)
+
+    def test_lost_probe_is_replaced_after_timeout(self):
+        breaker = self._open_breaker()
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        breaker.probe_started_at -= 30
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+
+class ClassificationCacheTests(SimpleTestCase):
+
+    def test_base_class_is_abstract(self):
+        with self.assertRaises(TypeError):
+            ClassificationCache()
+
+    def test_counts_concurrent_lookups(self):
+        cache = MemoryClassificationCache()
+        cache.set('Refund missing', {'suggested_category': 'billing'})
+        descriptions = ['Refund missing', 'Cannot log in'] * 2000
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(cache.get, descriptions))
+        self.assertEqual(cache.stats(), {'hits': 2000, 'misses': 2000, 'size': 1})
+
+    def test_local_classifier_counts_concurrent_answers(self):
+        if local_classifier.np is None:
+            self.skipTest('numpy is not installed')
+        np = local_classifier.np
+        classifier = local_classifier.LocalClassifier(
+            np.zeros((16, 8)), np.zeros(8), ['billing', 'technical', 'account', 'general'],
+            ['low', 'medium', 'high', 'critical'],
+        )
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(4000):
+                executor.submit(classifier.record_answer)
+        self.assertEqual(classifier.stats()['answered'], 4000)
+
+
+class LiveUpdateEventTests(TestCase):
+
+    def test_events_carry_trend_changes(self):
+        with mock.patch('tickets.live_updates.publish_event') as publish:
+            ticket = Ticket.objects.create(
+                title='Refund missing', description='No refund yet', category='billing', priority='low'
+            )
+            ticket = Ticket.objects.get(pk=ticket.pk)
+            ticket.status = 'resolved'
+            ticket.save()
+            ticket.priority = 'high'
+            ticket.save()
+
+        created, resolved, edited = (call.args[0] for call in publish.call_args_list)
+        self.assertEqual(created['trends'][0]['created'], 1)
+        self.assertEqual(created['trends'][0]['category'], {'billing': {'created': 1, 'resolved': 0}})
+        self.assertEqual(resolved['trends'][0]['resolved'], 1)
+        self.assertEqual(resolved['stats']['status'], {'open': -1, 'resolved': 1})
+        self.assertEqual(edited['trends'], [])
+
+
+class TicketAdminTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(get_user_model().objects.create_superuser('admin', 'admin@example.com', 'pw'))
+
+    def _save(self, url, **changes):
+        data = {
+            'title': 'Cannot log in',
+            'description': 'Getting error 500 when trying to log in',
+            'category': 'account',
+            'priority': 'high',
+            'status': 'open',
+            **changes,
+        }
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+
+    def test_admin_saves_keep_similarity_index_current(self):
+        self._save('/admin/tickets/ticket/add/')
+        ticket = Ticket.objects.get()
+        self.assertIsNotNone(ticket.similarity_signature)
+        self.assertTrue(TicketSimilarityBucket.objects.filter(ticket_id=ticket.pk).exists())
+
+        old_keys = set(TicketSimilarityBucket.objects.filter(ticket_id=ticket.pk).values_list('key', flat=True))
+        self._save(f'/admin/tickets/ticket/{ticket.pk}/change/', title='Refund never arrived',
+                   description='Charged twice for the annual plan')
+        new_keys = set(TicketSimilarityBucket.objects.filter(ticket_id=ticket.pk).values_list('key', flat=True))
+        self.assertTrue(new_keys)
+        self.assertFalse(old_keys & new_keys)
@@ -0,0 +1,233 @@
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Ticket, TicketDailyRollup, TicketEvent
+from .stats_service import stats_service
+
+
+RESOLVED_STATUSES = ('resolved', 'closed')
+
+INTERVALS = ('day', 'week')
+
+VALUE_NAMES = {
+    field: {code: value for value, code in TicketEvent.VALUE_CODES[field].items()}
+    for field in ('category', 'priority')
+}
+
+# Event kinds that move a ticket between rollup rows
+CHANGE_FIELDS = {
+    TicketEvent.CATEGORY_CHANGED: 'category',
+    TicketEvent.PRIORITY_CHANGED: 'priority',
+}
+
+
+def is_resolution(old_status, new_status) -> bool:
+    """True for a move from open or in_progress to resolved or closed"""
+    return new_status in RESOLVED_STATUSES and old_status not in RESOLVED_STATUSES
+
+
+def _values_at(changes, current, at=None):
+    """
+    A ticket's (category, priority) at time `at`, or when it was created.
+
+    Args:
+        changes: (changed_at, field, old value code) of the ticket's
+            category and priority changes, oldest first
+        current: its (category, priority) now
+    """
+    values = dict(zip(('category', 'priority'), current))
+    unwound = set()
+    for changed_at, field, old_value in changes:
+        # The first change after `at` holds the value it had at `at`
+        if field not in unwound and (at is None or changed_at > at):
+            values[field] = VALUE_NAMES[field].get(old_value, values[field])
+            unwound.add(field)
+    return values['category'], values['priority']
+
+
+class TrendService:
+    """
+    Service class for the created/resolved time series.
+
+    Reads from TicketDailyRollup, which EventLog updates in the same
+    transaction as each ticket write, so a chart over any date range reads
+    at most 16 rows per day instead of grouping the tickets table.
+    Days are calendar days in settings.TIME_ZONE.
+    """
+
+    def series(self, start, end, interval='day', category=None, priority=None) -> list:
+        """
+        Created and resolved counts per period, with per-category and
+        per-priority breakdowns.
+
+        Args:
+            start, end: first and last day (dates, inclusive)
+            interval: 'day', or 'week' for weeks starting on Monday
+            category, priority: only count tickets with these values
+
+        Returns:
+            list with one dict per period from start to end, including
+            empty ones: {'date', 'created', 'resolved', 'category': {value:
+            {'created', 'resolved'}}, 'priority': {...}}
+        """
+        if interval == 'week':
+            start -= timedelta(days=start.weekday())
+        rows = TicketDailyRollup.objects.filter(day__range=(start, end))
+        if category:
+            rows = rows.filter(category=category)
+        if priority:
+            rows = rows.filter(priority=priority)
+
+        step = timedelta(days=7 if interval == 'week' else 1)
+        periods = {}
+        period = start
+        while period <= end:
+            periods[period] = {
+                'date': period, 'created': 0, 'resolved': 0, 'category': {}, 'priority': {},
+            }
+            period += step
+
+        for day, row_category, row_priority, created, resolved in rows.values_list(
+            'day', 'category', 'priority', 'created', 'resolved'
+        ):
+            if interval == 'week':
+                day -= timedelta(days=day.weekday())
+            point = periods[day]
+            point['created'] += created
+            point['resolved'] += resolved
+            for field, value in (('category', row_category), ('priority', row_priority)):
+                counts = point[field].setdefault(value, {'created': 0, 'resolved': 0})
+                counts['created'] += created
+                counts['resolved'] += resolved
+        return list(periods.values())
+
+    # Rollup maintenance, called by EventLog inside the transaction that
+    # writes the tickets
+
+    def record_created(self, tickets):
+        counts = {}
+        for ticket in tickets:
+            key = (timezone.localdate(ticket.created_at), ticket.category, ticket.priority)
+            counts[key] = counts.get(key, 0) + 1
+        for key, count in counts.items():
+            self._bump(*key, 'created', count)
+
+    def record_changed(self, changes, changed_at):
+        """
+        Count tickets that were resolved or closed.
+
+        Args:
+            changes: (old bucket, new bucket) (category, priority, status)
+                pairs, one per changed ticket
+            changed_at: time of the change
+        """
+        day = timezone.localdate(changed_at)
+        counts = {}
+        for (_category, _priority, old_status), (category, priority, new_status) in changes:
+            if is_resolution(old_status, new_status):
+                counts[(category, priority)] = counts.get((category, priority), 0) + 1
+        for (category, priority), count in counts.items():
+            self._bump(day, category, priority, 'resolved', count)
+
+    def rebuild(self, since=None) -> int:
+        """
+        Recompute the rollups from the tickets and ticket_events tables.
+
+        Tickets that have been deleted are not counted. As in the
+        incremental updates, a ticket is counted as created under the
+        category and priority it was created with, and as resolved under
+        those it had when resolved; both are recovered from the logged
+        category and priority changes.
+
+        Args:
+            since: first day to recompute, or None for all days
+
+        Returns:
+            int: number of rollup rows written
+        """
+        created = Ticket.objects.all()
+        resolved = TicketEvent.objects.filter(
+            kind=TicketEvent.STATUS_CHANGED,
+            new_value__in=[TicketEvent.VALUE_CODES['status'][value] for value in RESOLVED_STATUSES],
+        ).exclude(
+            old_value__in=[TicketEvent.VALUE_CODES['status'][value] for value in RESOLVED_STATUSES],
+        )
+        rollups = TicketDailyRollup.objects.all()
+        if since:
+            start = timezone.make_aware(datetime.combine(since, time.min))
+            created = created.filter(created_at__gte=start)
+            resolved = resolved.filter(created_at__gte=start)
+            rollups = rollups.filter(day__gte=since)
+
+        field_changes = TicketEvent.objects.filter(kind__in=CHANGE_FIELDS)
+        moved = field_changes.values('ticket_id')
+
+        # Tickets whose category and priority never changed, grouped in SQL
+        counts = {}
+        for queryset, field, category, priority in (
+            (created.exclude(id__in=moved), 'created', 'category', 'priority'),
+            (resolved.exclude(ticket_id__in=moved), 'resolved', 'ticket__category', 'ticket__priority'),
+        ):
+            rows = (
+                queryset.annotate(day=TruncDate('created_at'))
+                .values_list('day', category, priority)
+                .annotate(total=Count('id'))
+                .order_by()
+            )
+            for day, row_category, row_priority, total in rows:
+                key = (day, row_category, row_priority)
+                counts.setdefault(key, {'created': 0, 'resolved': 0})[field] = total
+
+        # The rest, one by one, under the values they had at the time
+        history = {}
+        for ticket_id, kind, old_value, changed_at in (
+            field_changes.order_by('created_at', 'id')
+            .values_list('ticket_id', 'kind', 'old_value', 'created_at')
+        ):
+            history.setdefault(ticket_id, []).append((changed_at, CHANGE_FIELDS[kind], old_value))
+        for queryset, field, ticket_id, category, priority in (
+            (created.filter(id__in=moved), 'created', 'id', 'category', 'priority'),
+            (resolved.filter(ticket_id__in=moved), 'resolved', 'ticket_id', 'ticket__category', 'ticket__priority'),
+        ):
+            for row_ticket_id, at, row_category, row_priority in queryset.values_list(
+                ticket_id, 'created_at', category, priority
+            ).iterator():
+                # A creation comes before every change; a resolution comes
+                # after changes made with it or earlier
+                key = (timezone.localdate(at), *_values_at(
+                    history[row_ticket_id], (row_category, row_priority),
+                    None if field == 'created' else at,
+                ))
+                values = counts.setdefault(key, {'created': 0, 'resolved': 0})
+                values[field] += 1
+
+        with transaction.atomic():
+            rollups.delete()
+            written = TicketDailyRollup.objects.bulk_create([
+                TicketDailyRollup(day=day, category=category, priority=priority, **values)
+                for (day, category, priority), values in counts.items()
+            ], batch_size=5000)
+            # Trend responses are validated against the data version
+            stats_service.record_write()
+        return len(written)
+
+    def _bump(self, day, category, priority, field, count):
+        row = TicketDailyRollup.objects.filter(day=day, category=category, priority=priority)
+        if row.update(**{field: F(field) + count}):
+            return
+        try:
+            with transaction.atomic():
+                TicketDailyRollup.objects.create(
+                    day=day, category=category, priority=priority, **{field: count}
+                )
+        except IntegrityError:
+            # Another transaction created the row first
+            row.update(**{field: F(field) + count})
+
+
+# Singleton instance
+trend_service = TrendService()
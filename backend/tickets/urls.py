@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TicketViewSet
+from .views import TicketViewSet, classify_async, ticket_stream
 
 router = DefaultRouter()
 router.register(r'tickets', TicketViewSet, basename='ticket')
 
 urlpatterns = [
+    path('tickets/classify/async/', classify_async, name='ticket-classify-async'),
+    path('tickets/stream/', ticket_stream, name='ticket-stream'),
     path('', include(router.urls)),
 ]
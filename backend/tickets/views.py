@@ -1,21 +1,45 @@
+import hashlib
+import json
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Count, Q, Avg
-from django.db.models.functions import TruncDate
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
 from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from datetime import timedelta
 
 from .models import Ticket
 from .serializers import (
     TicketSerializer,
     TicketUpdateSerializer,
+    BulkTicketUpdateSerializer,
     ClassificationRequestSerializer,
+    BatchClassificationRequestSerializer,
     ClassificationResponseSerializer,
     TicketStatsSerializer
 )
 from .llm_service import llm_service
+from .search import filter_search, ranked_search
 from .email_service import email_service
+from .importer import TicketImporter, read_ndjson
+from .export import EXPORT_CONTENT_TYPES, aexport_tickets, export_tickets
+from .stats_service import stats_service
+from .event_log import event_log
+from .trends import INTERVALS, trend_service
+from .signals import tickets_bulk_updated
+from .live_updates import live_update_hub
+from .similarity import similarity_index
+
+
+# Longest date range served by the trends endpoint
+MAX_TREND_DAYS = 3 * 366
 
 
 class TicketViewSet(viewsets.ModelViewSet):
@@ -53,45 +77,335 @@ class TicketViewSet(viewsets.ModelViewSet):
         if ticket_status:
             queryset = queryset.filter(status=ticket_status)
         
-        # Search in title and description
+        # Full-text search in title and description (prefix matching)
         search = self.request.query_params.get('search', None)
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(description__icontains=search)
-            )
+            queryset = filter_search(queryset, search)
+        
+        if self.action == 'partial_update':
+            # Lock the row for partial_update's read-modify-write
+            queryset = queryset.select_for_update()
+        elif self.action == 'list':
+            # Neither column is serialized: only the similarity endpoints
+            # read the MinHash signature, and search runs inside the query
+            queryset = queryset.defer('similarity_signature', 'search_vector')
+        
+        return queryset.order_by('-created_at', '-id')
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List tickets, newest first.
         
-        return queryset.order_by('-created_at')
+        Supports conditional GET: a request whose If-None-Match or
+        If-Modified-Since matches the current data version gets 304 Not
+        Modified without the list query or serializer running.
+        """
+        not_modified, validators = self._conditional_get(request)
+        if not_modified:
+            return not_modified
+        
+        response = super().list(request, *args, **kwargs)
+        for header, value in validators.items():
+            response[header] = value
+        return response
+    
+    def _conditional_get(self, request, *extra):
+        """
+        Check the request's validators against StatsService.data_version().
+        
+        The ETag covers the data version, the full URL (filters and cursor)
+        and `extra`, so every page and filter has its own.
+        
+        Returns:
+            (304 response or None, dict of ETag/Last-Modified/Cache-Control
+            headers for the full response)
+        """
+        version, last_changed = stats_service.data_version()
+        key = '|'.join([version, request.get_full_path(), *extra])
+        etag = quote_etag(hashlib.md5(key.encode('utf-8')).hexdigest())
+        last_modified = int(last_changed.timestamp()) if last_changed else None
+        
+        # no-cache: clients may store the response but must revalidate
+        validators = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if last_modified:
+            validators['Last-Modified'] = http_date(last_modified)
+        
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            for header, value in validators.items():
+                response[header] = value
+        return response, validators
     
     def create(self, request, *args, **kwargs):
-        """Create a new ticket"""
+        """
+        Create a new ticket.
+        
+        With ?check_duplicates=true the response also lists existing
+        tickets that are probably duplicates of the new one, under
+        `possible_duplicates`.
+        """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        check_duplicates = request.query_params.get('check_duplicates') == 'true'
+        with transaction.atomic():
+            self.perform_create(serializer)
+            stats_service.record_created(serializer.instance)
+            event_log.record_created(serializer.instance)
+            
+            # Queue email notification (graceful fallback if not configured)
+            ticket = serializer.instance
+            email_service.send_ticket_created_notification(ticket)
+            
+            similarity_index.index([ticket])
         
-        # Send email notification (graceful fallback if not configured)
-        ticket = serializer.instance
-        email_service.send_ticket_created_notification(ticket)
+        data = serializer.data
+        if check_duplicates:
+            matches = similarity_index.similar(
+                ticket.similarity_signature, limit=5, min_similarity=0.6, exclude_id=ticket.pk
+            )
+            titles = dict(
+                Ticket.objects.filter(pk__in=[ticket_id for ticket_id, _score in matches])
+                .values_list('pk', 'title')
+            )
+            data = {
+                **data,
+                'possible_duplicates': [
+                    {'id': ticket_id, 'title': titles[ticket_id], 'similarity': score}
+                    for ticket_id, score in matches
+                    if ticket_id in titles
+                ],
+            }
         
-        headers = self.get_success_headers(serializer.data)
+        headers = self.get_success_headers(data)
         return Response(
-            serializer.data,
+            data,
             status=status.HTTP_201_CREATED,
             headers=headers
         )
     
+    def perform_create(self, serializer):
+        data = serializer.validated_data
+        serializer.save(similarity_signature=similarity_index.signature_for(
+            data['title'], data['description']
+        ))
+    
     def partial_update(self, request, *args, **kwargs):
-        """Update ticket (PATCH) - typically for status changes"""
-        instance = self.get_object()
-        old_status = instance.status
+        """
+        Update ticket (PATCH) - typically for status changes.
+        
+        The row is read once under a lock, and only the changed columns are
+        written (see TicketUpdateSerializer.update), so the tickets table
+        sees one SELECT ... FOR UPDATE plus one narrow UPDATE. Any change
+        moves the data version; a status change also bumps two counters,
+        appends an event, updates the daily rollup on resolution and queues
+        a notification (about a dozen queries in all; see
+        tests.TicketQueryCountTests).
+        """
+        with transaction.atomic():
+            instance = self.get_object()
+            old_status = instance.status
+            old_bucket = (instance.category, instance.priority, instance.status)
+            
+            old_text = (instance.title, instance.description)
+            
+            serializer = self.get_serializer(instance, data=request.data, partial=True)
+            serializer.is_valid(raise_exception=True)
+            self.perform_update(serializer)
+            stats_service.record_changed(old_bucket, instance)
+            event_log.record_changed(old_bucket, instance)
+            
+            if (instance.title, instance.description) != old_text:
+                similarity_index.reindex(instance)
+            
+            # Queue email if status changed
+            if instance.status != old_status:
+                email_service.send_ticket_status_update_notification(instance, old_status)
+        
+        return Response(serializer.data)
+    
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            stats_service.record_deleted(Ticket.objects.filter(pk=instance.pk))
+            event_log.record_deleted(Ticket.objects.filter(pk=instance.pk))
+            instance.delete()
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_import(self, request):
+        """
+        Create many tickets in one request.
+        
+        Accepts a JSON array of ticket objects, or an NDJSON stream (one
+        object per line, Content-Type: application/x-ndjson) which is read
+        and written in chunks without buffering the whole body.
+        Pass ?classify=true to fill in a missing category or priority.
+        No notification emails are sent for imported tickets.
+        
+        Returns: { "created": 0, "failed": 0, "classified": 0, "errors": [{ "row": 1, "errors": {...} }] }
+        """
+        importer = TicketImporter(
+            classify=request.query_params.get('classify', '').lower() in ('1', 'true', 'yes')
+        )
+        
+        if request.content_type.split(';')[0].strip() in ('application/x-ndjson', 'application/jsonl'):
+            result = importer.run(read_ndjson(request.stream or []))
+        else:
+            if not isinstance(request.data, list):
+                return Response(
+                    {'error': 'Expected a JSON array of tickets'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            result = importer.run(request.data)
+        
+        response_status = status.HTTP_201_CREATED if result['created'] else status.HTTP_400_BAD_REQUEST
+        return Response(result, status=response_status)
+    
+    @bulk_import.mapping.patch
+    def bulk_update(self, request):
+        """
+        Apply the same field changes to many tickets in one transaction.
+        
+        Accepts: { "ids": [1, 2, 3], "status": "closed" }
+        Without "ids", the tickets matching the list filters in the query
+        string (category, priority, status, search) are updated; at most
+        1000 tickets per request either way.
+        
+        Returns: { "updated": 2, "tickets": [...] } with the tickets that changed.
+        Status-change notifications are queued in a single insert.
+        """
+        serializer = BulkTicketUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        changes = {
+            field: serializer.validated_data[field]
+            for field in ('status', 'category', 'priority')
+            if field in serializer.validated_data
+        }
+        
+        queryset = self.get_queryset()
+        ids = serializer.validated_data.get('ids')
+        if ids:
+            queryset = queryset.filter(id__in=ids)
+        elif not any(request.query_params.get(name) for name in ('category', 'priority', 'status', 'search')):
+            return Response(
+                {'error': 'Pass "ids" or at least one filter'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        limit = BulkTicketUpdateSerializer().fields['ids'].max_length
+        with transaction.atomic():
+            rows = list(
+                queryset.select_for_update()
+                .values_list('id', 'category', 'priority', 'status')[:limit + 1]
+            )
+            if len(rows) > limit:
+                return Response(
+                    {'error': f'More than {limit} tickets match; narrow the filter'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            changed = [
+                row for row in rows
+                if any(row[index] != changes.get(field, row[index])
+                       for index, field in ((1, 'category'), (2, 'priority'), (3, 'status')))
+            ]
+            if not changed:
+                return Response({'updated': 0, 'tickets': []})
+            
+            changed_ids = [row[0] for row in changed]
+            changed_at = timezone.now()
+            Ticket.objects.filter(id__in=changed_ids).update(**changes, updated_at=changed_at)
+            old_buckets = [row[1:] for row in changed]
+            stats_service.record_bulk_changed(old_buckets, changes)
+            event_log.record_bulk_changed(changed_ids, old_buckets, changes, changed_at)
+            tickets_bulk_updated.send(
+                sender=Ticket, ids=changed_ids, old_buckets=old_buckets, changes=changes,
+                changed_at=changed_at
+            )
+            
+            tickets = Ticket.objects.in_bulk(changed_ids)
+            if 'status' in changes:
+                email_service.send_bulk_status_update_notifications([
+                    (tickets[ticket_id], old_status)
+                    for ticket_id, _category, _priority, old_status in changed
+                    if old_status != changes['status']
+                ])
+        
+        updated = [tickets[ticket_id] for ticket_id in changed_ids]
+        return Response({
+            'updated': len(updated),
+            'tickets': TicketSerializer(updated, many=True).data,
+        })
+    
+    @action(detail=True, methods=['get'], url_path='timeline')
+    def timeline(self, request, pk=None):
+        """
+        History of the ticket, oldest first.
+        
+        Returns: [{ "type": "created", "status": "open", "at": "..." },
+                  { "type": "status_changed", "field": "status", "from": "open", "to": "resolved", "at": "..." }]
+        """
+        ticket = self.get_object()
+        return Response(event_log.timeline(ticket.pk))
+    
+    @action(detail=True, methods=['get'], url_path='similar')
+    def similar(self, request, pk=None):
+        """
+        Tickets whose title and description are near-duplicates of this one.
+        
+        Query params:
+        - limit: most tickets to return (default 10, max 50)
+        - min_similarity: lowest estimated similarity, 0-1 (default 0.5)
+        
+        Each ticket carries a `similarity` score. Similarity is the
+        estimated overlap of the two tickets' words and word pairs.
+        """
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+            min_similarity = float(request.query_params.get('min_similarity', 0.5))
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer and min_similarity a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        ticket = self.get_object()
+        matches = similarity_index.similar(
+            ticket.similarity_signature,
+            limit=limit,
+            min_similarity=min_similarity,
+            exclude_id=ticket.pk
+        )
+        tickets = Ticket.objects.in_bulk([ticket_id for ticket_id, _score in matches])
         
-        kwargs['partial'] = True
-        response = self.update(request, *args, **kwargs)
+        results = []
+        for ticket_id, score in matches:
+            if ticket_id in tickets:
+                results.append({**TicketSerializer(tickets[ticket_id]).data, 'similarity': score})
+        return Response(results)
+    
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Stream every ticket matching the list filters as a file download.
         
-        # Send email if status changed
-        instance.refresh_from_db()
-        if instance.status != old_status:
-            email_service.send_ticket_status_update_notification(instance, old_status)
+        Query params: category, priority, status, search (as for the list),
+        output=csv (default) or ndjson. Rows are streamed from a database
+        cursor, so memory use does not grow with the result size. Under ASGI
+        the body is an async iterator; Django would buffer a sync one.
+        """
+        output = request.query_params.get('output', 'csv')
+        if output not in EXPORT_CONTENT_TYPES:
+            return Response(
+                {'error': f"output must be one of: {', '.join(EXPORT_CONTENT_TYPES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
+        stream = aexport_tickets if isinstance(request._request, ASGIRequest) else export_tickets
+        response = StreamingHttpResponse(
+            stream(self.get_queryset(), output),
+            content_type=EXPORT_CONTENT_TYPES[output]
+        )
+        filename = f"tickets-{timezone.now():%Y%m%d-%H%M%S}.{output}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
         return response
     
     @action(detail=False, methods=['get'], url_path='stats')
@@ -106,56 +420,100 @@ class TicketViewSet(viewsets.ModelViewSet):
         - priority_breakdown: Count by priority
         - category_breakdown: Count by category
         - status_breakdown: Count by status
+        
+        Breakdowns come from the counter table (at most 64 rows) plus one
+        index read for the earliest ticket. Results are cached for up to
+        TICKET_STATS_CACHE_SECONDS under the response's ETag, so a ticket
+        change moves to a new entry rather than invalidating the old one.
+        Supports conditional GET like the list endpoint.
         """
+        # avg_tickets_per_day also changes with the date
+        not_modified, validators = self._conditional_get(request, timezone.now().date().isoformat())
+        if not_modified:
+            return not_modified
         
-        # Total tickets
-        total_tickets = Ticket.objects.count()
+        stats_data = stats_service.get_statistics(validators['ETag'])
         
-        # Open tickets
-        open_tickets = Ticket.objects.filter(status='open').count()
+        serializer = TicketStatsSerializer(data=stats_data)
+        serializer.is_valid(raise_exception=True)
         
-        # Calculate average tickets per day using database aggregation
-        earliest_ticket = Ticket.objects.order_by('created_at').first()
+        return Response(serializer.data, headers=validators)
+    
+    @action(detail=False, methods=['get'], url_path='trends')
+    def trends(self, request):
+        """
+        Tickets created and resolved per day or week, from the daily rollups.
         
-        if earliest_ticket:
-            days_since_first = (timezone.now() - earliest_ticket.created_at).days + 1
-            avg_tickets_per_day = round(total_tickets / days_since_first, 2)
-        else:
-            avg_tickets_per_day = 0.0
+        Query params:
+        - start, end: date range, YYYY-MM-DD (default: the last 30 days)
+        - interval: day (default) or week
+        - category, priority: only count tickets with these values
         
-        # Priority breakdown using database aggregation
-        priority_breakdown = dict(
-            Ticket.objects.values('priority')
-            .annotate(count=Count('id'))
-            .values_list('priority', 'count')
-        )
+        Returns: { "interval": "day", "start": "...", "end": "...",
+                   "series": [{ "date": "...", "created": 0, "resolved": 0,
+                                "category": {...}, "priority": {...} }] }
+        """
+        interval = request.query_params.get('interval', 'day')
+        try:
+            end = parse_date(request.query_params.get('end', '')) or timezone.localdate()
+            start = parse_date(request.query_params.get('start', '')) or end - timedelta(days=29)
+        except ValueError:
+            start = end = None
+        if interval not in INTERVALS or start is None or start > end:
+            return Response(
+                {'error': 'Expected start <= end as YYYY-MM-DD and interval "day" or "week"'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (end - start).days > MAX_TREND_DAYS:
+            return Response(
+                {'error': f'The date range may span at most {MAX_TREND_DAYS} days'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Category breakdown using database aggregation
-        category_breakdown = dict(
-            Ticket.objects.values('category')
-            .annotate(count=Count('id'))
-            .values_list('category', 'count')
-        )
+        not_modified, validators = self._conditional_get(request, timezone.localdate().isoformat())
+        if not_modified:
+            return not_modified
         
-        # Status breakdown using database aggregation
-        status_breakdown = dict(
-            Ticket.objects.values('status')
-            .annotate(count=Count('id'))
-            .values_list('status', 'count')
+        series = trend_service.series(
+            start,
+            end,
+            interval=interval,
+            category=request.query_params.get('category'),
+            priority=request.query_params.get('priority')
         )
+        response = Response({
+            'interval': interval,
+            'start': start,
+            'end': end,
+            'series': series,
+        })
+        for header, value in validators.items():
+            response[header] = value
+        return response
+    
+    @action(detail=False, methods=['get'], url_path='search')
+    def search(self, request):
+        """
+        Relevance-ranked full-text search over title and description.
         
-        stats_data = {
-            'total_tickets': total_tickets,
-            'open_tickets': open_tickets,
-            'avg_tickets_per_day': avg_tickets_per_day,
-            'priority_breakdown': priority_breakdown,
-            'category_breakdown': category_breakdown,
-            'status_breakdown': status_breakdown,
-        }
+        Query params: q (required), limit (default 20, max 50)
+        Returns the best matches, most relevant first. Each term is
+        prefix-matched, so partial words typed by the user still hit.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Query parameter "q" is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        serializer = TicketStatsSerializer(data=stats_data)
-        serializer.is_valid(raise_exception=True)
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), 50)
+        except ValueError:
+            limit = 20
         
+        tickets = ranked_search(query, limit=max(limit, 1))
+        serializer = TicketSerializer(tickets, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['post'], url_path='classify')
@@ -193,3 +551,101 @@ class TicketViewSet(viewsets.ModelViewSet):
                 },
                 status=status.HTTP_200_OK
             )
+    
+    @action(detail=False, methods=['post'], url_path='classify/batch')
+    def classify_batch(self, request):
+        """
+        Classify up to 1000 descriptions in one request.
+        
+        Accepts: { "descriptions": ["...", "..."] }
+        Returns: { "results": [{ "suggested_category": "...", "suggested_priority": "..." }, ...] }
+        in the same order as the input.
+        """
+        request_serializer = BatchClassificationRequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+        
+        descriptions = request_serializer.validated_data['descriptions']
+        results = llm_service.classify_batch(descriptions)
+        
+        response_serializer = ClassificationResponseSerializer(data=results, many=True)
+        response_serializer.is_valid(raise_exception=True)
+        
+        return Response({'results': response_serializer.data}, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'], url_path='classify/cache')
+    def classify_cache(self, request):
+        """
+        Classification cache counters.
+        
+        Returns: { "enabled": true, "hits": 0, "misses": 0, "size": 0 }
+        """
+        return Response(llm_service.cache_stats())
+
+
+@csrf_exempt
+@require_POST
+async def classify_async(request):
+    """
+    Async LLM classification endpoint for ASGI deployments.
+    
+    Same contract as POST /api/tickets/classify/, but waiting on the LLM does
+    not hold a worker thread, upstream calls are concurrency-limited and
+    time-boxed, and an open circuit breaker answers from the keyword
+    fallback immediately.
+    """
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    request_serializer = ClassificationRequestSerializer(data=data)
+    if not request_serializer.is_valid():
+        return JsonResponse(request_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    description = request_serializer.validated_data['description']
+    classification_result = await llm_service.aclassify_ticket(description)
+    
+    response_serializer = ClassificationResponseSerializer(data=classification_result)
+    if not response_serializer.is_valid():
+        return JsonResponse(
+            {
+                'suggested_category': 'general',
+                'suggested_priority': 'medium',
+                'error': 'Classification service temporarily unavailable'
+            },
+            status=status.HTTP_200_OK
+        )
+    
+    return JsonResponse(response_serializer.data, status=status.HTTP_200_OK)
+
+
+@require_GET
+async def ticket_stream(request):
+    """
+    Server-sent events stream of ticket changes, for ASGI deployments.
+    
+    Each event is a JSON object with a "type":
+    - created / updated: "ticket" (as in the list endpoint), "stats" and "trends"
+    - deleted: "id", "stats" and "trends"
+    - bulk_created: "count", "stats" and "trends"
+    - bulk_updated: "ids", "changes" (the fields written), "stats" and "trends"
+    - resync: events may have been missed; refetch
+    
+    "stats" is the change in the /api/tickets/stats/ counts ("total" and
+    per-value changes in each breakdown), or null when it is unknown.
+    "trends" lists the changed days of /api/tickets/trends/, each point
+    holding the change in its counts, or is null when it is unknown.
+    Under WSGI a stream would hold a worker thread forever, so 503 is
+    returned instead and clients keep refetching.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'error': 'Live updates need the ASGI server (SERVER_MODE=asgi)'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    
+    response = StreamingHttpResponse(live_update_hub.stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
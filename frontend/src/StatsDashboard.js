@@ -1,21 +1,63 @@
-import React, { useState, useEffect } from 'react';
-import { ticketAPI } from './api';
+import React, { useState, useEffect, useRef } from 'react';
+import { ticketAPI, subscribeToTicketUpdates } from './api';
 
 const StatsDashboard = ({ refreshTrigger }) => {
   const [stats, setStats] = useState(null);
+  const [trends, setTrends] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
+  const trendsRefreshRef = useRef(null);
 
   useEffect(() => {
     fetchStats();
   }, [refreshTrigger]);
 
-  const fetchStats = async () => {
-    setLoading(true);
+  // Apply the count changes pushed with each ticket change; refetch
+  // quietly when the change is unknown (e.g. after a reconnect)
+  useEffect(() => {
+    const unsubscribe = subscribeToTicketUpdates((event) => {
+      if (!event.stats) {
+        fetchStats(true);
+        return;
+      }
+      setStats(prev => (prev ? applyStatsDelta(prev, event.stats) : prev));
+      if (!event.trends) {
+        scheduleTrendsRefresh();
+      } else if (event.trends.length) {
+        setTrends((prev) => {
+          const next = prev && applyTrendDelta(prev, event.trends);
+          if (!next) {
+            scheduleTrendsRefresh();
+          }
+          return next || prev;
+        });
+      }
+    });
+    return () => {
+      unsubscribe();
+      clearTimeout(trendsRefreshRef.current);
+    };
+  }, []);
+
+  // Coalesce refetches of the trends into one every few seconds
+  const scheduleTrendsRefresh = () => {
+    if (trendsRefreshRef.current) {
+      return;
+    }
+    trendsRefreshRef.current = setTimeout(() => {
+      trendsRefreshRef.current = null;
+      fetchTrends();
+    }, 3000);
+  };
+
+  const fetchStats = async (silent = false) => {
+    if (!silent) {
+      setLoading(true);
+    }
     setError('');
     
     try {
-      const response = await ticketAPI.getStats();
+      const [response] = await Promise.all([ticketAPI.getStats(), fetchTrends()]);
       setStats(response.data);
     } catch (err) {
       setError('Failed to load statistics');
@@ -25,6 +67,16 @@ const StatsDashboard = ({ refreshTrigger }) => {
     }
   };
 
+  // The trend chart is optional: a failure leaves it hidden
+  const fetchTrends = async () => {
+    try {
+      const response = await ticketAPI.getTrends();
+      setTrends(response.data);
+    } catch (err) {
+      console.error('Trends fetch error:', err);
+    }
+  };
+
   if (loading) {
     return (
       <div className="card stats-card">
@@ -81,6 +133,9 @@ const StatsDashboard = ({ refreshTrigger }) => {
         </div>
       </div>
 
+      {/* Trend */}
+      {trends && <TrendChart series={trends.series} />}
+
       {/* Breakdowns */}
       <div className="breakdowns-container">
         
@@ -160,6 +215,98 @@ const StatsDashboard = ({ refreshTrigger }) => {
   );
 };
 
+// Created and resolved tickets per day, as pairs of bars
+const TrendChart = ({ series }) => {
+  const peak = Math.max(1, ...series.map(point => Math.max(point.created, point.resolved)));
+  const height = (count) => `${(count / peak) * 100}%`;
+
+  return (
+    <div className="breakdown-card trend-card">
+      <h3 className="breakdown-title">📈 Last {series.length} Days</h3>
+      <div className="trend-chart">
+        {series.map(point => (
+          <div
+            key={point.date}
+            className="trend-day"
+            title={`${point.date}: ${point.created} created, ${point.resolved} resolved`}
+          >
+            <span className="trend-bar trend-created" style={{ height: height(point.created) }}></span>
+            <span className="trend-bar trend-resolved" style={{ height: height(point.resolved) }}></span>
+          </div>
+        ))}
+      </div>
+      <div className="trend-legend">
+        <span><span className="trend-swatch trend-created"></span>Created</span>
+        <span><span className="trend-swatch trend-resolved"></span>Resolved</span>
+      </div>
+    </div>
+  );
+};
+
+// Apply a live-update count change to the statistics
+const applyStatsDelta = (stats, delta) => {
+  const merge = (breakdown, changes) => {
+    const next = { ...breakdown };
+    Object.entries(changes).forEach(([value, change]) => {
+      next[value] = (next[value] || 0) + change;
+      if (next[value] <= 0) {
+        delete next[value];
+      }
+    });
+    return next;
+  };
+
+  const total = stats.total_tickets + delta.total;
+  const statusBreakdown = merge(stats.status_breakdown, delta.status);
+  // The first ticket is created today, so its average is the total
+  const avgTicketsPerDay = stats.total_tickets
+    ? Math.round(stats.avg_tickets_per_day * total / stats.total_tickets * 100) / 100
+    : total;
+
+  return {
+    ...stats,
+    total_tickets: total,
+    open_tickets: statusBreakdown.open || 0,
+    avg_tickets_per_day: avgTicketsPerDay,
+    priority_breakdown: merge(stats.priority_breakdown, delta.priority),
+    category_breakdown: merge(stats.category_breakdown, delta.category),
+    status_breakdown: statusBreakdown,
+  };
+};
+
+// Apply live-update created/resolved changes to the trend series. Returns
+// null when a changed day is outside the loaded series.
+const applyTrendDelta = (trends, points) => {
+  const merge = (breakdown, changes) => {
+    const next = { ...breakdown };
+    Object.entries(changes).forEach(([value, change]) => {
+      const counts = next[value] || { created: 0, resolved: 0 };
+      next[value] = {
+        created: counts.created + change.created,
+        resolved: counts.resolved + change.resolved,
+      };
+    });
+    return next;
+  };
+
+  const changes = new Map(points.map(point => [point.date, point]));
+  const series = trends.series.map((point) => {
+    const change = changes.get(point.date);
+    if (!change) {
+      return point;
+    }
+    changes.delete(point.date);
+    return {
+      ...point,
+      created: point.created + change.created,
+      resolved: point.resolved + change.resolved,
+      category: merge(point.category, change.category),
+      priority: merge(point.priority, change.priority),
+    };
+  });
+  return changes.size ? null : { ...trends, series };
+};
+
 // Helper function for category icons
 const getCategoryIcon = (category) => {
   const icons = {
@@ -1,10 +1,15 @@
-import React, { useState, useEffect } from 'react';
-import { ticketAPI } from './api';
+import React, { useState, useEffect, useRef } from 'react';
+import { ticketAPI, getCursor, getExportUrl, subscribeToTicketUpdates } from './api';
 
 const TicketList = ({ refreshTrigger }) => {
   const [tickets, setTickets] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
+
+  // Pagination state (cursor-based, newest first)
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const loadMoreRef = useRef(null);
   
   // Filters
   const [filters, setFilters] = useState({
@@ -14,29 +19,60 @@ const TicketList = ({ refreshTrigger }) => {
     search: '',
   });
 
+  // Multi-select for bulk status changes
+  const [selectedIds, setSelectedIds] = useState([]);
+  const [bulkStatus, setBulkStatus] = useState('closed');
+  const [bulkUpdating, setBulkUpdating] = useState(false);
+
   // Modal state for ticket detail/update
   const [selectedTicket, setSelectedTicket] = useState(null);
   const [updatedStatus, setUpdatedStatus] = useState('');
 
+  // Latest live-update handler, so the stream opened once sees current state
+  const liveUpdateRef = useRef(null);
+
   useEffect(() => {
     fetchTickets();
   }, [refreshTrigger, filters]);
 
+  useEffect(() => subscribeToTicketUpdates(event => liveUpdateRef.current(event)), []);
+
+  // Infinite scroll: load the next page when the sentinel scrolls into view
+  useEffect(() => {
+    const sentinel = loadMoreRef.current;
+    if (!sentinel || !nextCursor) {
+      return undefined;
+    }
+
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) {
+        loadMore();
+      }
+    });
+    observer.observe(sentinel);
+    return () => observer.disconnect();
+  }, [nextCursor, loadingMore]);
+
+  const buildParams = () => {
+    // Remove empty filters
+    const params = {};
+    Object.keys(filters).forEach(key => {
+      if (filters[key]) {
+        params[key] = filters[key];
+      }
+    });
+    return params;
+  };
+
   const fetchTickets = async () => {
     setLoading(true);
     setError('');
     
     try {
-      // Remove empty filters
-      const params = {};
-      Object.keys(filters).forEach(key => {
-        if (filters[key]) {
-          params[key] = filters[key];
-        }
-      });
-
-      const response = await ticketAPI.getTickets(params);
-      setTickets(response.data);
+      const response = await ticketAPI.getTickets(buildParams());
+      setTickets(response.data.results);
+      setNextCursor(getCursor(response.data.next));
+      setSelectedIds([]);
     } catch (err) {
       setError('Failed to load tickets. Please try again.');
       console.error('Fetch error:', err);
@@ -45,6 +81,24 @@ const TicketList = ({ refreshTrigger }) => {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) {
+      return;
+    }
+
+    setLoadingMore(true);
+
+    try {
+      const response = await ticketAPI.getTickets(buildParams(), nextCursor);
+      setTickets(prev => [...prev, ...response.data.results]);
+      setNextCursor(getCursor(response.data.next));
+    } catch (err) {
+      console.error('Load more error:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleFilterChange = (e) => {
     const { name, value } = e.target;
     setFilters(prev => ({
@@ -70,14 +124,90 @@ const TicketList = ({ refreshTrigger }) => {
     }
 
     try {
-      await ticketAPI.updateTicket(selectedTicket.id, { status: updatedStatus });
+      const response = await ticketAPI.updateTicket(selectedTicket.id, { status: updatedStatus });
+      setTickets(prev => mergeTicket(prev, { ...selectedTicket, ...response.data }));
       closeTicketModal();
-      fetchTickets(); // Refresh list
     } catch (err) {
       alert('Failed to update ticket status');
     }
   };
 
+  const toggleSelected = (id) => {
+    setSelectedIds(prev => (
+      prev.includes(id) ? prev.filter(selectedId => selectedId !== id) : [...prev, id]
+    ));
+  };
+
+  const matchesFilters = (ticket) => (
+    ['category', 'priority', 'status'].every(key => !filters[key] || ticket[key] === filters[key])
+  );
+
+  // Replace or insert `ticket`, keeping newest-first order; drop it if it
+  // no longer matches the filters
+  const mergeTicket = (list, ticket) => {
+    const rest = list.filter(item => item.id !== ticket.id);
+    // Search results are ranked by the server, so only tickets already
+    // in the results are kept under a search
+    if (!matchesFilters(ticket) || (filters.search && rest.length === list.length)) {
+      return rest;
+    }
+    const index = rest.findIndex(item => item.created_at < ticket.created_at);
+    if (index === -1) {
+      // Older than everything loaded: it belongs on a page not fetched yet
+      return nextCursor ? rest : [...rest, ticket];
+    }
+    return [...rest.slice(0, index), ticket, ...rest.slice(index)];
+  };
+
+  // Apply a change pushed by the server instead of refetching the list
+  liveUpdateRef.current = (event) => {
+    switch (event.type) {
+      case 'created':
+      case 'updated':
+        setTickets(prev => mergeTicket(prev, event.ticket));
+        break;
+      case 'deleted':
+        setTickets(prev => prev.filter(ticket => ticket.id !== event.id));
+        setSelectedIds(prev => prev.filter(id => id !== event.id));
+        break;
+      case 'bulk_updated': {
+        const ids = new Set(event.ids);
+        setTickets(prev => prev
+          .map(ticket => (ids.has(ticket.id) ? { ...ticket, ...event.changes } : ticket))
+          .filter(matchesFilters));
+        break;
+      }
+      default:
+        // bulk_created, resync
+        fetchTickets();
+    }
+  };
+
+  const handleBulkStatusUpdate = async () => {
+    if (selectedIds.length === 0) {
+      return;
+    }
+
+    setBulkUpdating(true);
+
+    try {
+      const response = await ticketAPI.bulkUpdateTickets(selectedIds, { status: bulkStatus });
+      // Merge the changed tickets in place; drop any that no longer match the filters
+      const updated = {};
+      response.data.tickets.forEach(ticket => {
+        updated[ticket.id] = ticket;
+      });
+      setTickets(prev => prev
+        .map(ticket => updated[ticket.id] || ticket)
+        .filter(matchesFilters));
+      setSelectedIds([]);
+    } catch (err) {
+      alert('Failed to update selected tickets');
+    } finally {
+      setBulkUpdating(false);
+    }
+  };
+
   const getPriorityClass = (priority) => {
     return `badge badge-priority-${priority}`;
   };
@@ -149,6 +279,12 @@ const TicketList = ({ refreshTrigger }) => {
             <option value="closed">Closed</option>
           </select>
         </div>
+
+        <div className="filter-group export-links">
+          <label>Export</label>
+          <a href={getExportUrl(buildParams(), 'csv')} download>CSV</a>
+          <a href={getExportUrl(buildParams(), 'ndjson')} download>NDJSON</a>
+        </div>
       </div>
 
       {/* Loading State */}
@@ -176,16 +312,41 @@ const TicketList = ({ refreshTrigger }) => {
               <div className="ticket-count">
                 <span className="count-badge">{tickets.length}</span>
                 <span className="count-text">
-                  ticket{tickets.length !== 1 ? 's' : ''} found
+                  ticket{tickets.length !== 1 ? 's' : ''} {nextCursor ? 'loaded' : 'found'}
                 </span>
               </div>
+              {selectedIds.length > 0 && (
+                <div className="bulk-actions">
+                  <span>{selectedIds.length} selected</span>
+                  <select value={bulkStatus} onChange={(e) => setBulkStatus(e.target.value)}>
+                    <option value="open">Open</option>
+                    <option value="in_progress">In Progress</option>
+                    <option value="resolved">Resolved</option>
+                    <option value="closed">Closed</option>
+                  </select>
+                  <button onClick={handleBulkStatusUpdate} disabled={bulkUpdating}>
+                    {bulkUpdating ? 'Updating...' : 'Set status'}
+                  </button>
+                  <button onClick={() => setSelectedIds([])} style={{backgroundColor: '#6c757d'}}>
+                    Clear
+                  </button>
+                </div>
+              )}
+
               {tickets.map(ticket => (
                 <div
                   key={ticket.id}
-                  className="ticket-item"
+                  className={`ticket-item${selectedIds.includes(ticket.id) ? ' selected' : ''}`}
                   onClick={() => openTicketModal(ticket)}
                 >
                   <div className="ticket-header">
+                    <input
+                      type="checkbox"
+                      className="ticket-select"
+                      checked={selectedIds.includes(ticket.id)}
+                      onClick={(e) => e.stopPropagation()}
+                      onChange={() => toggleSelected(ticket.id)}
+                    />
                     <div className="ticket-title">#{ticket.id} - {ticket.title}</div>
                   </div>
                   
@@ -206,6 +367,14 @@ const TicketList = ({ refreshTrigger }) => {
                   </p>
                 </div>
               ))}
+
+              {nextCursor && (
+                <div ref={loadMoreRef} className="load-more">
+                  <button onClick={loadMore} disabled={loadingMore}>
+                    {loadingMore ? 'Loading...' : 'Load more'}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
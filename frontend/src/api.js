@@ -9,11 +9,43 @@ const api = axios.create({
   },
 });
 
+// Last response of each conditional GET, by URL. The list and stats
+// endpoints send an ETag; asking again with If-None-Match returns an empty
+// 304 when nothing changed, and the stored data is reused.
+const MAX_CACHED_RESPONSES = 50;
+const conditionalCache = new Map();
+
+const conditionalGet = async (url, params) => {
+  const key = api.getUri({ url, params });
+  const cached = conditionalCache.get(key);
+  const response = await api.get(url, {
+    params,
+    headers: cached ? { 'If-None-Match': cached.etag } : {},
+    validateStatus: (status) => (status >= 200 && status < 300) || status === 304,
+  });
+
+  if (response.status === 304 && cached) {
+    return { ...response, data: cached.data };
+  }
+
+  conditionalCache.delete(key);
+  if (response.headers.etag) {
+    if (conditionalCache.size >= MAX_CACHED_RESPONSES) {
+      // Maps iterate in insertion order: drop the oldest entry
+      conditionalCache.delete(conditionalCache.keys().next().value);
+    }
+    conditionalCache.set(key, { etag: response.headers.etag, data: response.data });
+  }
+  return response;
+};
+
 // Ticket API
 export const ticketAPI = {
-  // Get all tickets with optional filters
-  getTickets: (params = {}) => {
-    return api.get('/tickets/', { params });
+  // Get one page of tickets with optional filters.
+  // Pass the cursor from a previous page's `next` link to continue.
+  getTickets: (params = {}, cursor = null) => {
+    const query = cursor ? { ...params, cursor } : params;
+    return conditionalGet('/tickets/', query);
   },
 
   // Create a new ticket
@@ -26,9 +58,20 @@ export const ticketAPI = {
     return api.patch(`/tickets/${id}/`, data);
   },
 
+  // Apply the same changes (status/category/priority) to many tickets
+  bulkUpdateTickets: (ids, changes) => {
+    return api.patch('/tickets/bulk/', { ids, ...changes });
+  },
+
   // Get ticket statistics
   getStats: () => {
-    return api.get('/tickets/stats/');
+    return conditionalGet('/tickets/stats/');
+  },
+
+  // Get tickets created/resolved per day or week
+  // (params: start, end, interval, category, priority)
+  getTrends: (params = {}) => {
+    return conditionalGet('/tickets/trends/', params);
   },
 
   // Classify ticket description using LLM
@@ -37,4 +80,60 @@ export const ticketAPI = {
   },
 };
 
+// Download URL for the filtered tickets as CSV or NDJSON (streamed by the server)
+export const getExportUrl = (params = {}, output = 'csv') => {
+  const query = new URLSearchParams({ ...params, output });
+  return `${API_URL}/api/tickets/export/?${query.toString()}`;
+};
+
+// One stream per page, shared by every subscriber and closed with the last
+const liveListeners = new Set();
+let liveSource = null;
+
+const openTicketStream = () => {
+  const source = new EventSource(`${API_URL}/api/tickets/stream/`);
+  const dispatch = (event) => liveListeners.forEach(listener => listener(event));
+  let disconnected = false;
+  source.onmessage = (message) => dispatch(JSON.parse(message.data));
+  source.onerror = () => {
+    disconnected = true;
+  };
+  source.onopen = () => {
+    if (disconnected) {
+      dispatch({ type: 'resync' });
+    }
+  };
+  return source;
+};
+
+// Live ticket changes pushed by the server as server-sent events (only
+// served by the ASGI server). `onEvent` receives each parsed event, plus a
+// { type: 'resync' } event after a reconnect since changes may have been
+// missed. Returns a function that unsubscribes.
+export const subscribeToTicketUpdates = (onEvent) => {
+  if (!window.EventSource) {
+    return () => {};
+  }
+
+  liveListeners.add(onEvent);
+  if (!liveSource) {
+    liveSource = openTicketStream();
+  }
+  return () => {
+    liveListeners.delete(onEvent);
+    if (!liveListeners.size && liveSource) {
+      liveSource.close();
+      liveSource = null;
+    }
+  };
+};
+
+// Extract the opaque cursor token from a paginated `next`/`previous` URL
+export const getCursor = (pageUrl) => {
+  if (!pageUrl) {
+    return null;
+  }
+  return new URL(pageUrl).searchParams.get('cursor');
+};
+
 export default api;